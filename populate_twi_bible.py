@@ -1,10 +1,34 @@
+"""
+Merge the per-book files in data/TWI/Books into data/TWI/TWI_bible.json.
+
+Usage:
+    python populate_twi_bible.py [data-root] [--pretty] [--force] [--jobs N]
+
+Only books whose file content changed since the last merge are re-read; the
+hashes are kept in data/TWI/populate_state.json. Changed books are parsed in
+parallel when there are many of them. The result is written compactly and
+atomically (temp file + rename); --pretty writes it indented for diffing.
+If TWI_bible.json was changed by anything else since the last merge, every
+book is applied again.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import hashlib
 import json
 import os
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "src"))
 
-# Paths
-base_dir = r"c:\Users\Afreh Kriss Ntim\bible\data\TWI"
-books_dir = os.path.join(base_dir, "Books")
-target_file = os.path.join(base_dir, "TWI_bible.json")
+from persist import write_json_atomic  # noqa: E402
+
+STATE_NAME = "populate_state.json"
+STATE_VERSION = 1
+# below this many changed books, starting worker processes costs more than it saves
+PARALLEL_MIN = 8
 
 # Mapping from Filename (without extension) to TWI_bible.json Key
 # Note: Keys in TWI_bible.json are mostly English/Latinized or Twi.
@@ -78,57 +102,118 @@ file_to_key_mapping = {
     "Adiyisɛm": "Adiyisɛm"
 }
 
-def populate_bible():
-    # Load the target JSON
-    if not os.path.exists(target_file):
+def file_digest(path, cached=None):
+    """``[mtime_ns, size, sha256]`` of a file, reusing ``cached`` while mtime and size match."""
+    st = os.stat(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return [st.st_mtime_ns, st.st_size, cached[2]]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return [st.st_mtime_ns, st.st_size, h.hexdigest()]
+
+
+def read_book(path):
+    """``(content, error)`` for one book file: the value under its root key."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            book_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return None, f"Error decoding {Path(path).name}: {e}"
+    # The book data structure is usually { "Book Name": { ... content ... } }
+    if not book_data:
+        return None, f"Warning: {Path(path).name} is empty."
+    return book_data[next(iter(book_data))], None
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {"version": STATE_VERSION, "target": None, "books": {}}
+
+
+def populate_bible(data_root, pretty=False, force=False, jobs=None):
+    started = time.perf_counter()
+    base_dir = Path(data_root) / "TWI"
+    books_dir = base_dir / "Books"
+    target_file = base_dir / "TWI_bible.json"
+    state_file = base_dir / STATE_NAME
+
+    if not target_file.exists():
         print(f"Target file not found: {target_file}")
-        return
+        return False
+
+    state = load_state(state_file)
+    target_digest = file_digest(target_file, state.get("target"))
+    # someone else rewrote the target (checkout, hand edit): apply every book again
+    if force or state.get("target") is None or target_digest[2] != state["target"][2]:
+        state["books"] = {}
+
+    changed = []
+    digests = {}
+    for path in sorted(books_dir.glob("*.json")):
+        name = path.stem
+        if name not in file_to_key_mapping:
+            print(f"Skipping {path.name} (no mapping found).")
+            continue
+        digest = file_digest(path, state["books"].get(path.name))
+        digests[path.name] = digest
+        if state["books"].get(path.name, [None] * 3)[2] != digest[2]:
+            changed.append(path)
+
+    if not changed and state.get("pretty", False) == pretty:
+        print(f"TWI_bible.json is up to date ({len(digests)} books unchanged, "
+              f"{time.perf_counter() - started:.2f}s)")
+        return True
 
-    with open(target_file, 'r', encoding='utf-8') as f:
+    with open(target_file, "r", encoding="utf-8") as f:
         try:
             bible_data = json.load(f)
         except json.JSONDecodeError:
             print("Error decoding target JSON. Initializing as empty dict.")
             bible_data = {}
 
-    # Iterate through the files in the Books directory
-    for filename in os.listdir(books_dir):
-        if not filename.endswith(".json"):
+    if len(changed) >= PARALLEL_MIN and (jobs or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(read_book, changed, chunksize=4))
+    else:
+        results = [read_book(p) for p in changed]
+
+    for path, (content, error) in zip(changed, results):
+        target_key = file_to_key_mapping[path.stem]
+        if error:
+            print(f"  {error} Skipping.")
+            digests.pop(path.name, None)
             continue
+        bible_data[target_key] = content
+        print(f"Updated {target_key} from {path.name}.")
+
+    write_json_atomic(target_file, bible_data, indent=2 if pretty else None)
+    state["target"] = file_digest(target_file)
+    state["books"] = digests
+    state["pretty"] = pretty
+    write_json_atomic(state_file, state)
+    print(f"Finished populating TWI_bible.json: {len(changed)} of {len(digests)} book(s) changed "
+          f"({time.perf_counter() - started:.2f}s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge data/TWI/Books into TWI_bible.json.")
+    parser.add_argument("data_root", nargs="?", default=str(ROOT / "data"))
+    parser.add_argument("--pretty", action="store_true", help="write indented JSON for diffing")
+    parser.add_argument("--force", action="store_true", help="re-read every book")
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args()
+    if not populate_bible(args.data_root, args.pretty, args.force, args.jobs):
+        sys.exit(1)
 
-        file_base_name = os.path.splitext(filename)[0]
-        
-        if file_base_name in file_to_key_mapping:
-            target_key = file_to_key_mapping[file_base_name]
-            file_path = os.path.join(books_dir, filename)
-            
-            print(f"Processing {filename} -> {target_key}...")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                try:
-                    book_data = json.load(f)
-                    # The book data structure is usually { "Book Name": { ... content ... } }
-                    # We want the content.
-                    # Let's find the root key.
-                    if book_data:
-                        root_key = list(book_data.keys())[0]
-                        content = book_data[root_key]
-                        
-                        # Update the bible_data
-                        bible_data[target_key] = content
-                        print(f"  Updated {target_key}.")
-                    else:
-                        print(f"  Warning: {filename} is empty.")
-                except json.JSONDecodeError:
-                    print(f"  Error decoding {filename}. Skipping.")
-        else:
-            print(f"Skipping {filename} (no mapping found).")
-
-    # Save the updated JSON
-    with open(target_file, 'w', encoding='utf-8') as f:
-        json.dump(bible_data, f, ensure_ascii=False, indent=2)
-    
-    print("Finished populating TWI_bible.json")
 
 if __name__ == "__main__":
-    populate_bible()
+    main()
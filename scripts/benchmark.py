@@ -0,0 +1,296 @@
+"""
+Headless micro-benchmarks for the data and view layers.
+
+Runs without a display: the app is driven through a stub page that records
+updates instead of talking to a Flet client, and background work runs inline
+so every timing covers the whole operation. Settings, bookmarks and the resume
+snapshot are redirected to a temp folder, so the real ones are never touched.
+
+Usage (from project root):
+    python scripts/benchmark.py [--repeat N] [--translation KJV] [--out bench_results.json]
+                                [--baseline old.json] [--tolerance 0.25] [--data-only]
+
+It will:
+ - time list_translations and load_data (open + full walk) for every translation
+ - time search index load and run_search over a fixed query set, and
+   all-translation search cold (indexes built, or loaded from disk) and warm
+ - time show_read_page for worst-case chapters (Psalm 119, Esther 8, Numbers 7)
+   cold and warm, and show_library_page cold (tiles built) and warm
+ - write min/median/mean/max in milliseconds per benchmark to --out as JSON
+ - with --baseline, exit 1 if any median is slower than baseline * (1 + tolerance)
+
+The data benchmarks only need src/sources.py; Flet and the app are imported
+for the view and search benchmarks, which --data-only skips.
+"""
+from pathlib import Path
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import corpus  # noqa: E402
+from search_index import index_path_for  # noqa: E402
+import sources  # noqa: E402
+
+QUERIES = [
+    "God",
+    "love",
+    "let there be light",
+    "Onyankopɔn",
+    "the son of man",
+    "John 3:16",
+    "Psalm 23",
+    "zzzz",
+]
+
+# (canonical book position, chapter): the longest chapters to render
+WORST_CHAPTERS = [(18, "119"), (16, "8"), (3, "7")]
+
+
+class StubPage:
+    """Just enough of ft.Page for BibleApp, with background work run inline."""
+
+    def __init__(self, width=1000, height=800):
+        self.controls = []
+        self.width = width
+        self.height = height
+        self.updates = 0
+        self.title = None
+        self.padding = None
+        self.scroll = None
+        self.theme_mode = None
+        self.bgcolor = None
+        self.on_resize = None
+        self.on_window_event = None
+        self.snack_bar = None
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def run_thread(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+    def set_clipboard(self, text):
+        pass
+
+    def open(self, control):
+        pass
+
+    def close(self, control=None):
+        pass
+
+
+def measure(fn, repeat, setup=None, warmup=1):
+    """Run ``fn`` ``warmup + repeat`` times; return per-run milliseconds (warmups dropped)."""
+    times = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t) * 1000
+        if i >= warmup:
+            times.append(ms)
+    return times
+
+
+def summarize(name, times, **extra):
+    row = {
+        "name": name,
+        "n": len(times),
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+        "max_ms": round(max(times), 3),
+    }
+    row.update(extra)
+    print(f"{name:<40} median {row['median_ms']:>9.2f} ms   min {row['min_ms']:>9.2f} ms")
+    return row
+
+
+def close_compiled():
+    for c in list(corpus._OPEN.values()):
+        c.close()
+    corpus._OPEN.clear()
+
+
+def walk(data):
+    """Touch every verse; returns the verse count."""
+    n = 0
+    for book in data:
+        chapters = data[book]
+        for chapter in chapters:
+            verses = chapters[chapter]
+            for v in verses:
+                verses[v]
+                n += 1
+    return n
+
+
+# ===============================
+# Benchmarks
+# ===============================
+def bench_data(repeat):
+    rows = [summarize("list_translations", measure(sources.list_translations, repeat))]
+    for name, path in sources.list_translations().items():
+        rows.append(summarize(f"load_data[{name}].open", measure(lambda: sources.load_data(path), repeat, setup=close_compiled)))
+        data = sources.load_data(path)
+        count = walk(data)
+        rows.append(summarize(f"load_data[{name}].walk", measure(lambda: walk(sources.load_data(path)), repeat, setup=close_compiled), verses=count))
+    close_compiled()
+    return rows
+
+
+def make_app(main, translation):
+    main.SETTINGS_FILE.write_text(json.dumps({"translation": translation}), encoding="utf-8")
+    app = main.BibleApp(StubPage())
+    app._ready.wait()
+    return app
+
+
+def bench_search(app, repeat):
+    name = app.selected_translation
+    rows = []
+
+    def forget_indexes(names):
+        # providers keep their index too, so reopen the translations
+        app._search_indexes.clear()
+        for n in names:
+            app.store.drop(n)
+
+    def cold_index():
+        forget_indexes([name])
+    rows.append(summarize(f"search_index[{name}].load", measure(app.get_search_index, repeat, setup=cold_index)))
+    app.get_search_index()
+
+    app.open_search()
+    for query in QUERIES:
+        def run(q=query):
+            app.search_input.value = q
+            app.search_all.value = False
+            app.run_search(None)
+        times = measure(run, repeat)
+        hits = len(app._search_state["hits"]) if app._search_state else 0
+        rows.append(summarize(f"run_search[{name}] {query!r}", times, hits=hits))
+
+    names = list(app.translations)
+
+    def run_all():
+        app.search_input.value = "light"
+        app.search_all.value = True
+        app.run_search(None)
+
+    def cold_build():
+        forget_indexes(names)
+        for n in names:
+            source = app.translations[n]
+            if not isinstance(source, sources.SqliteSource):
+                index_path_for(source).unlink(missing_ok=True)
+
+    def cold_load():
+        forget_indexes(names)
+    rows.append(summarize("run_search[all] 'light' cold build", measure(run_all, repeat, setup=cold_build, warmup=0)))
+    rows.append(summarize("run_search[all] 'light' cold load", measure(run_all, repeat, setup=cold_load, warmup=0)))
+    rows.append(summarize("run_search[all] 'light'", measure(run_all, repeat)))
+    app.search_all.value = False
+    return rows
+
+
+def bench_views(app, repeat):
+    name = app.selected_translation
+    rows = []
+    budget = app._prefetch.budget
+    app._prefetch.budget = 0  # keep the worker out of the timings
+    for book_id, chapter in WORST_CHAPTERS:
+        book = app.store.book_name(name, book_id)
+        if book is None or chapter not in app.data.get(book, {}):
+            continue
+        verses = len(app.data[book][chapter])
+        rows.append(summarize(f"show_read_page[{name}] {book} {chapter} cold",
+                              measure(lambda: app.open_verses(book, chapter), repeat, setup=app._prefetch.clear), verses=verses))
+        rows.append(summarize(f"show_read_page[{name}] {book} {chapter} warm",
+                              measure(lambda: app.open_verses(book, chapter), repeat), verses=verses))
+    app._prefetch.budget = budget
+
+    def cold_tiles():
+        app._tile_cache = {}
+        app._tile_cache_scope = None
+    rows.append(summarize(f"show_library_page[{name}] cold", measure(app.show_library_page, repeat, setup=cold_tiles)))
+    rows.append(summarize(f"show_library_page[{name}] warm", measure(app.show_library_page, repeat)))
+    return rows
+
+
+def compare(rows, baseline_path, tolerance):
+    """Names whose median regressed beyond ``tolerance`` against the baseline file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = {r["name"]: r for r in json.load(f).get("results", [])}
+    slower = []
+    for r in rows:
+        b = base.get(r["name"])
+        if b and b["median_ms"] > 0 and r["median_ms"] > b["median_ms"] * (1 + tolerance):
+            slower.append((r["name"], b["median_ms"], r["median_ms"]))
+    return slower
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--translation", default="KJV")
+    parser.add_argument("--out", default=str(ROOT / "bench_results.json"))
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--data-only", action="store_true", help="skip the view and search benchmarks (no Flet)")
+    args = parser.parse_args()
+
+    rows = bench_data(args.repeat)
+    flet_version = None
+    translations = sources.list_translations()
+    if translations and not args.data_only:
+        import flet as ft
+        import main
+
+        # keep the user's settings, bookmarks and resume snapshot out of it
+        scratch = Path(tempfile.mkdtemp(prefix="bible-bench-"))
+        main.SETTINGS_FILE = scratch / "bible_settings.json"
+        main.BOOKMARKS_FILE = scratch / "bible_bookmarks.json"
+        main.RESUME_FILE = scratch / "bible_resume.json"
+
+        flet_version = getattr(ft, "__version__", None) or getattr(getattr(ft, "version", None), "version", None)
+        translation = args.translation if args.translation in translations else next(iter(translations))
+        app = make_app(main, translation)
+        rows += bench_views(app, args.repeat)
+        rows += bench_search(app, args.repeat)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "flet": flet_version,
+            "repeat": args.repeat,
+        },
+        "results": rows,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nwrote {args.out}")
+
+    if args.baseline:
+        slower = compare(rows, args.baseline, args.tolerance)
+        for name, before, after in slower:
+            print(f"REGRESSION {name}: {before:.2f} -> {after:.2f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,55 @@
+"""
+Build the SQLite corpus (with its FTS5 search table) from the data folder.
+
+Every translation the app finds in the data folder is loaded through the
+app's own loader and written to one database. Set `"backend": "sqlite"` in
+bible_settings.json to have the app read translations from it.
+
+Usage (from project root):
+    python scripts/build_sqlite.py [data-folder] [--out PATH]
+
+It will:
+ - load every translation the app would list (JSON, compiled or per-book folders)
+ - write them to `<data-folder>/bible.sqlite` (built under a temp name, then renamed)
+ - print progress per translation and a size summary
+"""
+from pathlib import Path
+import argparse
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from providers import DB_NAME, SqliteSource, build_database, sqlite_translations  # noqa: E402
+from sources import BOOK_ALIASES, list_translations, load_data  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Build the SQLite corpus with FTS5 search.")
+parser.add_argument("data", nargs="?", default=str(ROOT / "data"))
+parser.add_argument("--out")
+args = parser.parse_args()
+
+data_dir = Path(args.data)
+if not data_dir.exists():
+    print(f"Data folder not found: {data_dir}")
+    sys.exit(2)
+out = Path(args.out) if args.out else data_dir / DB_NAME
+
+# the database itself is not a source
+translations = {name: path for name, path in list_translations(folder=data_dir).items() if not isinstance(path, SqliteSource)}
+if not translations:
+    print(f"No translations under {data_dir}")
+    sys.exit(1)
+
+
+def progress(name, done, total):
+    print(f"\r{name}: {done}/{total} books", end="", flush=True)
+    if done == total:
+        print()
+
+
+start = time.perf_counter()
+build_database({name: (path, load_data(path)) for name, path in translations.items()},
+               out, BOOK_ALIASES, progress)
+print(f"{out}: {', '.join(sqlite_translations(out))}, "
+      f"{out.stat().st_size / 1024 / 1024:.1f} MiB in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,51 @@
+"""
+Compile translations into packed, memory-mappable `.bbin` files.
+
+The app compiles a translation on first use, but running this ahead of a build
+means the first launch doesn't have to.
+
+Usage (from project root):
+    python scripts/compile_corpus.py [data-folder]
+
+It will:
+ - compile every `*_bible.json` found in the data folder (and one level below);
+   list-of-objects files are streamed with progress instead of parsed whole
+ - write `<name>_bible.bbin` next to each source
+ - print a short summary per translation
+"""
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from corpus import CompiledCorpus, compile_corpus, compile_entries, compiled_path_for, source_stamp  # noqa: E402
+from ingest import is_list_format, iter_list_entries  # noqa: E402
+from sources import load_json_corpus  # noqa: E402
+
+
+def progress(done, total):
+    print(f"\r  {done / max(total, 1):.0%}", end="", flush=True)
+    if done >= total:
+        print()
+
+
+data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "data"
+if not data_dir.exists():
+    print(f"Data folder not found: {data_dir}")
+    sys.exit(2)
+
+sources = sorted(list(data_dir.glob("*_bible.json")) + list(data_dir.glob("*/*_bible.json")))
+if not sources:
+    print(f"No *_bible.json files under {data_dir}")
+for src in sources:
+    target = compiled_path_for(src)
+    if is_list_format(src):
+        compile_entries(iter_list_entries(src, progress=progress), target, source_stamp(src))
+    else:
+        compile_corpus(load_json_corpus(src), target, source_stamp(src))
+    corpus = CompiledCorpus(target)
+    books, chapters, verses = corpus.counts
+    corpus.close()
+    print(f"{src.name} -> {target.name}: {books} books, {chapters} chapters, {verses} verses, "
+          f"{target.stat().st_size / 1024:.0f} KiB")
@@ -0,0 +1,156 @@
+"""
+Import books from translators' sources into the per-book JSON layout or
+straight into a compiled `.bbin` store.
+
+Sources are read by the front ends in src/importers.py, chosen by file
+suffix: `.docx` (paragraphs), `.txt` (lines), `.usfm`/`.sfm` and
+`.osis`/`.xml`. Docx and text sources have no book markers, so the book comes
+from --book or the file name ("Daniel Asante Twi.docx" -> Daniel). Several
+sources are imported in parallel, one per worker process.
+
+Usage (from project root):
+    python scripts/import_books.py SOURCE... [--out DIR] [--compile FILE.bbin]
+                                   [--format docx|text|usfm|osis] [--book NAME]
+                                   [--names english|twi] [--max-chapters N]
+                                   [--chapter-start "PREFIX=N" ...]
+                                   [--log import_log.jsonl] [--jobs N]
+
+It will:
+ - import every source, checking it against the canonical versification
+ - with --out, write `<DIR>/<book>.json` for every book found
+ - with --compile, pack all books into one `.bbin` (a compiled-only
+   translation when written as `data/<T>/<T>_bible.bbin`)
+ - write every anomaly as one JSON object per line to the --log file and
+   print the counts per source and kind
+ - exit 1 if a source couldn't be read
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import json
+import os
+import sys
+import time
+from xml.etree.ElementTree import ParseError
+import xml.sax
+import zipfile
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from corpus import compile_entries  # noqa: E402
+from importers import import_file, iter_entries, write_books  # noqa: E402
+from sources import NT_ORDER, OT_ORDER, TWI_NT_ORDER, TWI_OT_ORDER  # noqa: E402
+
+NAMES = {
+    "english": OT_ORDER + NT_ORDER,
+    "twi": TWI_OT_ORDER + TWI_NT_ORDER,
+}
+ALIASES = [NAMES["english"], NAMES["twi"]]
+
+
+def import_source(path, options):
+    """Worker: ``import_file`` with read errors reported instead of raised."""
+    try:
+        return import_file(path, **options)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile, xml.sax.SAXException, ParseError) as e:
+        return {"source": str(path), "error": f"{type(e).__name__}: {e}", "books": {}, "anomalies": []}
+
+
+def chapter_starts(values):
+    starts = {}
+    for value in values or ():
+        prefix, sep, chap = value.rpartition("=")
+        if not sep or not chap.strip().isdigit():
+            raise SystemExit(f"--chapter-start expects PREFIX=N, got {value!r}")
+        starts[prefix] = chap.strip()
+    return starts
+
+
+def summarize(anomalies):
+    counts = {}
+    for a in anomalies:
+        counts[a["kind"]] = counts.get(a["kind"], 0) + 1
+    return ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items()))
+
+
+def main_():
+    parser = argparse.ArgumentParser(description="Import books from docx, text, USFM or OSIS sources.")
+    parser.add_argument("sources", nargs="+")
+    parser.add_argument("--out", help="folder for per-book JSON files")
+    parser.add_argument("--compile", help="write all books into this .bbin")
+    parser.add_argument("--format", choices=("docx", "text", "usfm", "osis"))
+    parser.add_argument("--book", help="book of a docx/text source (default: from the file name)")
+    parser.add_argument("--names", choices=sorted(NAMES), default="english", help="book names to emit")
+    parser.add_argument("--max-chapters", type=int, help="largest bare number read as a chapter heading")
+    parser.add_argument("--chapter-start", action="append", metavar="PREFIX=N",
+                        help="a chapter starts at the line beginning with PREFIX (repeatable)")
+    parser.add_argument("--log", default="import_log.jsonl", help="anomaly log (JSON lines)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    if not args.out and not args.compile:
+        parser.error("give --out and/or --compile")
+    if args.book and len(args.sources) > 1:
+        parser.error("--book needs exactly one source")
+    missing = [s for s in args.sources if not Path(s).is_file()]
+    if missing:
+        print(f"Source not found: {', '.join(missing)}")
+        sys.exit(2)
+
+    options = {
+        "fmt": args.format,
+        "book": args.book,
+        "names": NAMES[args.names],
+        "aliases": ALIASES,
+        "max_chapters": args.max_chapters,
+        "chapter_starts": chapter_starts(args.chapter_start),
+    }
+    started = time.perf_counter()
+    sources = [Path(s) for s in args.sources]
+    jobs = max(1, min(args.jobs, len(sources)))
+    if jobs == 1:
+        results = [import_source(s, options) for s in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(import_source, sources, [options] * len(sources)))
+
+    failed = False
+    books = {}
+    anomalies = []
+    for result in results:
+        name = Path(result["source"]).name
+        if result.get("error"):
+            print(f"{name}: {result['error']}")
+            failed = True
+            continue
+        for book, chapters in result["books"].items():
+            if book in books:
+                print(f"  {book} also in an earlier source; {name} wins")
+            books[book] = chapters
+        anomalies.extend(result["anomalies"])
+        found = ", ".join(f"{b} ({len(c)} ch, {sum(len(v) for v in c.values())} v)"
+                          for b, c in result["books"].items()) or "no books"
+        print(f"{name} [{result['format']}]: {found} ({result['seconds']:.2f}s)")
+        if result["anomalies"]:
+            print(f"  {summarize(result['anomalies'])}")
+
+    if args.out:
+        for path in write_books(books, args.out):
+            print(f"wrote {path}")
+    if args.compile and books:
+        compile_entries(iter_entries(books), args.compile)
+        print(f"compiled {len(books)} book(s) into {args.compile}")
+
+    log = Path(args.log)
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with open(log, "w", encoding="utf-8") as f:
+        for record in anomalies:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"{len(anomalies)} anomalies logged to {log} ({time.perf_counter() - started:.2f}s)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_()
@@ -1,43 +1,260 @@
 """
 Prepare app assets for packaging.
 
-This script copies the top-level `data/` folder into `src/data` so the Flet packager
-(which zips the `src` folder into `app.zip`) will include the JSON files inside the
-final APK.
+The Flet packager zips the `src` folder into `app.zip`, so whatever ends up in
+`src/data` ships inside the APK. Rather than the raw, pretty-printed JSON tree,
+this writes one compressed bundle per translation (`<T>/<T>_bible.bbz`, see
+corpus.write_bundle); the app decompresses a book only when it is opened.
+
+The run is incremental. `src/data/assets_manifest.json` records, for every
+output, a hash of the inputs it was built from and a hash of the output itself.
+An output is rebuilt only when its inputs changed or the file on disk no longer
+matches; inside a bundle, books whose text is unchanged keep their compressed
+block. Outputs are built in parallel and files in `src/data` that no output
+accounts for are removed.
 
 Usage (from project root):
-    python scripts/prepare_assets.py
+    python scripts/prepare_assets.py [--codec lzma|zlib] [--raw] [--jobs N] [--force]
 
 It will:
- - create or replace `src/data` with a copy of the top-level `data/` folder
- - print a short summary of files copied
+ - write a bundle for every translation found in the top-level `data/` folder
+   and copy the settings and bookmarks files next to them
+ - with --raw, mirror the `data/` tree as-is instead (the old behaviour)
+ - skip anything whose inputs and output are unchanged (--force rebuilds all)
+ - remove orphaned files from `src/data`
+ - print and record in the manifest what was added, updated, kept and removed
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import argparse
+import hashlib
+import os
 import shutil
 import sys
+import time
 
 ROOT = Path(__file__).resolve().parent.parent
 SRC_DATA = ROOT / "src" / "data"
 TOP_DATA = ROOT / "data"
+sys.path.insert(0, str(ROOT / "src"))
+
+from corpus import BUNDLE_SUFFIX, BUNDLE_VERSION, CODECS, BundleCorpus, write_bundle  # noqa: E402
+from persist import read_json, write_json_atomic  # noqa: E402
+from sources import list_translations, load_data  # noqa: E402
+
+MANIFEST_NAME = "assets_manifest.json"
+MANIFEST_VERSION = 1
+
+# top-level files shipped as they are
+SHIPPED_FILES = ("bible_settings.json", "bible_bookmarks.json")
+# generated or per-device files never shipped in --raw mode
+RAW_SKIP_SUFFIXES = (".bbin", ".idx", ".journal", ".sqlite", ".tmp")
+RAW_SKIP_NAMES = ("bible_resume.json",)
+
+
+# ===============================
+# Hashing
+# ===============================
+class Hasher:
+    """sha256 of files, reusing last run's digest while mtime and size match.
+
+    Digests are keyed by path relative to the project root.
+    """
+
+    def __init__(self, previous=None):
+        self.previous = previous or {}
+        self.seen = {}
+
+    def file(self, path):
+        path = Path(path)
+        key = os.path.relpath(path.resolve(), ROOT).replace(os.sep, "/")
+        st = path.stat()
+        old = self.previous.get(key)
+        if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+            digest = old[2]
+        else:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+        self.seen[key] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    def files(self, paths, *salt):
+        h = hashlib.sha256()
+        for s in salt:
+            h.update(str(s).encode("utf-8") + b"\0")
+        for p in sorted(paths, key=lambda p: p.name):
+            h.update(p.name.encode("utf-8") + b"\0" + self.file(p).encode("ascii"))
+        return h.hexdigest()
+
+
+def source_files(source):
+    source = Path(source)
+    return sorted(source.glob("*.json")) if source.is_dir() else [source]
+
+
+# ===============================
+# Tasks
+# ===============================
+class Task:
+    """One file in src/data and how to produce it."""
+
+    def __init__(self, rel, inputs, build, salt=()):
+        self.rel = rel
+        self.inputs = inputs
+        self.build = build
+        self.salt = salt
+
+    @property
+    def target(self):
+        return SRC_DATA / self.rel
+
+
+def copy_task(rel, source):
+    def build(target):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        shutil.copy2(source, tmp)
+        os.replace(tmp, target)
+        return "copied"
+    return Task(rel, [Path(source)], build, salt=("copy",))
 
-if not TOP_DATA.exists():
-    print(f"Source data folder not found: {TOP_DATA}")
-    sys.exit(2)
-
-# Remove existing src/data if present, then copy
-try:
-    if SRC_DATA.exists():
-        print(f"Removing existing \"{SRC_DATA}\"...")
-        shutil.rmtree(SRC_DATA)
-    print(f"Copying {TOP_DATA} -> {SRC_DATA} ...")
-    shutil.copytree(TOP_DATA, SRC_DATA)
-
-    # summary
-    total = 0
-    for p in SRC_DATA.rglob("*.json"):
-        total += 1
-    print(f"Copied data into src/data. JSON files copied: {total}")
+
+def bundle_task(name, source, codec):
+    rel = f"{name}/{name}_bible{BUNDLE_SUFFIX}"
+
+    def build(target):
+        previous = None
+        try:
+            previous = BundleCorpus(target) if target.exists() else None
+        except ValueError:
+            previous = None
+        try:
+            _, _, reused = write_bundle(load_data(Path(source)), target, codec, previous)
+        finally:
+            if previous is not None:
+                previous.close()
+        return f"bundled, {reused} book(s) reused" if reused else "bundled"
+    return Task(rel, source_files(source), build, salt=("bundle", BUNDLE_VERSION, codec))
+
+
+def plan(args):
+    tasks = []
+    if args.raw:
+        for p in sorted(TOP_DATA.rglob("*")):
+            if not p.is_file() or p.suffix in RAW_SKIP_SUFFIXES or p.name in RAW_SKIP_NAMES:
+                continue
+            if p.name.startswith("trace-"):
+                continue
+            tasks.append(copy_task(p.relative_to(TOP_DATA).as_posix(), p))
+        return tasks
+    for name, source in list_translations(folder=TOP_DATA).items():
+        if Path(source).suffix == BUNDLE_SUFFIX:
+            tasks.append(copy_task(f"{name}/{Path(source).name}", source))
+        else:
+            tasks.append(bundle_task(name, source, args.codec))
+    for fname in SHIPPED_FILES:
+        if (TOP_DATA / fname).exists():
+            tasks.append(copy_task(fname, TOP_DATA / fname))
+    return tasks
+
+
+# ===============================
+# Run
+# ===============================
+def load_manifest():
+    data = read_json(SRC_DATA / MANIFEST_NAME)
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {"outputs": {}, "files": {}}
+    return data
+
+
+def remove_orphans(keep):
+    removed = []
+    for p in sorted(SRC_DATA.rglob("*"), reverse=True):
+        rel = p.relative_to(SRC_DATA).as_posix()
+        if p.is_file() and rel not in keep:
+            p.unlink()
+            removed.append(rel)
+        elif p.is_dir() and not any(p.iterdir()):
+            p.rmdir()
+    return sorted(removed)
+
+
+def main_():
+    parser = argparse.ArgumentParser(description="Prepare app assets for packaging.")
+    parser.add_argument("--codec", choices=sorted(CODECS), default="lzma")
+    parser.add_argument("--raw", action="store_true", help="mirror data/ as-is instead of bundling")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--force", action="store_true", help="rebuild every output")
+    args = parser.parse_args()
+
+    if not TOP_DATA.exists():
+        print(f"Source data folder not found: {TOP_DATA}")
+        sys.exit(2)
+
+    started = time.perf_counter()
+    manifest = load_manifest()
+    outputs = manifest.get("outputs", {})
+    hasher = Hasher(manifest.get("files"))
+    tasks = plan(args)
+    SRC_DATA.mkdir(parents=True, exist_ok=True)
+
+    def run(task):
+        inputs = hasher.files(task.inputs, *task.salt)
+        old = outputs.get(task.rel)
+        existed = task.target.exists()
+        if not args.force and old and old.get("inputs") == inputs and task.target.exists():
+            try:
+                if hasher.file(task.target) == old.get("sha256"):
+                    return task, "unchanged", None, inputs
+            except OSError:
+                pass
+        detail = task.build(task.target)
+        return task, "updated" if existed else "added", detail, inputs
+
+    changes = {"added": [], "updated": [], "unchanged": [], "removed": []}
+    new_outputs = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for task, status, detail, inputs in pool.map(run, tasks):
+            new_outputs[task.rel] = {
+                "inputs": inputs,
+                "sha256": hasher.file(task.target),
+                "size": task.target.stat().st_size,
+            }
+            changes[status].append(task.rel)
+            if status != "unchanged":
+                print(f"{status:<9} {task.rel} ({detail}, {new_outputs[task.rel]['size'] / 1024:.0f} KiB)")
+
+    changes["removed"] = remove_orphans(set(new_outputs) | {MANIFEST_NAME})
+    for rel in changes["removed"]:
+        print(f"removed   {rel}")
+
+    total = sum(o["size"] for o in new_outputs.values())
+    summary = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "mode": "raw" if args.raw else f"bundle/{args.codec}",
+        "seconds": round(time.perf_counter() - started, 3),
+        "bytes": total,
+        "changes": changes,
+    }
+    write_json_atomic(SRC_DATA / MANIFEST_NAME, {
+        "version": MANIFEST_VERSION,
+        "outputs": new_outputs,
+        "files": hasher.seen,
+        "summary": summary,
+    })
+    print(f"{len(changes['added'])} added, {len(changes['updated'])} updated, "
+          f"{len(changes['unchanged'])} unchanged, {len(changes['removed'])} removed; "
+          f"src/data is {total / 2**20:.1f} MiB ({summary['mode']}, {summary['seconds']:.2f}s)")
     print("Ready for: flet build apk")
-except Exception as e:
-    print("Error while preparing assets:", e)
-    raise
+
+
+if __name__ == "__main__":
+    try:
+        main_()
+    except Exception as e:
+        print("Error while preparing assets:", e)
+        raise
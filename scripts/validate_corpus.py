@@ -0,0 +1,113 @@
+"""
+Validate every translation against the canonical versification and write the
+corpus manifest the app reads chapter and verse counts from.
+
+Translations are surveyed in parallel, one per worker process. For each one
+the manifest (`<data>/corpus_manifest.json`, see src/manifest.py) records per
+book the chapters with their verse counts and per chapter the missing, extra,
+duplicate and empty verses. Run it before a release as a data-quality gate.
+
+Usage (from project root):
+    python scripts/validate_corpus.py [data-folder] [--only KJV,TWI] [--jobs N]
+                                      [--fail-on errors|warnings|never] [--show N]
+
+It will:
+ - survey every translation found in the data folder (or those in --only,
+   keeping the other entries of an existing manifest)
+ - write the manifest atomically
+ - print totals per translation and the first --show issues of each
+ - exit 1 if any translation has errors (or warnings, with --fail-on warnings)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import os
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from manifest import MANIFEST_NAME, MANIFEST_VERSION, fingerprint, read_source, source_key, survey  # noqa: E402
+from persist import read_json, write_json_atomic  # noqa: E402
+from sources import BOOK_ALIASES, NT_ORDER, OT_ORDER, list_translations, load_data  # noqa: E402
+
+
+def survey_translation(name, source):
+    """Worker: the manifest entry for one translation."""
+    started = time.perf_counter()
+    data, duplicates = read_source(source, load_data, OT_ORDER + NT_ORDER)
+    entry = survey(data, BOOK_ALIASES.lookup, duplicates)
+    entry["source"] = source_key(source)
+    entry["fingerprint"] = fingerprint(source)
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return name, entry
+
+
+def describe(entry, limit):
+    """Up to ``limit`` readable issue lines for one translation."""
+    lines = []
+    if entry["missing_books"]:
+        lines.append(f"missing books: {', '.join(entry['missing_books'])}")
+    if entry["unknown_books"]:
+        lines.append(f"unknown books: {', '.join(entry['unknown_books'])}")
+    for name, book in entry["books"].items():
+        for key in ("missing_chapters", "extra_chapters", "duplicate_chapters"):
+            if book.get(key):
+                lines.append(f"{name}: {key.replace('_', ' ')} {', '.join(book[key])}")
+        for chap, found in book.get("issues", {}).items():
+            parts = [f"{kind} {','.join(verses)}" for kind, verses in found.items()]
+            lines.append(f"{name} {chap}: {'; '.join(parts)}")
+    more = len(lines) - limit
+    return lines[:limit] + ([f"... and {more} more"] if more > 0 else [])
+
+
+def main_():
+    parser = argparse.ArgumentParser(description="Validate translations and write the corpus manifest.")
+    parser.add_argument("data", nargs="?", default=str(ROOT / "data"))
+    parser.add_argument("--only", help="comma-separated translation names")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--fail-on", choices=("errors", "warnings", "never"), default="errors")
+    parser.add_argument("--show", type=int, default=10, help="issues to print per translation")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data)
+    if not data_dir.exists():
+        print(f"Data folder not found: {data_dir}")
+        sys.exit(2)
+    translations = list_translations(folder=data_dir)
+    if args.only:
+        wanted = [n.strip() for n in args.only.split(",") if n.strip()]
+        translations = {n: s for n, s in translations.items() if n in wanted}
+    if not translations:
+        print(f"No translations found under {data_dir}")
+        sys.exit(2)
+
+    path = data_dir / MANIFEST_NAME
+    manifest = read_json(path)
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "translations": {}}
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(translations)))) as pool:
+        results = list(pool.map(survey_translation, translations.keys(), translations.values()))
+
+    failed = False
+    for name, entry in results:
+        manifest["translations"][name] = entry
+        t = entry["totals"]
+        print(f"{name}: {t['books']} books, {t['chapters']} chapters, {t['verses']} verses; "
+              f"{t['errors']} error(s), {t['warnings']} warning(s) ({entry['seconds']:.2f}s)")
+        for line in describe(entry, args.show):
+            print(f"  {line}")
+        if (args.fail_on == "errors" and t["errors"]) or (args.fail_on == "warnings" and (t["errors"] or t["warnings"])):
+            failed = True
+    manifest["generated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    write_json_atomic(path, manifest, indent=None)
+    print(f"wrote {path} in {time.perf_counter() - started:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,177 @@
+"""
+Bookmark and highlight store keyed by canonical verse ID (see store.verse_id).
+
+Entries live in memory in two dicts: verse ID -> attributes
+(``{"bookmark": True, "highlight": "#ffd54f"}``) and chapter -> verse numbers,
+so "is this verse bookmarked" and "marks in this chapter" are single lookups.
+
+On disk there is a compacted snapshot (``bible_bookmarks.json``) and an
+append-only journal next to it. A change appends one JSON line to the journal;
+once the journal grows past ``compact_every`` lines the snapshot is rewritten
+atomically and the journal emptied. Journal lines only ever set attributes, so
+replaying one twice (a crash between the two steps) is harmless.
+
+One lock covers in-memory changes, the journal append and compaction, since
+Flet runs handlers on worker threads: a line can't be appended between the
+snapshot rewrite and the journal truncation, and compaction never iterates
+while an entry is being set.
+
+The snapshot keeps the ``book``/``chapter``/``verse`` fields the app used to
+write, and old files without IDs are read by resolving those names.
+"""
+from pathlib import Path
+import json
+import threading
+import time
+
+from persist import write_json_atomic
+from store import split_verse_id, verse_id
+
+SNAPSHOT_VERSION = 2
+
+
+class BookmarkStore:
+    def __init__(self, path, resolve, names=None, compact_every=200):
+        """``resolve(book name)`` gives a canonical book position; ``names[pos]``
+        is the name written to the snapshot for older readers."""
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.compact_every = compact_every
+        self._resolve = resolve
+        self._names = names or []
+        self._entries = {}  # verse id -> attrs, in insertion order
+        self._chapters = {}  # verse id // 1000 -> {verse: attrs}
+        self._unresolved = []  # legacy entries whose book isn't known, kept as-is
+        self._journal_lines = 0
+        # reentrant: set() compacts while holding it
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---------- loading ----------
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            raw = {}
+        items = raw if isinstance(raw, list) else raw.get("bookmarks", []) if isinstance(raw, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            vid = item.get("id")
+            if vid is None:
+                pos = self._resolve(str(item.get("book", "")))
+                if pos is None:
+                    self._unresolved.append(item)
+                    continue
+                vid = verse_id(pos, item.get("chapter"), item.get("verse"))
+            attrs = item.get("attrs") or {"bookmark": True}
+            self._apply(int(vid), attrs)
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                        self._apply(int(op["id"]), op["attrs"])
+                        self._journal_lines += 1
+                    except (ValueError, KeyError, TypeError):
+                        # a torn last line from a crash mid-append
+                        continue
+        except OSError:
+            pass
+        if self._journal_lines >= self.compact_every:
+            self.compact()
+
+    def _apply(self, vid, attrs):
+        entry = dict(self._entries.get(vid, {}))
+        for k, v in attrs.items():
+            if v is None or v is False:
+                entry.pop(k, None)
+            else:
+                entry[k] = v
+        chapter = self._chapters.setdefault(vid // 1000, {})
+        if entry:
+            self._entries[vid] = entry
+            chapter[vid % 1000] = entry
+        else:
+            self._entries.pop(vid, None)
+            chapter.pop(vid % 1000, None)
+            if not chapter:
+                del self._chapters[vid // 1000]
+
+    # ---------- queries ----------
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __contains__(self, vid):
+        return vid in self._entries
+
+    def get(self, vid):
+        return self._entries.get(vid)
+
+    def is_bookmarked(self, vid):
+        return bool(self._entries.get(vid, {}).get("bookmark"))
+
+    def in_chapter(self, book, chapter):
+        """``{verse number: attrs}`` for one chapter of a canonical book."""
+        with self._lock:
+            return dict(self._chapters.get(verse_id(book, chapter) // 1000, {}))
+
+    # ---------- changes ----------
+    def set(self, vid, **attrs):
+        """Set (or with None, clear) attributes of a verse and journal the change."""
+        line = json.dumps({"id": vid, "attrs": attrs, "t": int(time.time())}, ensure_ascii=False)
+        with self._lock:
+            self._apply(vid, attrs)
+            try:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                self._journal_lines += 1
+            except OSError:
+                pass
+            if self._journal_lines >= self.compact_every:
+                self.compact()
+
+    def add(self, vid):
+        """Bookmark a verse; False if it already was."""
+        with self._lock:
+            if self.is_bookmarked(vid):
+                return False
+            self.set(vid, bookmark=True)
+            return True
+
+    def remove(self, vid):
+        with self._lock:
+            if not self.is_bookmarked(vid):
+                return False
+            self.set(vid, bookmark=None)
+            return True
+
+    def highlight(self, vid, color):
+        self.set(vid, highlight=color)
+
+    def compact(self):
+        """Rewrite the snapshot from memory and empty the journal."""
+        with self._lock:
+            items = []
+            for vid, attrs in self._entries.items():
+                pos, chapter, verse = split_verse_id(vid)
+                items.append({
+                    "id": vid,
+                    "book": self._names[pos] if pos < len(self._names) else None,
+                    "chapter": str(chapter),
+                    "verse": str(verse),
+                    "attrs": attrs,
+                })
+            try:
+                write_json_atomic(self.path, {"version": SNAPSHOT_VERSION, "bookmarks": items + self._unresolved})
+                with open(self.journal_path, "w", encoding="utf-8"):
+                    pass
+                self._journal_lines = 0
+            except OSError:
+                pass
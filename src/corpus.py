@@ -0,0 +1,714 @@
+"""
+Corpus backends: the compiled format and lazily loaded per-book folders.
+
+A translation is compiled once into a single packed ``.bbin`` file:
+
+    header | string blob | book table | chapter table | verse table | text blob
+
+The header records where each section starts and the mtime/size of the JSON it
+was built from, so a stale file is rebuilt automatically. At runtime the file
+is memory-mapped and verses are sliced out of the text blob on demand, which
+keeps opening a translation proportional to what is actually shown instead of
+the size of the whole Bible.
+
+Packaged builds ship ``.bbz`` bundles instead (see ``write_bundle``): one
+compressed block per book plus an index, decompressed a book at a time.
+
+Every backend hands out books and chapters that iterate in reading order
+(``Book``/``Chapter`` for parsed JSON), so callers never sort labels.
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import shutil
+import struct
+import threading
+import zlib
+
+from store import label_key
+
+MAGIC = b"BBIN"
+VERSION = 1
+COMPILED_SUFFIX = ".bbin"
+
+# magic, version, reserved, source mtime_ns, source size,
+# book/chapter/verse counts, then section offsets (strings, books,
+# chapters, verses, text)
+HEADER = struct.Struct("<4sHHqqIIIIIIII")
+# name offset, name length, first chapter index, chapter count
+BOOK = struct.Struct("<IIII")
+# label offset, label length, first verse index, verse count
+CHAPTER = struct.Struct("<IIII")
+# label offset, label length, text offset, text length
+VERSE = struct.Struct("<IIII")
+
+
+def source_stamp(path):
+    """(mtime_ns, size) of a source file, used to detect stale compiled files."""
+    st = Path(path).stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def compiled_path_for(source):
+    return Path(source).with_suffix(COMPILED_SUFFIX)
+
+
+# ===============================
+# Writer
+# ===============================
+def _mapping_entries(data):
+    # empty chapters/books are passed on with None labels so they survive
+    for book, chaps in data.items():
+        if not isinstance(chaps, Mapping):
+            continue
+        if not chaps:
+            yield book, None, None, None
+        for chap, vs in chaps.items():
+            if not isinstance(vs, Mapping):
+                continue
+            if not vs:
+                yield book, chap, None, None
+            for vnum, text in vs.items():
+                yield book, chap, vnum, text
+
+
+def compile_corpus(data, out_path, stamp=(0, 0)):
+    """Pack a nested ``{book: {chapter: {verse: text}}}`` mapping into ``out_path``."""
+    return compile_entries(_mapping_entries(data), out_path, stamp)
+
+
+def compile_entries(entries, out_path, stamp=(0, 0)):
+    """Pack ``(book, chapter, verse, text)`` entries into ``out_path``.
+
+    Entries may come in any order; a later duplicate wins (the earlier text
+    stays in the file unused). Verse text is spooled to a temp file as it
+    arrives, so only the tables are held in memory. Chapters and verses are
+    stored in numeric order and books in order of first appearance. The file
+    is written to a temp name and renamed into place.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    spool = out_path.with_name(out_path.name + ".text.tmp")
+
+    # book -> chapter -> verse -> (text offset, text length)
+    index = {}
+    text_size = 0
+    try:
+        with open(spool, "wb") as blob:
+            for book, chap, vnum, text in entries:
+                chapters = index.setdefault(str(book), {})
+                if chap is None:
+                    continue
+                verses = chapters.setdefault(str(chap), {})
+                if vnum is None:
+                    continue
+                raw = str(text if text is not None else "").encode("utf-8")
+                verses[str(vnum)] = (text_size, len(raw))
+                blob.write(raw)
+                text_size += len(raw)
+
+        strings = bytearray()
+        interned = {}
+
+        def intern(s):
+            if s not in interned:
+                raw = s.encode("utf-8")
+                interned[s] = (len(strings), len(raw))
+                strings.extend(raw)
+            return interned[s]
+
+        books = bytearray()
+        chapters = bytearray()
+        verses = bytearray()
+        n_books = n_chapters = n_verses = 0
+        for book, chaps in index.items():
+            name_off, name_len = intern(book)
+            first_chapter = n_chapters
+            for chap in sorted(chaps, key=label_key):
+                vs = chaps[chap]
+                label_off, label_len = intern(chap)
+                first_verse = n_verses
+                for vnum in sorted(vs, key=label_key):
+                    t_off, t_len = vs[vnum]
+                    v_off, v_len = intern(vnum)
+                    verses += VERSE.pack(v_off, v_len, t_off, t_len)
+                    n_verses += 1
+                chapters += CHAPTER.pack(label_off, label_len, first_verse, n_verses - first_verse)
+                n_chapters += 1
+            books += BOOK.pack(name_off, name_len, first_chapter, n_chapters - first_chapter)
+            n_books += 1
+
+        strings_off = HEADER.size
+        books_off = strings_off + len(strings)
+        chapters_off = books_off + len(books)
+        verses_off = chapters_off + len(chapters)
+        text_off = verses_off + len(verses)
+        header = HEADER.pack(
+            MAGIC, VERSION, 0, int(stamp[0]), int(stamp[1]),
+            n_books, n_chapters, n_verses,
+            strings_off, books_off, chapters_off, verses_off, text_off,
+        )
+        with open(tmp, "wb") as f:
+            for part in (header, strings, books, chapters, verses):
+                f.write(part)
+            with open(spool, "rb") as blob:
+                shutil.copyfileobj(blob, f, 1 << 20)
+        os.replace(tmp, out_path)
+    finally:
+        try:
+            spool.unlink()
+        except OSError:
+            pass
+    return out_path
+
+
+# ===============================
+# Ordered containers
+# ===============================
+_DENSE = {}
+
+
+def _dense_labels(n):
+    """The shared tuple ``("1", ..., str(n))``."""
+    labels = _DENSE.get(n)
+    if labels is None:
+        labels = _DENSE[n] = tuple(str(i) for i in range(1, n + 1))
+    return labels
+
+
+class _Ordered(Mapping):
+    """Mapping over ``labels`` in reading order, with positional lookup.
+
+    Labels are sorted once when the object is built. When they run
+    ``"1".."n"`` (almost every chapter and book) the label tuple is shared and
+    a lookup is ``int(label) - 1``; otherwise a label -> position dict is kept.
+    """
+    __slots__ = ("labels", "_pos")
+
+    def _init_labels(self, labels):
+        labels = tuple(labels)
+        dense = _dense_labels(len(labels))
+        if labels == dense:
+            self.labels = dense
+            self._pos = None
+        else:
+            self.labels = tuple(str(x) for x in labels)
+            self._pos = {x: i for i, x in enumerate(self.labels)}
+
+    def position(self, label):
+        """Index of ``label`` in reading order; KeyError if absent."""
+        if self._pos is not None:
+            return self._pos[str(label)]
+        try:
+            i = int(label) - 1
+        except (TypeError, ValueError):
+            raise KeyError(label) from None
+        if 0 <= i < len(self.labels) and self.labels[i] == str(label):
+            return i
+        raise KeyError(label)
+
+    def __contains__(self, label):
+        try:
+            self.position(label)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def keys(self):
+        return self.labels
+
+
+class Chapter(_Ordered):
+    """Verses of one chapter as parallel label/text tuples."""
+    __slots__ = ("texts",)
+
+    def __init__(self, labels, texts):
+        self._init_labels(labels)
+        self.texts = tuple(texts)
+
+    def __getitem__(self, verse):
+        return self.texts[self.position(verse)]
+
+    def values(self):
+        return self.texts
+
+    def items(self):
+        return tuple(zip(self.labels, self.texts))
+
+
+class Book(_Ordered):
+    """Chapters of one book, in reading order."""
+    __slots__ = ("chapters",)
+
+    def __init__(self, labels, chapters):
+        self._init_labels(labels)
+        self.chapters = tuple(chapters)
+
+    def __getitem__(self, chapter):
+        return self.chapters[self.position(chapter)]
+
+
+def freeze_chapter(verses):
+    """A ``Chapter`` from a ``{verse: text}`` mapping, sorted once here."""
+    if isinstance(verses, Chapter):
+        return verses
+    labels = tuple(verses.keys())
+    if labels == _dense_labels(len(labels)):
+        return Chapter(labels, verses.values())
+    items = sorted(((str(k), t) for k, t in verses.items()), key=lambda kv: label_key(kv[0]))
+    return Chapter([k for k, _ in items], [t for _, t in items])
+
+
+def freeze_book(chapters):
+    if isinstance(chapters, Book):
+        return chapters
+    items = {str(c): vs for c, vs in chapters.items() if isinstance(vs, Mapping)}
+    labels = tuple(items)
+    if labels != _dense_labels(len(labels)):
+        labels = sorted(labels, key=label_key)
+    return Book(labels, [freeze_chapter(items[c]) for c in labels])
+
+
+def freeze(data):
+    """Turn a nested ``{book: {chapter: {verse: text}}}`` dict into ``Book``
+    objects, keeping book order; chapter and verse order is fixed here so
+    readers never sort again."""
+    return {book: freeze_book(chapters) for book, chapters in data.items() if isinstance(chapters, Mapping)}
+
+
+# ===============================
+# Reader
+# ===============================
+class CompiledChapter(_Ordered):
+    """Verses of one chapter; text is decoded from the map on access."""
+    __slots__ = ("_corpus", "_first")
+
+    def __init__(self, corpus, first, count):
+        self._corpus = corpus
+        self._first = first
+        labels = []
+        for i in range(first, first + count):
+            label_off, label_len, _, _ = VERSE.unpack_from(corpus._mm, corpus._verses_off + i * VERSE.size)
+            labels.append(corpus._string(label_off, label_len))
+        # the writer stores verses in reading order
+        self._init_labels(labels)
+
+    def __getitem__(self, verse):
+        i = self._first + self.position(verse)
+        _, _, t_off, t_len = VERSE.unpack_from(self._corpus._mm, self._corpus._verses_off + i * VERSE.size)
+        return self._corpus._text(t_off, t_len)
+
+
+class CompiledBook(_Ordered):
+    """Chapters of one book; only the chapter table entries are read up front."""
+    __slots__ = ("_corpus", "_first", "_chapters")
+
+    def __init__(self, corpus, first, count):
+        self._corpus = corpus
+        self._first = first
+        labels = []
+        for i in range(first, first + count):
+            label_off, label_len, _, _ = CHAPTER.unpack_from(corpus._mm, corpus._chapters_off + i * CHAPTER.size)
+            labels.append(corpus._string(label_off, label_len))
+        self._init_labels(labels)
+        self._chapters = [None] * count
+
+    def __getitem__(self, chapter):
+        pos = self.position(chapter)
+        cached = self._chapters[pos]
+        if cached is None:
+            _, _, first, count = CHAPTER.unpack_from(
+                self._corpus._mm, self._corpus._chapters_off + (self._first + pos) * CHAPTER.size)
+            cached = self._chapters[pos] = CompiledChapter(self._corpus, first, count)
+        return cached
+
+
+class CompiledCorpus(Mapping):
+    """Read-only, memory-mapped view of a ``.bbin`` file.
+
+    Behaves like the nested dict returned by ``load_data`` so the app can use
+    either interchangeably.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        try:
+            (magic, version, _, mtime_ns, size,
+             n_books, n_chapters, n_verses,
+             self._strings_off, books_off, self._chapters_off,
+             self._verses_off, self._text_off) = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{self.path} is not a compiled corpus")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a compiled corpus (version {VERSION})")
+        self.source_stamp = (mtime_ns, size)
+        self.counts = (n_books, n_chapters, n_verses)
+        self._books = {}
+        for i in range(n_books):
+            name_off, name_len, first, count = BOOK.unpack_from(self._mm, books_off + i * BOOK.size)
+            self._books[self._string(name_off, name_len)] = (first, count)
+        self._book_cache = {}
+
+    def _string(self, off, length):
+        start = self._strings_off + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _text(self, off, length):
+        start = self._text_off + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def __getitem__(self, book):
+        cached = self._book_cache.get(book)
+        if cached is None:
+            first, count = self._books[book]
+            cached = self._book_cache[book] = CompiledBook(self, first, count)
+        return cached
+
+    def __iter__(self):
+        return iter(self._books)
+
+    def __len__(self):
+        return len(self._books)
+
+    def close(self):
+        self._book_cache = {}
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+_OPEN = {}
+
+
+def open_compiled(path):
+    """Return a (cached) CompiledCorpus for ``path``."""
+    path = Path(path)
+    key = str(path.resolve())
+    corpus = _OPEN.get(key)
+    if corpus is None:
+        corpus = _OPEN[key] = CompiledCorpus(path)
+    return corpus
+
+
+def ensure_compiled(source, loader, entries=None):
+    """Return a memory-mapped corpus for ``source``, compiling it if needed.
+
+    ``loader(source)`` must return the nested dict for the JSON source; it is
+    only called when the compiled file is missing or stale. If the compiled
+    file can't be written (read-only install, full disk) the parsed dict is
+    returned instead. With ``entries(source)`` (an iterator of ``(book,
+    chapter, verse, text)``) the compile streams from it and never builds
+    the dict.
+    """
+    source = Path(source)
+    target = compiled_path_for(source)
+    stamp = source_stamp(source)
+    key = str(target.resolve())
+    corpus = _OPEN.get(key)
+    shared = corpus is not None
+    if corpus is None and target.exists():
+        try:
+            corpus = CompiledCorpus(target)
+        except (OSError, ValueError):
+            corpus = None
+    if corpus is not None and corpus.source_stamp == stamp:
+        _OPEN[key] = corpus
+        return corpus
+    if shared:
+        # stale, but the store, the app or a search index may still read it:
+        # forget it and let the last holder's reference close the map
+        _OPEN.pop(key, None)
+    elif corpus is not None:
+        corpus.close()
+
+    try:
+        if entries is not None:
+            compile_entries(entries(source), target, stamp)
+        else:
+            data = loader(source)
+            compile_corpus(data, target, stamp)
+        return open_compiled(target)
+    except (OSError, ValueError):
+        return loader(source)
+
+
+# ===============================
+# Per-book folders (data/<T>/<T>_books/*.json)
+# ===============================
+class BookFolderCorpus(Mapping):
+    """Mapping over a folder holding one JSON file per book.
+
+    Book names come from the file names, so listing books costs a directory
+    scan. A book's JSON is parsed into a ``Book`` on first access and at most ``max_resident``
+    parsed books are kept, least recently used first out.
+
+    ``order`` is a list of canonical book names; file stems are matched to it
+    case-insensitively (``Psalm.json`` -> ``Psalms``) and books are listed in
+    that order, unknown ones last.
+    """
+
+    def __init__(self, folder, order=(), max_resident=8):
+        self.folder = Path(folder)
+        self.max_resident = max(1, int(max_resident))
+        canonical = {}
+        for name in order:
+            canonical[name.lower()] = name
+        files = {}
+        for p in sorted(self.folder.glob("*.json")):
+            stem = p.stem
+            name = canonical.get(stem.lower()) or canonical.get(stem.lower() + "s") or stem
+            files.setdefault(name, p)
+        rank = {name: i for i, name in enumerate(order)}
+        self._files = dict(sorted(files.items(), key=lambda kv: rank.get(kv[0], len(rank))))
+        self._resident = OrderedDict()
+        self._chapter_counts = {}
+        self._lock = threading.Lock()
+
+    def _parse(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        # {"Info": {...}, "<Book>": {chapter: {verse: text}}}
+        for key, value in raw.items():
+            if key != "Info" and isinstance(value, dict):
+                return freeze_book(value)
+        return Book((), ())
+
+    def __getitem__(self, book):
+        with self._lock:
+            chapters = self._resident.get(book)
+            if chapters is not None:
+                self._resident.move_to_end(book)
+                return chapters
+        path = self._files[book]
+        chapters = self._parse(path)
+        with self._lock:
+            self._resident[book] = chapters
+            self._resident.move_to_end(book)
+            self._chapter_counts[book] = len(chapters)
+            while len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+        return chapters
+
+    def __contains__(self, book):
+        return book in self._files
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def source(self, book):
+        """Path of the JSON file ``book`` is read from."""
+        return self._files[book]
+
+    def is_resident(self, book):
+        return book in self._resident
+
+    def chapter_count(self, book):
+        """Chapter count if the book has been parsed before, else None."""
+        return self._chapter_counts.get(book)
+
+
+# ===============================
+# Compressed bundles (packaged builds)
+# ===============================
+BUNDLE_MAGIC = b"BBZ1"
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".bbz"
+CODECS = {"zlib": 0, "lzma": 1}
+
+# magic, version, codec, index offset, index length
+BUNDLE_HEADER = struct.Struct("<4sHHQQ")
+
+
+def _compress(codec, raw):
+    if codec == CODECS["lzma"]:
+        # preset 9's 64 MiB dictionary is wasted on a book-sized block and
+        # dominates the time spent; a dictionary the size of the block
+        # compresses identically
+        dict_size = max(1 << 16, 1 << (len(raw) - 1).bit_length())
+        return lzma.compress(raw, filters=[{"id": lzma.FILTER_LZMA2, "preset": 9 | lzma.PRESET_EXTREME,
+                                            "dict_size": dict_size}])
+    return zlib.compress(raw, 9)
+
+
+def _decompress(codec, raw):
+    if codec == CODECS["lzma"]:
+        return lzma.decompress(raw)
+    return zlib.decompress(raw)
+
+
+def write_bundle(data, out_path, codec="lzma", previous=None):
+    """Pack a ``{book: {chapter: {verse: text}}}`` mapping into one compressed file.
+
+    Each book is a separately compressed block of compact JSON; an index at
+    the end (book name, block offset and size, chapter labels and verse
+    counts, hash of the uncompressed block) lets a reader list books and
+    chapters and decompress only the books it opens. Books keep ``data``'s
+    order, chapters and verses are stored in reading order.
+
+    With ``previous`` (a ``BundleCorpus``, typically the file being
+    replaced) the compressed block of any book whose content hash is
+    unchanged is copied instead of compressed again.
+    Returns ``(raw bytes, bundle bytes, books reused)``.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    code = CODECS[codec]
+    books = []
+    raw_size = 0
+    reused = 0
+    with open(tmp, "wb") as f:
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, code, 0, 0))
+        for book in data:
+            chapters = freeze_book(data[book])
+            payload = [[c, list(chapters[c].labels), list(chapters[c].values())] for c in chapters]
+            raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            digest = hashlib.sha1(raw).hexdigest()
+            block = None
+            if previous is not None and previous.codec == code and previous.block_hash(book) == digest:
+                block = previous.block(book)
+            if block is None:
+                block = _compress(code, raw)
+            else:
+                reused += 1
+            books.append([book, f.tell(), len(block), [[c, len(chapters[c])] for c in chapters], digest])
+            f.write(block)
+            raw_size += len(raw)
+        index = zlib.compress(json.dumps({"books": books}, ensure_ascii=False,
+                                         separators=(",", ":")).encode("utf-8"), 9)
+        index_off = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, code, index_off, len(index)))
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, out_path)
+    return raw_size, out_path.stat().st_size, reused
+
+
+class BundleCorpus(Mapping):
+    """Read-only view of a ``.bbz`` bundle.
+
+    Only the header and index are read when it is opened; a book's block is
+    decompressed on first access and at most ``max_resident`` books are kept,
+    like ``BookFolderCorpus``. Chapter labels and verse counts come from the
+    index, so the library and chapter grid never decompress anything.
+    """
+
+    def __init__(self, path, max_resident=8):
+        self.path = Path(path)
+        self.max_resident = max(1, int(max_resident))
+        self._file = open(self.path, "rb")
+        try:
+            magic, version, self.codec, index_off, index_len = BUNDLE_HEADER.unpack(
+                self._file.read(BUNDLE_HEADER.size))
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"{self.path} is not a data bundle (version {BUNDLE_VERSION})")
+            self._file.seek(index_off)
+            index = json.loads(zlib.decompress(self._file.read(index_len)).decode("utf-8"))
+        except (OSError, struct.error, zlib.error, ValueError):
+            self._file.close()
+            raise ValueError(f"{self.path} is not a data bundle")
+        self._books = OrderedDict((e[0], tuple(e[1:4])) for e in index["books"])
+        self._hashes = {e[0]: e[4] for e in index["books"] if len(e) > 4}
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+
+    def block(self, book):
+        """The compressed block of ``book`` as stored."""
+        off, size, _ = self._books[book]
+        with self._lock:
+            self._file.seek(off)
+            return self._file.read(size)
+
+    def block_hash(self, book):
+        """Hash of ``book``'s uncompressed block, or None if unknown."""
+        return self._hashes.get(book)
+
+    def _read(self, book):
+        block = self.block(book)
+        payload = json.loads(_decompress(self.codec, block).decode("utf-8"))
+        return Book([c for c, _, _ in payload], [Chapter(labels, texts) for _, labels, texts in payload])
+
+    def __getitem__(self, book):
+        with self._lock:
+            chapters = self._resident.get(book)
+            if chapters is not None:
+                self._resident.move_to_end(book)
+                return chapters
+        chapters = self._read(book)
+        with self._lock:
+            self._resident[book] = chapters
+            self._resident.move_to_end(book)
+            while len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+        return chapters
+
+    def __contains__(self, book):
+        return book in self._books
+
+    def __iter__(self):
+        return iter(self._books)
+
+    def __len__(self):
+        return len(self._books)
+
+    def is_resident(self, book):
+        return book in self._resident
+
+    def chapter_count(self, book):
+        entry = self._books.get(book)
+        return len(entry[2]) if entry is not None else None
+
+    def chapter_index(self, book):
+        """``[(chapter, verse count), ...]`` for ``book`` from the index."""
+        entry = self._books.get(book)
+        return [tuple(c) for c in entry[2]] if entry is not None else []
+
+    def close(self):
+        self._resident = OrderedDict()
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def open_bundle(path):
+    """Return a (cached) BundleCorpus for ``path``."""
+    path = Path(path)
+    key = str(path.resolve())
+    corpus = _OPEN.get(key)
+    if corpus is None:
+        corpus = _OPEN[key] = BundleCorpus(path)
+    return corpus
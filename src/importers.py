@@ -0,0 +1,524 @@
+"""
+Importers for new books from translators: docx, plain text, USFM and OSIS.
+
+Each front end streams its source and drives the same ``VerseState``, the
+chapter/verse state machine that tracks the current book, chapter and verse,
+joins continuation lines onto their verse and checks what it reads against the
+canonical versification. Anomalies (a verse before any chapter, numbers going
+backwards, text with no verse to belong to, missing or extra verses) are kept
+as structured records rather than written to a free-form log.
+
+The result per book is the ``{chapter: {verse: text}}`` dict of the per-book
+JSON files: ``write_books`` writes those and ``iter_entries`` feeds
+``corpus.compile_entries``. ``import_file`` is top-level so
+``scripts/import_books.py`` can run it over many sources in a process pool.
+"""
+from pathlib import Path
+import re
+import time
+import xml.etree.ElementTree as ET
+import xml.sax
+import zipfile
+
+from persist import write_json_atomic
+from references import BookAliases
+from store import BOOK_IDS, verse_span
+import versification
+
+OSIS_IDS = [
+    "Gen", "Exod", "Lev", "Num", "Deut", "Josh", "Judg", "Ruth", "1Sam", "2Sam", "1Kgs", "2Kgs",
+    "1Chr", "2Chr", "Ezra", "Neh", "Esth", "Job", "Ps", "Prov", "Eccl", "Song", "Isa", "Jer",
+    "Lam", "Ezek", "Dan", "Hos", "Joel", "Amos", "Obad", "Jonah", "Mic", "Nah", "Hab", "Zeph",
+    "Hag", "Zech", "Mal",
+    "Matt", "Mark", "Luke", "John", "Acts", "Rom", "1Cor", "2Cor", "Gal", "Eph", "Phil", "Col",
+    "1Thess", "2Thess", "1Tim", "2Tim", "Titus", "Phlm", "Heb", "Jas", "1Pet", "2Pet", "1John", "2John",
+    "3John", "Jude", "Rev",
+]
+
+# "1 Text", "2Text", "10Text"
+_VERSE_LINE = re.compile(r"^(\d+)\s*(.*)")
+
+
+def _snippet(text, limit=60):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _ranges(labels):
+    """``["1", "2", "3", "7"]`` -> ``"1-3,7"``."""
+    nums = sorted(int(v) for v in labels)
+    parts = []
+    for n in nums:
+        if parts and parts[-1][1] == n - 1:
+            parts[-1][1] = n
+        else:
+            parts.append([n, n])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+
+# ===============================
+# State machine
+# ===============================
+class VerseState:
+    """Chapter/verse state shared by every front end.
+
+    ``names`` are the book names to emit by canonical position (for sources
+    that give books by code) and ``resolve(name)`` a name's position, used
+    for the versification checks. For line-based sources ``max_chapters``
+    bounds what a bare number line may be read as (default: the canonical
+    chapter count; larger numbers are taken as verse numbers), and
+    ``chapter_starts`` maps line prefixes to a chapter that starts there
+    although the source has no heading for it.
+    """
+
+    def __init__(self, source, names=None, resolve=None, book=None, max_chapters=None, chapter_starts=None):
+        self.source = str(source)
+        self.names = names
+        self.resolve = resolve or (lambda name: None)
+        self.max_chapters = max_chapters
+        self.chapter_starts = {str(k): str(v) for k, v in (chapter_starts or {}).items()}
+        self.books = {}
+        self.anomalies = []
+        self.lineno = None
+        self.book_name = None
+        self.chapter_label = None
+        self.verse_label = None
+        self._positions = {}
+        self._chapters = None
+        self._chapter_re = None
+        if book:
+            self.book(book)
+
+    def note(self, kind, detail=None, **where):
+        record = {
+            "source": self.source,
+            "line": self.lineno,
+            "kind": kind,
+            "book": self.book_name,
+            "chapter": self.chapter_label,
+            "verse": self.verse_label,
+        }
+        record.update(where)
+        if detail is not None:
+            record["detail"] = detail
+        self.anomalies.append(record)
+
+    # --- events ---
+    def book(self, name, pos=None):
+        """Start (or return to) a book; a name that resolves is emitted under ``names``."""
+        if pos is None:
+            pos = self.resolve(name)
+        if pos is not None and self.names and pos < len(self.names):
+            name = self.names[pos]
+        self.book_name = name
+        self.chapter_label = None
+        self.verse_label = None
+        self._chapters = self.books.setdefault(name, {})
+        self._positions[name] = pos
+        self._chapter_re = re.compile(rf"^(?:{re.escape(name)}\s+)?(\d+)\s*$", re.IGNORECASE)
+        if pos is None:
+            self.note("unknown_book")
+
+    def book_code(self, code, codes):
+        """Start a book given by a code from ``codes`` (BOOK_IDS, OSIS_IDS)."""
+        pos = codes.index(code) if code in codes else None
+        if pos is None or not self.names or pos >= len(self.names):
+            self.book(code, pos)
+        else:
+            self.book(self.names[pos], pos)
+
+    def chapter(self, label):
+        label = str(label).strip()
+        if self._chapters is None:
+            self.note("chapter_before_book", chapter=label)
+            return
+        prev = self.chapter_label
+        if label in self._chapters:
+            self.note("chapter_repeated", chapter=label, verse=None)
+        elif prev and prev.isdigit() and label.isdigit() and int(label) < int(prev):
+            self.note("chapter_backwards", f"{prev} -> {label}", chapter=label, verse=None)
+        canon = self._canon_chapters()
+        if canon and label.isdigit() and int(label) > canon:
+            self.note("extra_chapter", f"canon has {canon}", chapter=label, verse=None)
+        self.chapter_label = label
+        self.verse_label = None
+        self._chapters.setdefault(label, {})
+
+    def verse(self, label, text=""):
+        label = str(label).strip()
+        text = text.strip()
+        if self.chapter_label is None:
+            self.note("verse_before_chapter", _snippet(text), verse=label)
+            return
+        verses = self._chapters[self.chapter_label]
+        prev = verse_span(self.verse_label) if self.verse_label else None
+        span = verse_span(label)
+        if prev and span and span[0] < prev[0]:
+            # usually a chapter heading the source lacks
+            self.note("verse_backwards", f"{self.verse_label} -> {label}", verse=label)
+        if label in verses:
+            self.note("duplicate_verse", _snippet(text), verse=label)
+        pos = self._positions.get(self.book_name)
+        expected = versification.verses(pos, self.chapter_label) if pos is not None else None
+        if expected and span and span[1] > expected:
+            self.note("extra_verse", f"canon has {expected}", verse=label)
+        verses[label] = text
+        self.verse_label = label
+
+    def text(self, text):
+        """Continuation of the current verse."""
+        text = text.strip()
+        if not text:
+            return
+        if self.verse_label is None:
+            self.note("text_outside_verse", _snippet(text))
+            return
+        verses = self._chapters[self.chapter_label]
+        current = verses[self.verse_label]
+        if current and not current.endswith(" "):
+            current += " "
+        verses[self.verse_label] = current + text
+
+    def line(self, line, lineno=None):
+        """Classify one line of a line-based source: chapter heading, verse or continuation."""
+        if lineno is not None:
+            self.lineno = lineno
+        line = line.strip()
+        if not line:
+            return
+        for prefix, chap in self.chapter_starts.items():
+            if line.startswith(prefix):
+                self.note("forced_chapter", _snippet(prefix), chapter=chap, verse=None)
+                self.chapter(chap)
+                break
+        m = self._chapter_re.match(line) if self._chapter_re else None
+        if m:
+            limit = self.max_chapters or self._canon_chapters()
+            if limit is None or int(m.group(1)) <= limit:
+                self.chapter(m.group(1))
+                return
+            self.note("number_not_chapter", f"above {limit}, read as a verse", verse=m.group(1))
+        m = _VERSE_LINE.match(line)
+        if m:
+            self.verse(m.group(1), m.group(2))
+            return
+        self.text(line)
+
+    def _canon_chapters(self):
+        pos = self._positions.get(self.book_name)
+        return versification.chapters(pos) if pos is not None else None
+
+    # --- end of source ---
+    def finish(self):
+        """Check every book against the versification and return ``books``."""
+        self.lineno = None
+        for name, chapters in self.books.items():
+            pos = self._positions.get(name)
+            where = {"book": name, "chapter": None, "verse": None}
+            if pos is not None:
+                canon = versification.chapters(pos)
+                missing = [str(c) for c in range(1, canon + 1) if str(c) not in chapters]
+                if missing:
+                    self.note("missing_chapters", _ranges(missing), **where)
+            for chap, verses in chapters.items():
+                where["chapter"] = chap
+                empty = [v for v, text in verses.items() if not text]
+                if empty:
+                    self.note("empty_verses", ",".join(empty), **where)
+                expected = versification.verses(pos, chap) if pos is not None else None
+                if expected:
+                    # a range label ("3-4") covers each verse in it
+                    present = set()
+                    for v in verses:
+                        span = verse_span(v)
+                        if span:
+                            present.update(range(span[0], span[1] + 1))
+                    missing = [str(v) for v in range(1, expected + 1) if v not in present]
+                    if missing:
+                        self.note("missing_verses", _ranges(missing), **where)
+        return self.books
+
+
+# ===============================
+# Front ends
+# ===============================
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def docx_paragraphs(path):
+    """Yield the text of each paragraph of a .docx (line breaks split it).
+
+    ``word/document.xml`` is parsed incrementally and each paragraph is
+    cleared once read, so large documents never sit in memory as a tree.
+    """
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        parts = []
+        for _, elem in ET.iterparse(f, events=("end",)):
+            tag = elem.tag
+            if tag == _W + "t":
+                parts.append(elem.text or "")
+            elif tag == _W + "tab":
+                parts.append(" ")
+            elif tag in (_W + "br", _W + "cr"):
+                parts.append("\n")
+            elif tag == _W + "p":
+                for line in "".join(parts).split("\n"):
+                    yield line
+                parts = []
+                elem.clear()
+
+
+def read_docx(state, path):
+    for n, line in enumerate(docx_paragraphs(path), 1):
+        state.line(line, n)
+
+
+def read_text(state, path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for n, line in enumerate(f, 1):
+            state.line(line, n)
+
+
+# --- USFM ---
+_USFM_LINE = re.compile(r"\\([a-z]+\d*)\*?\s*(.*)")
+_USFM_VERSE = re.compile(r"\\v\s+(\S+)\s?")
+_USFM_NOTE = re.compile(r"\\(f|fe|x|ef|ex)\s.*?\\\1\*")
+_USFM_ATTRS = re.compile(r"\|[^\\]*")
+_USFM_MARKER = re.compile(r"\\\+?[a-z]+\d*\*?")
+# headings, titles and metadata: not verse text
+USFM_SKIP = {
+    "h", "toc", "toca", "mt", "mte", "ms", "mr", "s", "sr", "r", "d", "sp", "rem", "ide", "sts",
+    "usfm", "cl", "cp", "cd", "imt", "is", "ip", "ipr", "io", "iot", "ili", "ie", "restore",
+}
+
+
+def _usfm_clean(text):
+    text = _USFM_NOTE.sub("", text)
+    text = _USFM_ATTRS.sub("", text)
+    return " ".join(_USFM_MARKER.sub(" ", text).split())
+
+
+def read_usfm(state, path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for n, raw in enumerate(f, 1):
+            state.lineno = n
+            line = raw.strip()
+            if not line:
+                continue
+            m = _USFM_LINE.match(line)
+            marker = m.group(1) if m else ""
+            if marker == "id":
+                state.book_code(m.group(2)[:3].upper(), BOOK_IDS)
+            elif marker == "c":
+                if m.group(2).split():
+                    state.chapter(m.group(2).split()[0])
+            elif marker.rstrip("0123456789") in USFM_SKIP:
+                continue
+            else:
+                body = m.group(2) if m and marker != "v" else line
+                pieces = _USFM_VERSE.split(body)
+                state.text(_usfm_clean(pieces[0]))
+                for i in range(1, len(pieces), 2):
+                    state.verse(pieces[i], _usfm_clean(pieces[i + 1]))
+
+
+# --- OSIS ---
+# elements whose text isn't verse text
+OSIS_SKIP = {"note", "title", "header", "rdg", "speaker"}
+# elements that separate words
+OSIS_BREAKS = {"lb", "l", "lg", "p", "q", "item"}
+
+
+class _OsisHandler(xml.sax.ContentHandler):
+    """SAX handler for OSIS; verse text is collected until the verse ends.
+
+    Handles both container verses (``<verse osisID>text</verse>``) and
+    milestones (``<verse sID/>text<verse eID/>``); chapters likewise.
+    """
+
+    def __init__(self, state):
+        super().__init__()
+        self.state = state
+        self.locator = None
+        self.skip = 0
+        self.book_code = None
+        self.current = None
+        self.container = False
+        self.buffer = []
+        # per open <div>: True if closing it ends the verse (book and container
+        # divs), False for milestones (<div sID/>, <div eID/>) that may sit in one
+        self.divs = []
+
+    def setDocumentLocator(self, locator):
+        self.locator = locator
+
+    def flush(self):
+        if self.current is not None:
+            self.state.verse(self.current, " ".join("".join(self.buffer).split()))
+        self.current = None
+        self.buffer = []
+
+    def _enter_book(self, code):
+        if code and code != self.book_code:
+            self.flush()
+            self.book_code = code
+            self.state.book_code(code, OSIS_IDS)
+
+    def startElement(self, name, attrs):
+        if self.skip:
+            self.skip += 1
+            return
+        local = name.rsplit(":", 1)[-1]
+        if local in OSIS_SKIP:
+            self.skip = 1
+            return
+        if self.locator is not None:
+            self.state.lineno = self.locator.getLineNumber()
+        if local == "div":
+            milestone = attrs.get("sID") or attrs.get("eID")
+            self.divs.append(not milestone)
+            if attrs.get("type") == "book" and not milestone:
+                self._enter_book(attrs.get("osisID"))
+        elif local == "chapter":
+            self.flush()
+            ref = attrs.get("osisID") or attrs.get("sID")
+            if attrs.get("eID") or not ref:
+                return
+            code, _, chap = ref.partition(".")
+            self._enter_book(code)
+            self.state.chapter(chap.split(".")[0])
+        elif local == "verse":
+            self.flush()
+            ref = attrs.get("osisID") or attrs.get("sID")
+            if attrs.get("eID") or not ref:
+                return
+            refs = ref.split()
+            first = refs[0].split(".")
+            if len(first) < 3:
+                return
+            self._enter_book(first[0])
+            if first[1] != self.state.chapter_label:
+                self.state.chapter(first[1])
+            last = refs[-1].split(".")[-1]
+            self.current = first[2] if last == first[2] else f"{first[2]}-{last}"
+            self.container = not attrs.get("sID")
+        elif local in OSIS_BREAKS:
+            self.buffer.append(" ")
+
+    def endElement(self, name):
+        if self.skip:
+            self.skip -= 1
+            return
+        local = name.rsplit(":", 1)[-1]
+        if local == "verse" and self.container:
+            self.flush()
+            self.container = False
+        elif local in OSIS_BREAKS:
+            self.buffer.append(" ")
+        elif local == "div":
+            if self.divs.pop() if self.divs else False:
+                self.flush()
+        elif local == "chapter":
+            self.flush()
+
+    def characters(self, content):
+        if self.current is not None and not self.skip:
+            self.buffer.append(content)
+
+
+def read_osis(state, path, chunk_size=1 << 16):
+    handler = _OsisHandler(state)
+    parser = xml.sax.make_parser()
+    parser.setContentHandler(handler)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            parser.feed(chunk)
+    parser.close()
+    handler.flush()
+
+
+# ===============================
+# Registry
+# ===============================
+# format -> reader(state, path)
+FRONT_ENDS = {"docx": read_docx, "text": read_text, "usfm": read_usfm, "osis": read_osis}
+# formats with no book markers: the book comes from the caller or the file name
+LINE_FORMATS = {"docx", "text"}
+SUFFIXES = {".docx": "docx", ".txt": "text", ".usfm": "usfm", ".sfm": "usfm", ".osis": "osis", ".xml": "osis"}
+
+
+def register(fmt, reader, suffixes=(), line_based=False):
+    """Add a front end: ``reader(state, path)`` drives a ``VerseState``."""
+    FRONT_ENDS[fmt] = reader
+    for suffix in suffixes:
+        SUFFIXES[suffix.lower()] = fmt
+    if line_based:
+        LINE_FORMATS.add(fmt)
+
+
+def detect_format(path):
+    fmt = SUFFIXES.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"unknown source format: {Path(path).name}")
+    return fmt
+
+
+def guess_book(stem, resolve):
+    """The longest leading run of words in a file name that names a book ("Daniel Asante Twi" -> "Daniel")."""
+    words = stem.replace("_", " ").split()
+    for n in range(len(words), 0, -1):
+        name = " ".join(words[:n])
+        if resolve(name) is not None:
+            return name
+    return stem
+
+
+# ===============================
+# Import
+# ===============================
+def import_file(path, fmt=None, book=None, names=None, aliases=None, max_chapters=None, chapter_starts=None):
+    """Import one source file.
+
+    ``aliases`` are the book name orders given to ``BookAliases`` (English
+    first); ``names`` (default: the first order) are the names books are
+    emitted under. Returns ``{"source", "format", "books", "anomalies",
+    "seconds"}``.
+    """
+    started = time.perf_counter()
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt not in FRONT_ENDS:
+        raise ValueError(f"unknown source format: {fmt}")
+    resolve = BookAliases(aliases).lookup if aliases else None
+    if names is None and aliases:
+        names = list(aliases[0])
+    if book is None and fmt in LINE_FORMATS:
+        book = guess_book(path.stem, resolve) if resolve else path.stem
+    state = VerseState(path.name, names, resolve, book, max_chapters, chapter_starts)
+    FRONT_ENDS[fmt](state, path)
+    books = state.finish()
+    return {
+        "source": str(path),
+        "format": fmt,
+        "books": books,
+        "anomalies": state.anomalies,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def write_books(books, out_dir, indent=2):
+    """Write each book as ``<out_dir>/<book>.json`` (``{book: {chapter: {verse: text}}}``); returns the paths."""
+    paths = []
+    for name, chapters in books.items():
+        path = Path(out_dir) / f"{name}.json"
+        write_json_atomic(path, {name: chapters}, indent=indent)
+        paths.append(path)
+    return paths
+
+
+def iter_entries(books):
+    """``(book, chapter, verse, text)`` for ``corpus.compile_entries``."""
+    for name, chapters in books.items():
+        for chap, verses in chapters.items():
+            for verse, text in verses.items():
+                yield name, chap, verse, text
@@ -0,0 +1,83 @@
+"""
+Streaming reader for the list-of-objects corpus format.
+
+Bulk exports come as one JSON array of ``{"book", "chapter", "verse", "text"}``
+objects. ``iter_list_entries`` walks that array a chunk at a time with
+``JSONDecoder.raw_decode``, so memory holds one read chunk plus the object
+being decoded no matter how large the file is. The entries can be fed straight
+to ``corpus.compile_entries`` without ever building the nested dict.
+"""
+import codecs
+import json
+import os
+
+CHUNK_SIZE = 1 << 20
+
+
+def is_list_format(path):
+    """True if the JSON file at ``path`` is a top-level array."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(64).decode("utf-8-sig", errors="ignore").lstrip()
+    except OSError:
+        return False
+    return head.startswith("[")
+
+
+def iter_list_entries(path, chunk_size=CHUNK_SIZE, progress=None):
+    """Yield ``(book, chapter, verse, text)`` for each object of a list-format file.
+
+    ``progress(bytes_read, total_bytes)`` is called after every chunk.
+    Entries that aren't objects or lack a book are skipped.
+    """
+    decoder = json.JSONDecoder()
+    total = os.path.getsize(path)
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as f:
+        buf = ""
+        pos = 0
+        done = 0
+        eof = False
+
+        def fill():
+            nonlocal buf, pos, done, eof
+            raw = f.read(chunk_size)
+            done += len(raw)
+            eof = not raw
+            buf = buf[pos:] + utf8.decode(raw, final=eof)
+            pos = 0
+            if progress is not None:
+                progress(done, total)
+
+        def skip(chars):
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        skip(" \t\r\n")
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buf):
+                raise ValueError(f"{path}: unexpected end of file")
+            if buf[pos] == "]":
+                return
+            while True:
+                try:
+                    entry, end = decoder.raw_decode(buf, pos)
+                    break
+                except ValueError:
+                    # the object runs past the buffer: read more and retry
+                    if eof:
+                        raise
+                    fill()
+            pos = end
+            if not isinstance(entry, dict) or entry.get("book") is None:
+                continue
+            yield entry["book"], str(entry.get("chapter")), str(entry.get("verse")), entry.get("text", "")
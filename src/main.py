@@ -1,131 +1,66 @@
 import flet as ft
-import json
-from pathlib import Path
-import sys
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from corpus import Chapter
+from manifest import MANIFEST_NAME, CorpusManifest
+from references import resolve as resolve_reference
+from store import BOOK_IDS, CorpusStore, split_verse_id, verse_span
+from persist import JsonWriter, read_json
+from bookmarks import BookmarkStore
+from providers import JsonProvider
+from sources import (BOOK_ALIASES, DATA_FOLDER, NT_ORDER, OT_ORDER, TWI_NT_ORDER, TWI_OT_ORDER, build_search_index,
+                     list_translations, load_data, needs_index_build, source_from_string)
+import tracing
+from prefetch import Prefetcher, neighbours
 
-# ===============================
-# File paths - works both on desktop and in APK
-# ===============================
-def resolve_data_folder():
-    candidates = [
-        Path(sys.executable).parent / "data",
-        Path(__file__).resolve().parent.parent / "data",
-        Path(__file__).resolve().parent / "data",
-        Path.cwd() / "data",
-    ]
-    for c in candidates:
-        try:
-            if c.exists():
-                return c
-        except Exception:
-            pass
-    default = candidates[1]
-    try:
-        default.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    return default
-
-DATA_FOLDER = resolve_data_folder()
-DEFAULT_DATA_FILE = DATA_FOLDER / "sample_bible.json"
 BOOKMARKS_FILE = DATA_FOLDER / "bible_bookmarks.json"
 SETTINGS_FILE = DATA_FOLDER / "bible_settings.json"
+WRITER = JsonWriter(delay=0.5)
+RESUME_FILE = DATA_FOLDER / "bible_resume.json"
 
 # ===============================
 # Helpers
 # ===============================
-def load_data(path: Path = None):
-    path = path or DEFAULT_DATA_FILE
-    if not path.exists():
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    # support list-of-objects format
-    if isinstance(data, list):
-        new_data = {}
-        for entry in data:
-            book = entry.get("book")
-            chapter = str(entry.get("chapter"))
-            verse = str(entry.get("verse"))
-            text = entry.get("text", "")
-            new_data.setdefault(book, {}).setdefault(chapter, {})[verse] = text
-        return new_data
-    return data
-
-def list_translations():
-    translations = {}
-    try:
-        if not DATA_FOLDER.exists():
-            DATA_FOLDER.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    try:
-        for p in DATA_FOLDER.glob("*.json"):
-            if p.stem not in ("bible_bookmarks", "bible_settings", "sample_bible"):
-                name = p.stem
-                if name.endswith("_bible"):
-                    name = name[:-6]
-                translations[name] = p
-            elif p.stem == "sample_bible":
-                translations[p.stem] = p
-    except Exception:
-        pass
-    # compatibility: nested *_bible.json
-    try:
-        for sub in DATA_FOLDER.iterdir():
-            if sub.is_dir():
-                for p in sub.glob("*_bible.json"):
-                    name = p.stem
-                    if name.endswith("_bible"):
-                        name = name[:-6]
-                    translations[name] = p
-    except Exception:
-        pass
-    return translations
-
 def load_json(path):
-    if not Path(path).exists():
-        return {}
+    # a write still waiting in the queue is the current value
+    queued = WRITER.pending(path)
+    if queued is not None:
+        return queued
+    return read_json(path)
+
+def load_resume():
+    """The resume snapshot if it is usable, else None."""
+    snap = load_json(RESUME_FILE)
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if snap.get("version") != RESUME_VERSION or not snap["names"] or not snap["keys"]:
+            return None
+        if any(n not in snap["sources"] or not source_from_string(snap["sources"][n]).exists() for n in snap["names"]):
+            return None
+        snap["book"], snap["chapter"] = str(snap["book"]), str(snap["chapter"])
+        snap["shown"], snap["offset"] = int(snap.get("shown") or 0), float(snap.get("offset") or 0)
+        snap.setdefault("verse", None)
+        snap.setdefault("columns", None)
+        return snap
     except Exception:
-        return {}
+        return None
+
+def save_resume(snap):
+    WRITER.write(RESUME_FILE, snap, indent=None)
 
 def save_json(path, data):
-    Path(path).parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # queued: bursts coalesce and the file is replaced atomically off the UI thread
+    WRITER.write(path, data)
 
-# ===============================
-# Canonical orders (exact names)
-# ===============================
-OT_ORDER = [
-    'Genesis','Exodus','Leviticus','Numbers','Deuteronomy','Joshua','Judges','Ruth',
-    '1 Samuel','2 Samuel','1 Kings','2 Kings','1 Chronicles','2 Chronicles','Ezra','Nehemiah','Esther',
-    'Job','Psalms','Proverbs','Ecclesiastes','Song of Solomon','Isaiah','Jeremiah','Lamentations',
-    'Ezekiel','Daniel','Hosea','Joel','Amos','Obadiah','Jonah','Micah','Nahum','Habakkuk','Zephaniah','Haggai','Zechariah','Malachi'
-]
-
-NT_ORDER = [
-    'Matthew','Mark','Luke','John','Acts','Romans','1 Corinthians','2 Corinthians','Galatians','Ephesians',
-    'Philippians','Colossians','1 Thessalonians','2 Thessalonians','1 Timothy','2 Timothy','Titus','Philemon','Hebrews',
-    'James','1 Peter','2 Peter','1 John','2 John','3 John','Jude','Revelation'
-]
-
-TWI_OT_ORDER = [
-    'Genesis','Exodus','Lewifo','Numeri','Deuteronomium','Yosua','Atemmufo','Rut',
-    '1 Samuel','2 Samuel','1 Ahene','2 Ahene','1 Beresosɛm','2 Beresosɛm','Esra','Nehemia','Ester',
-    'Hiob','Nnwom','Mmbeusɛm','Ɔsɛnkafo','Nnwom Mu Dwom','Yesaia','Yeremia','Kwadwom',
-    'Hesekiel','Daniel','Hosea','Yoel','Amos','Obadia','Yona','Mika','Nahum','Habakuk','Sefania','Hagai','Sakaria','Malaki'
-]
-
-TWI_NT_ORDER = [
-    'Mateo','Marko','Luka','Yohane','Asomafo','Romafo','1 Korintofo','2 Korintofo','Galatifo','Efesofo',
-    'Filipifo','Kolosefo','1 Tesalonikafo','2 Tesalonikafo','1 Timoteo','2 Timoteo','Tito','Filemon','Hebrifo',
-    'Yakobo','1 Petro','2 Petro','1 Yohane','2 Yohane','3 Yohane','Yuda','Adiyisɛm'
-]
+SEARCH_PAGE_SIZE = 30
+READ_PAGE_SIZE = 40
+RESIZE_DEBOUNCE = 0.15
+PARALLEL_MAX = 4
+PREFETCH_BUDGET = 4
+RESUME_DEBOUNCE = 1.0
+RESUME_VERSION = 1
 
 # ===============================
 # Themes
@@ -164,27 +99,37 @@ THEMES = {
 # ===============================
 # Utility: create highlighted snippet as a row of Text spans
 # ===============================
-def make_highlighted_snippet(text: str, query: str, accent_color: str, muted_color: str):
-    """Return a ft.Row with parts; matched pieces are emphasized (bold + accent color)."""
+def make_highlighted_snippet(text: str, query: str, accent_color: str, muted_color: str, spans=None):
+    """Return a ft.Row with parts; matched pieces are emphasized (bold + accent color).
+
+    ``spans`` are ``(start, end)`` match positions in ``text`` (as produced by the
+    search index on the folded text); without them ``query`` is located by a
+    plain case-insensitive find.
+    """
     if not query:
         return ft.Text(text, size=12, color=muted_color)
-    low = text.lower()
-    q = query.lower()
+    if spans is None:
+        low = text.lower()
+        q = query.lower()
+        spans = []
+        pos = low.find(q)
+        while q and pos != -1:
+            spans.append((pos, pos + len(q)))
+            pos = low.find(q, pos + len(q))
     parts = []
     idx = 0
-    while True:
-        pos = low.find(q, idx)
-        if pos == -1:
-            remainder = text[idx:]
-            if remainder:
-                parts.append(("text", remainder))
-            break
+    for start, end in sorted(spans):
+        if start < idx:
+            continue
         # before
-        if pos > idx:
-            parts.append(("text", text[idx:pos]))
+        if start > idx:
+            parts.append(("text", text[idx:start]))
         # match
-        parts.append(("match", text[pos:pos+len(q)]))
-        idx = pos + len(q)
+        parts.append(("match", text[start:end]))
+        idx = end
+    remainder = text[idx:]
+    if remainder:
+        parts.append(("text", remainder))
     spans = []
     for kind, piece in parts:
         if kind == "text":
@@ -193,25 +138,49 @@ def make_highlighted_snippet(text: str, query: str, accent_color: str, muted_col
             spans.append(ft.Text(piece, size=12, weight=ft.FontWeight.BOLD, color=accent_color))
     return ft.Row(spans, wrap=True)
 
+def make_snippet(text: str, spans, before=30, after=60, plain=140):
+    """Cut a snippet of ``text`` around the first span; returns (snippet, spans shifted into it)."""
+    if not spans:
+        return text[:plain] + ("..." if len(text) > plain else ""), []
+    start = max(0, spans[0][0] - before)
+    end = min(len(text), spans[0][1] + after)
+    prefix = "..." if start > 0 else ""
+    snippet = prefix + text[start:end] + ("..." if end < len(text) else "")
+    shift = len(prefix) - start
+    shifted = [(a + shift, b + shift) for a, b in spans if a >= start and b <= end]
+    return snippet, shifted
+
 # ===============================
 # Main App
 # ===============================
 class BibleApp:
+    @tracing.traced("startup")
     def __init__(self, page: ft.Page):
         self.page = page
-        self.translations = list_translations()
         self.settings = load_json(SETTINGS_FILE)
+        tracing.configure(self.settings.get("trace"), DATA_FOLDER)
+        if tracing.enabled():
+            self._trace_updates(page)
 
-        # bookmarks
-        bm_data = load_json(BOOKMARKS_FILE)
-        if isinstance(bm_data, list):
-            self.bookmarks = bm_data
-        else:
-            self.bookmarks = bm_data.get("bookmarks", [])
+        # "backend": "sqlite" reads translations from the database built by scripts/build_sqlite.py
+        self._sqlite = self.settings.get("backend") == "sqlite"
+
+        # last-read chapter, painted before anything else is loaded
+        resume = load_resume()
+
+        # bookmarks, indexed by verse id
+        self.bookmarks = BookmarkStore(BOOKMARKS_FILE, BOOK_ALIASES.lookup, OT_ORDER + NT_ORDER)
+
+        # chapter and verse counts per translation (scripts/validate_corpus.py)
+        self.corpus_manifest = CorpusManifest.load(DATA_FOLDER / MANIFEST_NAME)
 
         # defaults
         self.font_size = self.settings.get("font_size", 16)
+        self.parallel_mode = bool(self.settings.get("parallel_mode", False))
+        self.parallel_translations = [n for n in self.settings.get("parallel", []) if isinstance(n, str)]
         self.current_tab = "read"
+        # with a snapshot only its translations are known until the folder scan runs
+        self.translations = {n: source_from_string(p) for n, p in resume["sources"].items()} if resume else list_translations(self._sqlite)
         self.selected_translation = (
             self.settings.get("translation")
             if self.settings.get("translation") in self.translations
@@ -221,15 +190,23 @@ class BibleApp:
         if self.selected_theme not in THEMES:
             self.selected_theme = "Dark"
 
-        # load data
-        self.data = load_data(self.translations[self.selected_translation]) if self.selected_translation else {}
+        # load data (every translation is opened through the shared store)
+        self.store = CorpusStore(self.translations, load_data, BOOK_ALIASES)
+        if resume:
+            self.selected_translation = resume["names"][0]
+            self.data = JsonProvider({})
+            self.current_book = resume["book"]
+            self.current_chapter = resume["chapter"]
+        else:
+            self.data = self.store.column(self.selected_translation) if self.selected_translation else JsonProvider({})
 
-        # set current position defensively
-        self.current_book = list(self.data.keys())[0] if self.data else None
-        self.current_chapter = None
-        if self.current_book:
-            chs = list(self.data[self.current_book].keys())
-            self.current_chapter = "1" if "1" in chs else (chs[0] if chs else None)
+            # set current position defensively
+            books = self.data.books()
+            self.current_book = books[0] if books else None
+            self.current_chapter = None
+            if self.current_book:
+                chs = self.data.chapters(self.current_book)
+                self.current_chapter = "1" if "1" in chs else (chs[0] if chs else None)
 
         # page setup
         page.title = "Bible"
@@ -242,6 +219,28 @@ class BibleApp:
         self.search_input = None
         self.search_results = None
         self.verse_input = None
+        self._search_indexes = {}
+        self._index_lock = threading.Lock()
+        self._index_locks = {}
+        self._search_lock = threading.Lock()
+        self._search_gen = 0
+        self._search_state = None
+        self._search_more = None
+        self._verse_pool = []
+        self._prefetch = Prefetcher(self._load_chapter, budget=PREFETCH_BUDGET)
+        self._read_state = None
+        self._read_view = None
+        self.verse_list = None
+        self._tile_cache = {}
+        self._tile_cache_scope = None
+        self._grid = None
+        self._grid_cols = None
+        self._chapter_verses = {}
+        self._resize_timer = None
+        self._resume_timer = None
+        self._read_offset = 0
+        self._ready = threading.Event()
+        self._search_pool = ThreadPoolExecutor(max_workers=4)
 
         # build UI
         try:
@@ -249,9 +248,65 @@ class BibleApp:
         except Exception:
             pass
 
-        self.build_ui()
-        self.current_view = "library"
-        self.show_current_view()
+        if resume:
+            # paint the snapshot chapter, then load everything else behind it
+            self.current_view = "verses"
+            self._prefetch.put((tuple(resume["names"]), self.current_book, self.current_chapter),
+                               (resume["verses"], resume["keys"], resume["columns"]))
+            if resume["verse"]:
+                self.verse_input = ft.TextField(value=resume["verse"])
+            self.build_ui()
+            self.show_read_page(restore=(resume["shown"], resume["offset"]))
+            self.run_in_background(self._finish_startup)
+        else:
+            self._ready.set()
+            self.build_ui()
+            self.current_view = "library"
+            self.show_current_view()
+            tracing.flush()
+
+    @tracing.traced()
+    def _finish_startup(self):
+        """Scan translations, open the corpus and warm the library after a resumed start."""
+        try:
+            found = list_translations(self._sqlite)
+            self.translations.update(found)
+            for name in [n for n in self.translations if n not in found]:
+                self.translations.pop(name, None)
+            if self.selected_translation not in self.translations:
+                self.selected_translation = next(iter(self.translations), None)
+            self.data = self.store.column(self.selected_translation) if self.selected_translation else JsonProvider({})
+            if self.current_book not in self.data:
+                self.current_book = next(iter(self.data.books()), None)
+                self.current_chapter = "1"
+        except Exception:
+            self.data = JsonProvider({})
+        finally:
+            self._ready.set()
+        try:
+            self._library_sections()
+            if getattr(self, "current_view", "library") in ("read", "verses"):
+                self.header = self.build_topbar()
+                self.layout.controls[0] = self.header
+                parallel = tuple(self.parallel_names())
+                self._warm_neighbours(parallel)
+            self.page.update()
+        except Exception:
+            pass
+        tracing.flush()
+
+    def _trace_updates(self, page):
+        """Record every page.update() with the number of controls the page holds."""
+        update = page.update
+
+        def traced_update(*controls):
+            with tracing.span("page.update"):
+                update(*controls)
+                tracing.annotate(controls=len(getattr(page, "_index", ())))
+        try:
+            page.update = traced_update
+        except Exception:
+            pass
 
     # ===============================
     # Theme helpers
@@ -271,6 +326,7 @@ class BibleApp:
     # ===============================
     # UI Builder
     # ===============================
+    @tracing.traced()
     def build_ui(self):
         self.header = self.build_topbar()
         self.bottom_nav = self.build_bottom_nav()
@@ -301,7 +357,7 @@ class BibleApp:
         )
 
         # book dropdown
-        book_options = [ft.dropdown.Option(b) for b in (self.data.keys() if self.data else [])]
+        book_options = [ft.dropdown.Option(b) for b in self.data.books()]
         self.book_select = ft.Dropdown(
             width=160,
             options=book_options,
@@ -312,11 +368,7 @@ class BibleApp:
         # chapter dropdown
         chapters = []
         if self.current_book and self.current_book in self.data:
-            chapters = list(self.data[self.current_book].keys())
-            try:
-                chapters = sorted(chapters, key=lambda x: int(x) if str(x).isdigit() else x)
-            except Exception:
-                pass
+            chapters = self._chapter_labels(self.current_book)
         self.chapter_select = ft.Dropdown(
             width=80,
             options=[ft.dropdown.Option(c) for c in chapters],
@@ -373,140 +425,179 @@ class BibleApp:
     # ===============================
     # Library (books) - NO "Other" section
     # ===============================
+    @tracing.traced()
     def show_library_page(self):
+        self._ready.wait()
         if not self.data:
             self.content_area.content = ft.Text("No Bible data available.", size=14, italic=True, color=self._theme_muted)
             self.page.update()
             return
 
-        books = list(self.data.keys())
-        
-        # Determine which order lists to use
-        current_trans = getattr(self, "selected_translation", "")
-        is_twi = (current_trans == "TWI")
-        
-        target_ot = TWI_OT_ORDER if is_twi else OT_ORDER
-        target_nt = TWI_NT_ORDER if is_twi else NT_ORDER
-        
-        ot_books = [b for b in target_ot if b in books]
-        nt_books = [b for b in target_nt if b in books]
+        sections = self._library_sections()
+        body = self._tile_grid(sections, self._grid_columns(160))
+        self._grid = ("library", sections, 160, [])
 
-        grouped = []
-        if ot_books:
-            grouped.append(("Old Testament" if not is_twi else "Apam Dedaw", ot_books))
-        if nt_books:
-            grouped.append(("New Testament" if not is_twi else "Apam Foforo", nt_books))
-
-
-
-
-
-        sections = []
-        for heading, blist in grouped:
-            # filtered = [b for b in blist if book_matches(b)]
-            filtered = blist
-            if not filtered:
-                continue
-            tiles = []
-            for b in filtered:
-                chap_count = len(self.data.get(b, {}))
-                tile = ft.Container(
-                    ft.Column([
-                        ft.Text(b, size=16, weight=ft.FontWeight.NORMAL, color=self._theme_text, text_align=ft.TextAlign.CENTER, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS),
-                        ft.Text(f"{chap_count} chapters", size=12, color=self._theme_muted),
-                    ], tight=True, alignment=ft.CrossAxisAlignment.CENTER),
-                    width=140,
-                    height=90,
-                    padding=12,
-                    margin=ft.margin.only(4,4,4,4),
-                    bgcolor=self._theme_panel,
-                    border_radius=8,
-                    border=ft.border.all(1, color=self._theme_muted),
-                    alignment=ft.alignment.center,
-                    on_click=lambda e, book=b: self.open_chapters(book),
-                )
-                tiles.append(tile)
-            sections.append((heading, tiles))
+        self.current_view = "library"
+        self.header = self.build_topbar()
+        self.layout.controls[0] = self.header
+        self.content_area.content = body
+        self.page.update()
 
-        def columns_for_width():
-            try:
-                w = int(self.page.width or 0)
-            except Exception:
-                w = 0
-            tile_total_width = 160
-            if w <= 0:
-                return 3
-            cols = max(1, int(w / tile_total_width))
-            return min(cols, 6)
-        cols = columns_for_width()
+    def _cached_tiles(self, key, build):
+        """Tile controls are built once per translation + theme and reused."""
+        scope = (self.selected_translation, self.selected_theme)
+        if self._tile_cache_scope != scope:
+            self._tile_cache = {}
+            self._tile_cache_scope = scope
+        if key not in self._tile_cache:
+            self._tile_cache[key] = build()
+        return self._tile_cache[key]
+
+    def _library_sections(self):
+        def build():
+            books = self.data.books()
+
+            # Determine which order lists to use
+            current_trans = getattr(self, "selected_translation", "")
+            is_twi = (current_trans == "TWI")
+
+            target_ot = TWI_OT_ORDER if is_twi else OT_ORDER
+            target_nt = TWI_NT_ORDER if is_twi else NT_ORDER
+
+            ot_books = [b for b in target_ot if b in books]
+            nt_books = [b for b in target_nt if b in books]
+
+            grouped = []
+            if ot_books:
+                grouped.append(("Old Testament" if not is_twi else "Apam Dedaw", ot_books))
+            if nt_books:
+                grouped.append(("New Testament" if not is_twi else "Apam Foforo", nt_books))
+
+            sections = []
+            counts = {}
+            for heading, blist in grouped:
+                tiles = []
+                for b in blist:
+                    chap_count = self._chapter_count(b)
+                    counts[b] = ft.Text(f"{chap_count} chapters" if chap_count is not None else "", size=12, color=self._theme_muted)
+                    tile = ft.Container(
+                        ft.Column([
+                            ft.Text(b, size=16, weight=ft.FontWeight.NORMAL, color=self._theme_text, text_align=ft.TextAlign.CENTER, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS),
+                            counts[b],
+                        ], tight=True, alignment=ft.CrossAxisAlignment.CENTER),
+                        width=140,
+                        height=90,
+                        padding=12,
+                        margin=ft.margin.only(4,4,4,4),
+                        bgcolor=self._theme_panel,
+                        border_radius=8,
+                        border=ft.border.all(1, color=self._theme_muted),
+                        alignment=ft.alignment.center,
+                        on_click=lambda e, book=b: self.open_chapters(book),
+                    )
+                    tiles.append(tile)
+                if tiles:
+                    sections.append((heading, tiles))
+            return {"sections": sections, "counts": counts}
+
+        cached = self._cached_tiles(("library",), build)
+        # lazily loaded books learn their chapter count once opened
+        for b, label in cached["counts"].items():
+            if not label.value:
+                n = self._chapter_count(b)
+                if n is not None:
+                    label.value = f"{n} chapters"
+        return cached["sections"]
+
+    def _chapter_index(self, book):
+        """``[(chapter, verse count), ...]`` without opening the book, or None if unknown."""
+        index = self.data.chapter_index(book)
+        if index is not None:
+            return index
+        entry = self.corpus_manifest.translation(self.selected_translation, self.translations.get(self.selected_translation))
+        return entry.chapter_index(book) if entry is not None else None
+
+    def _chapter_count(self, book):
+        index = self._chapter_index(book)
+        return len(index) if index is not None else self.data.chapter_count(book)
+
+    def _chapter_labels(self, book):
+        index = self._chapter_index(book)
+        return [c for c, _ in index] if index is not None else self.data.chapters(book)
+
+    def _grid_columns(self, tile_total_width):
+        try:
+            w = int(self.page.width or 0)
+        except Exception:
+            w = 0
+        if w <= 0:
+            return 3
+        cols = max(1, int(w / tile_total_width))
+        return min(cols, 6)
 
+    def _tile_grid(self, sections, cols, lead=()):
+        """Chunk cached tiles into rows of ``cols``; only the Rows are new."""
         def chunks(lst, n):
             for i in range(0, len(lst), n):
                 yield lst[i:i+n]
 
         content_cols = []
         for heading, tiles in sections:
-            content_cols.append(ft.Container(ft.Text(heading, size=14, weight=ft.FontWeight.BOLD, color=self._theme_text), padding=6))
-            for group in list(chunks(tiles, cols)):
+            if heading:
+                content_cols.append(ft.Container(ft.Text(heading, size=14, weight=ft.FontWeight.BOLD, color=self._theme_text), padding=6))
+            for group in chunks(tiles, cols):
                 content_cols.append(ft.Row(group, spacing=8, alignment=ft.MainAxisAlignment.CENTER))
-
+        self._grid_cols = cols
         body = ft.ListView(controls=content_cols, spacing=8, expand=True)
-
-        self.current_view = "library"
-        self.header = self.build_topbar()
-        self.layout.controls[0] = self.header
-        self.content_area.content = body
-        self.page.update()
-
-
+        if lead:
+            return ft.Column(list(lead) + [body], spacing=8, expand=True)
+        return body
 
     # ===============================
     # Chapters & verses navigation
     # ===============================
+    @tracing.traced()
     def open_chapters(self, book):
+        self._ready.wait()
         self.current_book = book
-        chapters = list(self.data.get(book, {}).keys())
-        try:
-            chapters = sorted(chapters, key=lambda x: int(x) if str(x).isdigit() else x)
-        except Exception:
-            pass
-        self.chapters_current = chapters
+        self.chapters_current = self._chapter_labels(book)
+        self._chapter_verses = dict(self._chapter_index(book) or ())
         self.current_view = "chapters"
         self.show_chapters_page()
 
+    @tracing.traced()
     def show_chapters_page(self):
         if not self.current_book:
             self.show_library_page()
             return
         title = ft.Container(ft.Text(self.current_book, size=18, weight=ft.FontWeight.BOLD, color=self._theme_text), alignment=ft.alignment.center, padding=8)
-        tiles = []
-        for c in self.chapters_current:
-            tile = ft.Container(
-                ft.Column([ft.Text(f"Chapter {c}", size=16, color=self._theme_text)], alignment=ft.CrossAxisAlignment.CENTER),
-                width=120, height=64, padding=10, margin=ft.margin.only(4,4,4,4),
-                bgcolor=self._theme_panel, border_radius=8, border=ft.border.all(1, color=self._theme_muted),
-                alignment=ft.alignment.center, on_click=lambda e, ch=c: self.open_verses(self.current_book, ch)
-            )
-            tiles.append(tile)
-        try:
-            w = int(self.page.width or 0)
-        except Exception:
-            w = 0
-        tile_total_width = 140
-        cols = max(1, int(w / tile_total_width)) if w > 0 else 3
-        cols = min(cols, 6)
-        rows = []
-        def chunks(lst, n):
-            for i in range(0, len(lst), n):
-                yield lst[i:i+n]
-        for group in chunks(tiles, cols):
-            rows.append(ft.Row(group, spacing=8, alignment=ft.MainAxisAlignment.CENTER))
-        body = ft.Column([title, ft.Divider(), ft.ListView(controls=rows, expand=True, spacing=8)], spacing=8, expand=True)
+        book = self.current_book
+
+        def build():
+            tiles = []
+            for c in self.chapters_current:
+                lines = [ft.Text(f"Chapter {c}", size=16, color=self._theme_text)]
+                if c in self._chapter_verses:
+                    lines.append(ft.Text(f"{self._chapter_verses[c]} verses", size=12, color=self._theme_muted))
+                tile = ft.Container(
+                    ft.Column(lines, tight=True, alignment=ft.CrossAxisAlignment.CENTER),
+                    width=120, height=64, padding=10, margin=ft.margin.only(4,4,4,4),
+                    bgcolor=self._theme_panel, border_radius=8, border=ft.border.all(1, color=self._theme_muted),
+                    alignment=ft.alignment.center, on_click=lambda e, ch=c: self.open_verses(book, ch)
+                )
+                tiles.append(tile)
+            return [(None, tiles)]
+
+        sections = self._cached_tiles(("chapters", book), build)
+        lead = [title, ft.Divider()]
+        body = self._tile_grid(sections, self._grid_columns(140), lead)
+        self._grid = ("chapters", sections, 140, lead)
         self.header = self.build_topbar()
         self.layout.controls[0] = self.header
         self.content_area.content = body
         self.page.update()
 
+    @tracing.traced()
     def open_verses(self, book, chapter):
         self.current_book = book
         self.current_chapter = chapter
@@ -515,14 +606,14 @@ class BibleApp:
         self.layout.controls[0] = self.header
         self.show_read_page()
 
+    @tracing.traced()
     def back(self):
         cv = getattr(self, "current_view", "library")
         if cv == "search":
             self.current_view = "library"
             self.show_library_page()
         elif cv == "verses":
-            self.current_view = "chapters"
-            self.show_chapters_page()
+            self.open_chapters(self.current_book)
         elif cv == "chapters":
             self.current_view = "library"
             self.show_library_page()
@@ -540,18 +631,24 @@ class BibleApp:
     # ===============================
     # Read page (verses)
     # ===============================
-    def show_read_page(self):
-        if not self.data or not self.current_book or not self.current_chapter:
+    @tracing.traced()
+    def show_read_page(self, restore=None):
+        if not self.selected_translation or not self.current_book or not self.current_chapter:
             self.content_area.content = ft.Text("No Bible content available.", size=14, italic=True, color=self._theme_muted)
             self.page.update()
             return
 
-        verses = self.data.get(self.current_book, {}).get(self.current_chapter, {})
-        items = list(verses.items())
-        try:
-            items = sorted(items, key=lambda kv: int(kv[0]) if str(kv[0]).isdigit() else kv[0])
-        except Exception:
-            pass
+        parallel = self.parallel_names()
+        key = (tuple(parallel), self.current_book, str(self.current_chapter))
+        loaded = self._prefetch.get(key)
+        tracing.annotate(book=self.current_book, chapter=self.current_chapter, warm=loaded is not None)
+        if loaded is None:
+            loaded = self._load_chapter(key)
+            self._prefetch.put(key, loaded)
+        verses, keys, columns = loaded
+        tracing.annotate(verses=len(keys), columns=len(key[0]))
+        # warm the chapters on either side while this one is read
+        self._warm_neighbours(key[0])
 
         start_v = None
         try:
@@ -563,7 +660,7 @@ class BibleApp:
 
         start_idx = 0
         if start_v:
-            for i, (vn, _) in enumerate(items):
+            for i, vn in enumerate(keys):
                 try:
                     if int(vn) >= int(start_v):
                         start_idx = i
@@ -573,40 +670,245 @@ class BibleApp:
                         start_idx = i
                         break
 
-        header_title = ft.Container(
-            ft.Row([
-                ft.Text(f"{self.current_book} {self.current_chapter}", size=18, weight=ft.FontWeight.BOLD, color=self._theme_text),
-                ft.Container(expand=True),
-                ft.TextField(width=80, hint_text="verse", on_submit=self.on_goto_verse, value=(str(start_v) if start_v else "")),
-            ], alignment=ft.MainAxisAlignment.START),
-            alignment=ft.alignment.center,
-            padding=8,
-        )
+        # the read view (and its pooled verse controls) is built once and
+        # refilled per chapter, so only changed properties go to the client
+        if self._read_view is None:
+            self._read_title = ft.Text(size=18, weight=ft.FontWeight.BOLD)
+            self._read_goto = ft.TextField(width=80, hint_text="verse", on_submit=self.on_goto_verse)
+            self._parallel_btn = ft.IconButton(ft.Icons.VIEW_COLUMN, tooltip="Parallel translations", on_click=self.toggle_parallel)
+            header_title = ft.Container(
+                ft.Row([self._read_title, ft.Container(expand=True), self._parallel_btn, self._read_goto], alignment=ft.MainAxisAlignment.START),
+                alignment=ft.alignment.center,
+                padding=8,
+            )
+            self._parallel_picker = ft.Row(wrap=True, visible=False)
+            self._parallel_header = ft.Row(visible=False)
+            self.verse_list = ft.ListView(spacing=6, expand=True, on_scroll=self.on_read_scroll, on_scroll_interval=100)
+            self._read_view = ft.Column([header_title, self._parallel_picker, ft.Divider(), self._parallel_header, self.verse_list], spacing=8, expand=True)
+        self._read_title.value = f"{self.current_book} {self.current_chapter}"
+        self._read_title.color = self._theme_text
+        self._read_goto.value = str(start_v) if start_v else ""
+        self._parallel_btn.icon_color = self._theme_accent if self.parallel_mode else None
+        self._parallel_picker.visible = self.parallel_mode
+        self._parallel_picker.controls = [
+            ft.Checkbox(label=name, value=(name in parallel), disabled=(name == self.selected_translation), on_change=lambda e, n=name: self.pick_parallel(n, e.control.value))
+            for name in self.translations.keys()
+        ]
+        self._parallel_header.visible = columns is not None
+        self._parallel_header.controls = [ft.Container(width=36)] + [
+            ft.Container(ft.Text(name, size=12, weight=ft.FontWeight.BOLD, color=self._theme_accent), expand=True) for name in parallel
+        ] if columns is not None else []
+
+        # verse controls are filled a page at a time as the list scrolls
+        self.verse_list.controls.clear()
+        self._read_state = {"book": self.current_book, "chapter": self.current_chapter, "verses": verses, "keys": keys[start_idx:], "shown": 0,
+                            "columns": [col[start_idx:] for col in columns] if columns is not None else None,
+                            "loaded": (key, loaded), "start": start_v,
+                            "marks": self._chapter_marks()}
+        self._append_verses()
+        shown, offset = restore or (0, 0)
+        while self._read_state["shown"] < shown and self._append_verses():
+            pass
+        self._read_offset = offset
 
-        verse_list = ft.ListView(spacing=6, expand=True)
-        for vnum, text in items[start_idx:]:
-            verse_bg = self._theme_panel
-            textfield = ft.TextField(value=str(text), read_only=True, multiline=True, expand=True, text_style=ft.TextStyle(size=self.font_size), bgcolor=verse_bg, border_color=verse_bg)
-            def make_copy_handler(book, chapter, vn, t):
-                def _copy(e):
-                    try:
-                        copy_text = f"{book} {chapter}:{vn} — {t}"
-                        self.page.set_clipboard(copy_text)
-                        self.page.snack_bar = ft.SnackBar(ft.Text("Copied to clipboard"))
-                        self.page.snack_bar.open = True
-                        self.page.update()
-                    except Exception:
-                        pass
-                return _copy
-            verse_row = ft.Row([
-                ft.Container(ft.Text(str(vnum), size=self.font_size, color=self._theme_text), width=48, alignment=ft.alignment.center_left),
-                textfield,
-                ft.IconButton(ft.Icons.CONTENT_COPY, on_click=make_copy_handler(self.current_book, self.current_chapter, vnum, text))
-            ], alignment=ft.MainAxisAlignment.START)
-            verse_list.controls.append(ft.Container(verse_row, bgcolor=verse_bg, border_radius=8, padding=10, on_click=lambda e, b=self.current_book, c=self.current_chapter, v=vnum: self.add_bookmark(b,c,v)))
-
-        self.content_area.content = ft.Column([header_title, ft.Divider(), verse_list], spacing=8, expand=True)
+        self.content_area.content = self._read_view
         self.page.update()
+        try:
+            self.verse_list.scroll_to(offset=offset, duration=0)
+        except Exception:
+            pass
+        self._schedule_resume()
+
+    def _warm_neighbours(self, names):
+        """Prefetch the chapters around the open one; the neighbours are found on the worker."""
+        data, book, chapter = self.data, self.current_book, self.current_chapter
+        names = tuple(names)
+        self._prefetch.request(lambda: [(names, b, c) for b, c in neighbours(data, book, chapter)])
+
+    def _load_chapter(self, key):
+        """``(verses, keys, columns)`` for ``(translations, book, chapter)``; columns only in parallel mode."""
+        names, book, chapter = key
+        data = self.store.column(names[0])
+        if len(names) > 1:
+            # aligned verse arrays: one lookup per translation per row
+            book_id = self.store.book_id(names[0], book)
+            keys, columns = self.store.aligned_chapter(list(names), book_id, chapter)
+            return {}, keys, columns
+        verses = data.chapter(book, chapter)
+        if not isinstance(verses, Chapter):
+            # decode the whole chapter once so paging it in is plain tuple
+            # access; every backend already iterates in reading order
+            keys = list(verses.keys())
+            verses = Chapter(keys, [verses[k] for k in keys])
+        return verses, list(verses.labels), None
+
+    def _verse_control(self, i):
+        """The i-th pooled verse control, created on first use and reused across chapters."""
+        while len(self._verse_pool) <= i:
+            self._verse_pool.append(ft.Container(
+                ft.Text(spans=[ft.TextSpan(), ft.TextSpan()], selectable=True),
+                border_radius=8,
+                padding=10,
+                on_click=self.on_verse_click,
+                on_long_press=self.on_verse_long_press,
+            ))
+        return self._verse_pool[i]
+
+    def _append_verses(self):
+        """Fill the next READ_PAGE_SIZE verses of the open chapter into the verse list."""
+        state = self._read_state
+        if not state:
+            return False
+        keys = state["keys"]
+        start = state["shown"]
+        if start >= len(keys):
+            return False
+        for i in range(start, min(start + READ_PAGE_SIZE, len(keys))):
+            vnum = keys[i]
+            if state["columns"] is not None:
+                self.verse_list.controls.append(self._parallel_row(state, i))
+                continue
+            ctrl = self._verse_control(i)
+            ctrl.data = (state["book"], state["chapter"], vnum)
+            span = verse_span(vnum)
+            self._mark_verse(ctrl, state["marks"].get(span[0]) if span else None)
+            text = ctrl.content
+            text.size = self.font_size
+            text.color = self._theme_text
+            num, body = text.spans
+            num.text = f"{vnum}  "
+            num.style = ft.TextStyle(size=max(10, self.font_size - 4), weight=ft.FontWeight.BOLD, color=self._theme_muted)
+            body.text = str(state["verses"][vnum])
+            self.verse_list.controls.append(ctrl)
+        state["shown"] = min(start + READ_PAGE_SIZE, len(keys))
+        return True
+
+    def _parallel_row(self, state, i):
+        """One verse across the parallel translations; missing verses (None) show as holes."""
+        cells = [ft.Container(ft.Text(str(state["keys"][i]), size=max(10, self.font_size - 4), weight=ft.FontWeight.BOLD, color=self._theme_muted), width=36)]
+        for col in state["columns"]:
+            text = col[i]
+            if text is not None:
+                cell = ft.Text(str(text), size=self.font_size, color=self._theme_text, selectable=True)
+            else:
+                cell = ft.Text("—", size=self.font_size, italic=True, color=self._theme_muted, tooltip="Not in this translation")
+            cells.append(ft.Container(cell, expand=True))
+        row = ft.Container(
+            ft.Row(cells, vertical_alignment=ft.CrossAxisAlignment.START),
+            border_radius=8,
+            padding=10,
+            data=(state["book"], state["chapter"], state["keys"][i]),
+            on_click=self.on_verse_click,
+            on_long_press=self.on_verse_long_press,
+        )
+        span = verse_span(state["keys"][i])
+        self._mark_verse(row, state["marks"].get(span[0]) if span else None)
+        return row
+
+    def _chapter_marks(self):
+        # resolved by alias so a resumed start doesn't have to open the corpus
+        pos = BOOK_ALIASES.lookup(self.current_book)
+        if pos is None:
+            return {}
+        return self.bookmarks.in_chapter(pos, self.current_chapter)
+
+    def _mark_verse(self, ctrl, attrs):
+        """Bookmarked verses get an accent edge, highlighted ones their colour."""
+        attrs = attrs or {}
+        ctrl.bgcolor = attrs.get("highlight") or self._theme_panel
+        ctrl.border = ft.border.only(left=ft.BorderSide(3, self._theme_accent)) if attrs.get("bookmark") else None
+
+    def parallel_names(self):
+        """Translations shown side by side: the open one first, up to PARALLEL_MAX."""
+        if not self.parallel_mode or not self.selected_translation:
+            return [self.selected_translation] if self.selected_translation else []
+        others = [n for n in self.parallel_translations if n != self.selected_translation and n in self.translations]
+        return [self.selected_translation] + others[:PARALLEL_MAX - 1]
+
+    def toggle_parallel(self, e=None):
+        self.parallel_mode = not self.parallel_mode
+        self.save_settings()
+        self.show_read_page()
+
+    def pick_parallel(self, name, checked):
+        picked = [n for n in self.parallel_translations if n != name]
+        if checked:
+            picked.append(name)
+        others = [n for n in picked if n != self.selected_translation]
+        if len(others) > PARALLEL_MAX - 1:
+            self.page.snack_bar = ft.SnackBar(ft.Text(f"Up to {PARALLEL_MAX} translations side by side"))
+            self.page.snack_bar.open = True
+            others = others[:PARALLEL_MAX - 1]
+        self.parallel_translations = others
+        self.save_settings()
+        self.show_read_page()
+
+    def on_read_scroll(self, e):
+        try:
+            if e.pixels is not None:
+                self._read_offset = e.pixels
+                self._schedule_resume()
+            if e.max_scroll_extent is not None and e.pixels is not None and e.pixels >= e.max_scroll_extent - 400:
+                if self._append_verses():
+                    self.page.update()
+        except Exception:
+            pass
+
+    def _schedule_resume(self):
+        try:
+            if self._resume_timer is not None:
+                self._resume_timer.cancel()
+            self._resume_timer = threading.Timer(RESUME_DEBOUNCE, self.flush_resume)
+            self._resume_timer.daemon = True
+            self._resume_timer.start()
+        except Exception:
+            pass
+
+    def flush_resume(self):
+        """Queue the resume snapshot for the open chapter (skipping the debounce)."""
+        state = self._read_state
+        if not state:
+            return
+        try:
+            if self._resume_timer is not None:
+                self._resume_timer.cancel()
+            (names, book, chapter), (verses, keys, columns) = state["loaded"]
+            save_resume({
+                "version": RESUME_VERSION,
+                "sources": {n: str(self.translations[n]) for n in names if n in self.translations},
+                "names": list(names),
+                "book": book,
+                "chapter": chapter,
+                "verse": state["start"],
+                "shown": state["shown"],
+                "offset": self._read_offset,
+                "verses": dict(verses),
+                "keys": list(keys),
+                "columns": columns,
+            })
+        except Exception:
+            pass
+        # the trace goes out at the same quiet moments as the snapshot
+        tracing.flush()
+
+    def on_verse_click(self, e):
+        book, chapter, vnum = e.control.data
+        self.add_bookmark(book, chapter, vnum)
+        vid = self.store.verse_id(self.selected_translation, book, chapter, vnum)
+        if vid is not None:
+            self._mark_verse(e.control, self.bookmarks.get(vid))
+            self.page.update()
+
+    def on_verse_long_press(self, e):
+        try:
+            book, chapter, vnum = e.control.data
+            text = self.data.chapter(book, chapter)[vnum]
+            self.page.set_clipboard(f"{book} {chapter}:{vnum} — {text}")
+            self.page.snack_bar = ft.SnackBar(ft.Text("Copied to clipboard"))
+            self.page.snack_bar.open = True
+            self.page.update()
+        except Exception:
+            pass
 
     def on_goto_verse(self, e):
         try:
@@ -621,11 +923,26 @@ class BibleApp:
     # Bookmarks & Settings
     # ===============================
     def show_bookmarks_page(self):
-        if not self.bookmarks:
+        self._ready.wait()
+        rows = []
+        for vid in self.bookmarks:
+            if not self.bookmarks.is_bookmarked(vid):
+                continue
+            # shown in the open translation's own book names
+            loc = self.store.locate(self.selected_translation, vid)
+            if loc is None:
+                pos, chapter, verse = split_verse_id(vid)
+                label = f"{BOOK_IDS[pos] if pos < len(BOOK_IDS) else pos} {chapter}:{verse}"
+                action = None
+            else:
+                label = f"{loc[0]} {loc[1]}:{loc[2]}"
+                action = ft.IconButton(ft.Icons.OPEN_IN_NEW, on_click=lambda e, loc=loc: self.open_verses(loc[0], loc[1]))
+            rows.append(ft.Container(ft.Row([ft.Text(label, size=16, color=self._theme_text), ft.Container(expand=True)] + ([action] if action else [])), bgcolor=self._theme_panel, padding=8, border_radius=6))
+        if not rows:
             self.content_area.content = ft.Text("No bookmarks yet.", size=14, italic=True, color=self._theme_muted)
             self.page.update()
             return
-        items = ft.ListView([ft.Container(ft.Row([ft.Text(f"{b['book']} {b['chapter']}:{b['verse']}", size=16, color=self._theme_text), ft.Container(expand=True), ft.IconButton(ft.Icons.OPEN_IN_NEW, on_click=lambda e, b=b: self.open_verses(b['book'], b['chapter']))]), bgcolor=self._theme_panel, padding=8, border_radius=6) for b in self.bookmarks], spacing=8, expand=True)
+        items = ft.ListView(rows, spacing=8, expand=True)
         self.content_area.content = items
         self.page.update()
 
@@ -661,6 +978,7 @@ class BibleApp:
         except Exception:
             pass
 
+    @tracing.traced()
     def switch_tab(self, tab):
         self.current_tab = tab
         self.header = self.build_topbar()
@@ -676,16 +994,17 @@ class BibleApp:
         self.page.update()
 
     def add_bookmark(self, book, chapter, verse):
-        bm = {"book": book, "chapter": chapter, "verse": verse}
-        if bm not in self.bookmarks:
-            self.bookmarks.append(bm)
-            save_json(BOOKMARKS_FILE, {"bookmarks": self.bookmarks})
+        vid = self.store.verse_id(self.selected_translation, book, chapter, verse)
+        if vid is not None and self.bookmarks.add(vid):
             self.page.snack_bar = ft.SnackBar(ft.Text(f"Added {book} {chapter}:{verse} to bookmarks"))
             self.page.snack_bar.open = True
             self.page.update()
 
     def save_settings(self):
-        save_json(SETTINGS_FILE, {"font_size": self.font_size, "translation": self.selected_translation, "theme": self.selected_theme})
+        # keys the app doesn't edit itself ("trace", "backend") are kept as they are
+        self.settings.update({"font_size": self.font_size, "translation": self.selected_translation, "theme": self.selected_theme,
+                              "parallel_mode": self.parallel_mode, "parallel": list(self.parallel_translations)})
+        save_json(SETTINGS_FILE, dict(self.settings))
 
     # ===============================
     # Font adjust (fixed)
@@ -710,32 +1029,32 @@ class BibleApp:
     # ===============================
     # Translation handlers (preserve book/chapter)
     # ===============================
+    @tracing.traced()
     def change_translation(self, e):
+        self._ready.wait()
         val = e.control.value
         if val and val in self.translations:
-            self.selected_translation = val
-            new_data = load_data(self.translations[val]) or {}
-            old_book = self.current_book
+            self._search_gen += 1
+            # carry the position over by canonical book id, not by name
+            old_id = self.store.book_id(self.selected_translation, self.current_book) if self.current_book else None
             old_chapter = self.current_chapter
+            self.selected_translation = val
+            self.data = self.store.column(val)
+            new_book = self.store.book_name(val, old_id) if old_id is not None else None
 
-            self.data = new_data
-            books = list(self.data.keys())
+            books = self.data.books()
             self.book_select.options = [ft.dropdown.Option(b) for b in books]
 
             # restore old book/chapter when available
-            if old_book in books:
-                self.current_book = old_book
-                self.book_select.value = old_book
+            if new_book in books:
+                self.current_book = new_book
+                self.book_select.value = new_book
             else:
                 self.current_book = books[0] if books else None
                 self.book_select.value = self.current_book
 
             if self.current_book and self.current_book in self.data:
-                chapters = list(self.data[self.current_book].keys())
-                try:
-                    chapters = sorted(chapters, key=lambda x: int(x) if str(x).isdigit() else x)
-                except Exception:
-                    pass
+                chapters = self._chapter_labels(self.current_book)
                 self.chapter_select.options = [ft.dropdown.Option(c) for c in chapters]
                 if old_chapter in chapters:
                     self.current_chapter = old_chapter
@@ -760,15 +1079,12 @@ class BibleApp:
                     self.show_library_page()
 
     def change_book(self, e):
+        self._ready.wait()
         new_book = self.book_select.value
         if not new_book:
             return
         self.current_book = new_book
-        chapters = list(self.data.get(self.current_book, {}).keys())
-        try:
-            chapters = sorted(chapters, key=lambda x: int(x) if str(x).isdigit() else x)
-        except Exception:
-            pass
+        chapters = self._chapter_labels(self.current_book)
         self.chapter_select.options = [ft.dropdown.Option(c) for c in chapters]
         if self.current_chapter in chapters:
             self.chapter_select.value = self.current_chapter
@@ -787,82 +1103,276 @@ class BibleApp:
     # ===============================
     # Search (improved)
     # ===============================
+    @tracing.traced()
     def open_search(self):
+        self._ready.wait()
+        self._prefetch.cancel()
         self.search_input = ft.TextField(hint_text="Search scripture (words, book, or reference)...", expand=True, on_submit=self.run_search)
-        self.search_results = ft.Column(spacing=8, expand=True)
-        body = ft.Column([ft.Row([self.search_input]), ft.Divider(), self.search_results], spacing=8, expand=True)
+        self.search_all = ft.Checkbox(label="All translations", value=False, on_change=lambda e: self.run_search(e) if (self.search_input.value or "").strip() else None)
+        self.search_results = ft.ListView(spacing=8, expand=True, on_scroll=self.on_search_scroll, on_scroll_interval=100)
+        body = ft.Column([ft.Row([self.search_input]), ft.Row([self.search_all]), ft.Divider(), self.search_results], spacing=8, expand=True)
         self.current_view = "search"
         self.header = self.build_topbar()
         self.layout.controls[0] = self.header
         self.content_area.content = body
         self.page.update()
 
+    @tracing.traced()
     def run_search(self, e):
+        # a new query supersedes whatever is still running
+        self._search_gen += 1
+        gen = self._search_gen
         query = (self.search_input.value or "").strip()
-        qlow = query.lower()
         self.search_results.controls.clear()
         if not query:
             self.search_results.controls.append(ft.Text("Type a search term and press Enter.", color=self._theme_muted))
             self.page.update()
             return
+        self.search_results.controls.append(ft.Text("Searching...", color=self._theme_muted))
+        self.page.update()
+        search_all = getattr(self, "search_all", None) is not None and self.search_all.value and len(self.translations) > 1
+        ref = BOOK_ALIASES.parse(query)
+        if ref is not None:
+            # references jump straight to the verses, no full-text search
+            names = list(self.translations.keys()) if search_all else [self.selected_translation]
+            self.run_in_background(self._reference_worker, gen, ref, names)
+        elif search_all:
+            self.run_in_background(self._search_all_worker, gen, query)
+        else:
+            self.run_in_background(self._search_worker, gen, query)
+
+    @tracing.traced()
+    def _reference_worker(self, gen, ref, names):
+        merged = {}
+        for name in names:
+            book = self.store.book_name(name, ref.book)
+            if book is None:
+                continue
+            for chap, vnum in resolve_reference(ref, self.store.column(name)[book]):
+                merged.setdefault(self.store.verse_id(name, book, chap, vnum), {})[name] = (book, chap, vnum)
+        if gen != self._search_gen:
+            return
+        items = sorted(merged.items())
+        self._start_search_pages(gen, items, f"{len(items)} verse(s)", lambda item: self._render_ref_hit(item[1]))
 
-        results = 0
-        max_results = 500
-        for book, chaps in self.data.items():
-            book_low = book.lower()
-            for chap, verses in chaps.items():
-                for vnum, text in verses.items():
-                    if results >= max_results:
-                        break
-                    text_str = str(text)
-                    text_low = text_str.lower()
-                    matched = False
-                    if qlow == f"{book_low} {chap}:{vnum}".lower() or qlow == f"{book_low} {chap}".lower():
-                        matched = True
-                    elif qlow in book_low:
-                        matched = True
-                    elif qlow in text_low:
-                        matched = True
-
-                    if matched:
-                        if qlow in text_low:
-                            idx = text_low.find(qlow)
-                            start = max(0, idx - 30)
-                            end = min(len(text_str), idx + len(query) + 60)
-                            snippet = text_str[start:end].strip()
-                            if start > 0:
-                                snippet = "..." + snippet
-                            if end < len(text_str):
-                                snippet = snippet + "..."
-                        else:
-                            snippet = text_str[:140] + ("..." if len(text_str) > 140 else "")
-
-                        snippet_row = make_highlighted_snippet(snippet, query, self._theme_accent, self._theme_muted)
-
-                        result_item = ft.Container(
-                            ft.Column([
-                                ft.Row([ft.Text(f"{book} {chap}:{vnum}", weight=ft.FontWeight.BOLD, color=self._theme_text), ft.Container(expand=True), ft.IconButton(ft.Icons.OPEN_IN_NEW, on_click=lambda e, b=book, c=chap: self.open_verses(b, c))]),
-                                snippet_row
-                            ]),
-                            bgcolor=self._theme_panel,
-                            padding=8,
-                            border_radius=6,
-                            on_click=lambda e, b=book, c=chap, v=vnum: self.open_verse_from_search(b, c, v)
-                        )
-                        self.search_results.controls.append(result_item)
-                        results += 1
-                if results >= max_results:
-                    break
-            if results >= max_results:
-                break
-
-        if results == 0:
-            self.search_results.controls.append(ft.Text("No results found.", color=self._theme_muted))
+    @tracing.traced()
+    def _search_worker(self, gen, query):
+        index = self.get_search_index()
+        if gen != self._search_gen:
+            return
+        hits = index.search(query) if index else []
+        tracing.annotate(query=query, hits=len(hits))
+        summary = f"{len(hits)} result(s)"
+        self._start_search_pages(gen, hits, summary, lambda doc: self._render_search_hit(index, query, doc))
+
+    @tracing.traced()
+    def _search_all_worker(self, gen, query):
+        """Search every installed translation on the pool and merge hits by verse."""
+        names = list(self.translations.keys())
+        self._build_cold_indexes(names)
+
+        def one(name):
+            if gen != self._search_gen:
+                return name, None, []
+            index = self.get_search_index(name)
+            return name, index, (index.search(query) if index else [])
+
+        results = list(self._search_pool.map(one, names))
+        if gen != self._search_gen:
+            return
+        merged = {}
+        for name, index, hits in results:
+            for doc in hits:
+                merged.setdefault(self.store.verse_id(name, *index.ref(doc)), {})[name] = doc
+        indexes = {name: index for name, index, _ in results}
+        items = sorted(merged.items())
+        counts = " · ".join(f"{name}: {len(hits)}" for name, _, hits in results)
+        summary = f"{len(items)} verse(s) — {counts}"
+        self._start_search_pages(gen, items, summary, lambda item: self._render_merged_hit(indexes, query, item[1]))
+
+    @tracing.traced()
+    def _build_cold_indexes(self, names):
+        """Build the missing saved indexes of ``names`` in worker processes.
+
+        Building is pure Python, so on the thread pool the builds would take
+        turns on the GIL; afterwards the threads only load the saved files.
+        Without process support (Android) the threads build them as before.
+        """
+        sources = [self.translations[n] for n in names
+                   if n not in self._search_indexes and needs_index_build(self.translations[n])]
+        jobs = min(len(sources), os.cpu_count() or 1)
+        tracing.annotate(cold=len(sources), jobs=jobs)
+        if jobs < 2:
+            return
+        try:
+            # spawn, not fork: a fork would copy the UI's threads' locks in whatever state
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+                list(pool.map(build_search_index, sources))
+        except Exception:
+            pass
+
+    def _start_search_pages(self, gen, hits, summary, render):
+        with self._search_lock:
+            if gen != self._search_gen:
+                return
+            self._search_state = {"gen": gen, "hits": hits, "render": render, "shown": 0}
+            self.search_results.controls.clear()
+            if not hits:
+                self.search_results.controls.append(ft.Text("No results found.", color=self._theme_muted))
+            else:
+                self.search_results.controls.append(ft.Text(summary, color=self._theme_muted))
+        if hits:
+            self._append_search_page(gen)
         else:
-            self.search_results.controls.insert(0, ft.Text(f"{results} result(s)", color=self._theme_muted))
+            self.page.update()
 
+    def _append_search_page(self, gen):
+        """Render the next SEARCH_PAGE_SIZE hits of the current query."""
+        with self._search_lock:
+            state = self._search_state
+            if not state or state["gen"] != gen or gen != self._search_gen:
+                return
+            hits, render = state["hits"], state["render"]
+            controls = self.search_results.controls
+            if controls and controls[-1] is self._search_more:
+                controls.pop()
+            start = state["shown"]
+            batch = hits[start:start + SEARCH_PAGE_SIZE]
+            for hit in batch:
+                if gen != self._search_gen:
+                    return
+                item = render(hit)
+                if item is not None:
+                    controls.append(item)
+            state["shown"] = start + len(batch)
+            if state["shown"] < len(hits):
+                self._search_more = ft.TextButton(f"Show more ({len(hits) - state['shown']} left)", on_click=lambda e, g=gen: self.run_in_background(self._append_search_page, g))
+                controls.append(self._search_more)
         self.page.update()
 
+    def _snippet_row(self, index, query, doc, text):
+        snippet, spans = make_snippet(text, index.match_spans(doc, query))
+        return make_highlighted_snippet(snippet, query, self._theme_accent, self._theme_muted, spans=spans)
+
+    def _render_search_hit(self, index, query, doc):
+        book, chap, vnum = index.ref(doc)
+        try:
+            text_str = str(self.data.chapter(book, chap)[vnum])
+        except KeyError:
+            return None
+        return ft.Container(
+            ft.Column([
+                ft.Row([ft.Text(f"{book} {chap}:{vnum}", weight=ft.FontWeight.BOLD, color=self._theme_text), ft.Container(expand=True), ft.IconButton(ft.Icons.OPEN_IN_NEW, on_click=lambda e, b=book, c=chap: self.open_verses(b, c))]),
+                self._snippet_row(index, query, doc, text_str)
+            ]),
+            bgcolor=self._theme_panel,
+            padding=8,
+            border_radius=6,
+            on_click=lambda e, b=book, c=chap, v=vnum: self.open_verse_from_search(b, c, v)
+        )
+
+    def _render_merged_hit(self, indexes, query, docs):
+        """One verse found in several translations: a line per translation."""
+        rows = []
+        title = None
+        target = None
+        for name, doc in docs.items():
+            index = indexes[name]
+            book, chap, vnum = index.ref(doc)
+            if title is None:
+                title = f"{book} {chap}:{vnum}"
+            if name == self.selected_translation:
+                title = f"{book} {chap}:{vnum}"
+                target = (book, chap, vnum)
+            try:
+                text_str = str(self.store.column(name)[book][chap][vnum])
+            except KeyError:
+                continue
+            rows.append(ft.Row([
+                ft.Container(ft.Text(name, size=12, weight=ft.FontWeight.BOLD, color=self._theme_accent), width=48),
+                ft.Container(self._snippet_row(index, query, doc, text_str), expand=True),
+            ], vertical_alignment=ft.CrossAxisAlignment.START))
+        if target is None:
+            # not found in the open translation; open the same verse there if it exists
+            name, doc = next(iter(docs.items()))
+            book, chap, vnum = indexes[name].ref(doc)
+            target = (self.book_in_current_translation(book, name), chap, vnum)
+        return ft.Container(
+            ft.Column([ft.Text(title, weight=ft.FontWeight.BOLD, color=self._theme_text)] + rows),
+            bgcolor=self._theme_panel,
+            padding=8,
+            border_radius=6,
+            on_click=(lambda e, t=target: self.open_verse_from_search(*t)) if target[0] else None,
+        )
+
+    def _render_ref_hit(self, refs):
+        """A verse looked up by reference, with its text in each requested translation."""
+        lines = []
+        target = None
+        for name, (book, chap, vnum) in refs.items():
+            if target is None or name == self.selected_translation:
+                target = (book, chap, vnum)
+                target_name = name
+            try:
+                text_str = str(self.store.column(name)[book][chap][vnum])
+            except KeyError:
+                continue
+            body = ft.Text(text_str, size=12)
+            if len(refs) > 1:
+                body = ft.Row([ft.Container(ft.Text(name, size=12, weight=ft.FontWeight.BOLD, color=self._theme_accent), width=48), ft.Container(body, expand=True)], vertical_alignment=ft.CrossAxisAlignment.START)
+            lines.append(body)
+        book, chap, vnum = target
+        if target_name != self.selected_translation:
+            book = self.book_in_current_translation(book, target_name)
+        return ft.Container(
+            ft.Column([ft.Text(f"{target[0]} {chap}:{vnum}", weight=ft.FontWeight.BOLD, color=self._theme_text)] + lines),
+            bgcolor=self._theme_panel,
+            padding=8,
+            border_radius=6,
+            on_click=(lambda e, t=(book, chap, vnum): self.open_verse_from_search(*t)) if book else None,
+        )
+
+    def book_in_current_translation(self, book, name):
+        """Name the open translation uses for ``book`` as named by translation ``name``."""
+        book_id = self.store.book_id(name, book)
+        return self.store.book_name(self.selected_translation, book_id) if book_id is not None else None
+
+    def on_search_scroll(self, e):
+        # load the next page when the list is scrolled near its end
+        try:
+            state = self._search_state
+            if not state or state["shown"] >= len(state["hits"]):
+                return
+            if e.max_scroll_extent is not None and e.pixels is not None and e.pixels >= e.max_scroll_extent - 200:
+                self.run_in_background(self._append_search_page, state["gen"])
+        except Exception:
+            pass
+
+    def run_in_background(self, fn, *args):
+        try:
+            self.page.run_thread(fn, *args)
+        except AttributeError:
+            threading.Thread(target=fn, args=args, daemon=True).start()
+
+    @tracing.traced()
+    def get_search_index(self, name=None):
+        """Inverted index for a translation, the open one by default (loaded or built once, then cached)."""
+        name = name or self.selected_translation
+        if not name or name not in self.translations:
+            return None
+        data = self.store.column(name)
+        # one lock per translation so several indexes can build in parallel
+        with self._index_lock:
+            lock = self._index_locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._search_indexes:
+                try:
+                    # the saved positional index (JSON family) or SQLite FTS5
+                    self._search_indexes[name] = data.search_index()
+                except Exception:
+                    return None
+            return self._search_indexes[name]
+
     def open_verse_from_search(self, book, chapter, verse):
         try:
             self.current_book = book
@@ -887,11 +1397,29 @@ class BibleApp:
     # Misc
     # ===============================
     def on_page_resize(self, e):
+        # window drags fire many resize events; only re-flow once they settle
         try:
-            if getattr(self, "current_view", "library") == "library":
-                self.show_library_page()
-            elif getattr(self, "current_view", "chapters") == "chapters":
-                self.show_chapters_page()
+            if self._resize_timer is not None:
+                self._resize_timer.cancel()
+            self._resize_timer = threading.Timer(RESIZE_DEBOUNCE, self._reflow_grid)
+            self._resize_timer.daemon = True
+            self._resize_timer.start()
+        except Exception:
+            pass
+
+    def _reflow_grid(self):
+        """Re-chunk the cached library/chapter tiles for the new width."""
+        try:
+            if getattr(self, "current_view", "library") not in ("library", "chapters") or not self._grid:
+                return
+            view, sections, tile_width, lead = self._grid
+            if view != self.current_view:
+                return
+            cols = self._grid_columns(tile_width)
+            if cols == self._grid_cols:
+                return
+            self.content_area.content = self._tile_grid(sections, cols, lead)
+            self.page.update()
         except Exception:
             pass
 
@@ -905,6 +1433,10 @@ def main(page: ft.Page):
     def on_window_event(e):
         try:
             # e.data can be "back", "close", "popRoute" depending on platform/version
+            if getattr(e, "data", None) == "close":
+                app.flush_resume()
+                WRITER.flush()
+                tracing.flush(final=True)
             if getattr(e, "data", None) in ("back", "close", "popRoute"):
                 app.back()
                 # return True to signal we've handled the event where supported
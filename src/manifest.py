@@ -0,0 +1,237 @@
+"""
+Corpus manifest: what every translation actually contains.
+
+``scripts/validate_corpus.py`` surveys each translation against the canonical
+versification (see versification) and writes ``corpus_manifest.json`` to the
+data folder. Per book it records the chapters in reading order with their
+verse counts, and per chapter the missing, extra, duplicate and empty verses.
+
+The app reads chapter labels and verse counts from it for the library tiles
+and the chapter grid instead of opening books. An entry is only used while
+the translation's source files still match the fingerprint taken when it was
+surveyed.
+"""
+from pathlib import Path
+import json
+
+from corpus import BookFolderCorpus, freeze_book
+from ingest import is_list_format, iter_list_entries
+from search_index import source_fingerprint
+from store import BOOK_IDS, verse_span
+import versification
+
+MANIFEST_NAME = "corpus_manifest.json"
+MANIFEST_VERSION = 1
+
+
+class _Pairs(dict):
+    """A JSON object that remembers keys it saw more than once."""
+    __slots__ = ("duplicates",)
+
+
+def _pairs_hook(pairs):
+    d = _Pairs()
+    d.duplicates = []
+    for k, v in pairs:
+        if k in d:
+            d.duplicates.append(k)
+        d[k] = v
+    return d
+
+
+def source_key(source):
+    """How an entry names its source: the absolute path (``<db>#<name>`` for
+    SQLite), so the validator's and the app's spellings of a path agree."""
+    db = getattr(source, "db", None)
+    if db is not None:
+        return f"{Path(db).resolve()}#{source.name}"
+    return str(Path(source).resolve())
+
+
+def fingerprint(source):
+    """Files a translation is read from (the database for SQLite sources)."""
+    return [list(f) for f in source_fingerprint(getattr(source, "db", source))]
+
+
+# ===============================
+# Reading with duplicates
+# ===============================
+def read_source(source, loader, order=()):
+    """``(data, duplicates)`` for a translation.
+
+    JSON sources are re-parsed so that keys repeated in the file, which a
+    plain parse silently collapses, are reported: ``duplicates`` maps
+    ``(book, chapter)`` to repeated verse labels and ``(book, None)`` to
+    repeated chapter labels. Compiled and database sources can't hold
+    duplicates and are read through ``loader``.
+    """
+    duplicates = {}
+
+    def collect(book, chapters):
+        if getattr(chapters, "duplicates", None):
+            duplicates[(book, None)] = list(chapters.duplicates)
+        for chap, verses in chapters.items():
+            if getattr(verses, "duplicates", None):
+                duplicates[(book, chap)] = list(verses.duplicates)
+
+    source_path = Path(source) if isinstance(source, (str, Path)) else None
+    if source_path is not None and source_path.is_dir():
+        folder = BookFolderCorpus(source_path, order=order)
+        data = {}
+        for book in folder:
+            with open(folder.source(book), "r", encoding="utf-8") as f:
+                raw = json.load(f, object_pairs_hook=_pairs_hook)
+            chapters = next((v for k, v in raw.items() if k != "Info" and isinstance(v, dict)), _Pairs())
+            collect(book, chapters)
+            data[book] = chapters
+        return data, duplicates
+    if source_path is not None and source_path.suffix == ".json":
+        if is_list_format(source_path):
+            data = {}
+            for book, chap, verse, text in iter_list_entries(source_path):
+                verses = data.setdefault(book, {}).setdefault(chap, {})
+                if verse in verses:
+                    duplicates.setdefault((book, chap), []).append(verse)
+                verses[verse] = text
+            return data, duplicates
+        with open(source_path, "r", encoding="utf-8") as f:
+            data = json.load(f, object_pairs_hook=_pairs_hook)
+        for book, chapters in data.items():
+            if isinstance(chapters, dict):
+                collect(book, chapters)
+        return data, duplicates
+    return loader(source), duplicates
+
+
+# ===============================
+# Survey
+# ===============================
+def survey(data, resolve, duplicates=None):
+    """Compare a translation with the canonical versification.
+
+    ``resolve(book name)`` gives a canonical book position or None. Errors are
+    missing books, chapters and verses, duplicates and empty texts; extra
+    chapters and verses (another numbering) and unknown books are warnings.
+    """
+    duplicates = duplicates or {}
+    books = {}
+    seen = set()
+    unknown = []
+    totals = {"books": 0, "chapters": 0, "verses": 0, "errors": 0, "warnings": 0}
+    for name in data:
+        chapters = data[name]
+        if not hasattr(chapters, "items"):
+            continue
+        chapters = freeze_book(chapters)
+        pos = resolve(name)
+        entry = {"id": BOOK_IDS[pos] if pos is not None and pos < len(BOOK_IDS) else None, "chapters": []}
+        if pos is None:
+            unknown.append(name)
+            totals["warnings"] += 1
+        else:
+            seen.add(pos)
+        issues = {}
+        for chap in chapters:
+            verses = chapters[chap]
+            entry["chapters"].append([chap, len(verses)])
+            expected = versification.verses(pos, chap) if pos is not None else None
+            found = {}
+            empty = [v for v, text in verses.items() if not isinstance(text, str) or not text.strip()]
+            if empty:
+                found["empty"] = empty
+            if duplicates.get((name, chap)):
+                found["duplicates"] = duplicates[(name, chap)]
+            if expected is not None:
+                # a range label ("3-4") covers each verse in it
+                present = set()
+                extra = []
+                for v in verses.keys():
+                    span = verse_span(v)
+                    if span is None or not 1 <= span[0] <= span[1] <= expected:
+                        extra.append(v)
+                    if span is not None:
+                        present.update(range(span[0], span[1] + 1))
+                missing = [str(v) for v in range(1, expected + 1) if v not in present]
+                if missing:
+                    found["missing"] = missing
+                if extra:
+                    found["extra"] = extra
+            if found:
+                issues[chap] = found
+                totals["errors"] += sum(len(found.get(k, ())) for k in ("empty", "duplicates", "missing"))
+                totals["warnings"] += len(found.get("extra", ()))
+            totals["verses"] += len(verses)
+        if pos is not None and versification.chapters(pos) is not None:
+            labels = set(chapters.keys())
+            canon = versification.chapters(pos)
+            missing = [str(c) for c in range(1, canon + 1) if str(c) not in labels]
+            extra = [c for c in chapters.keys() if not c.isdigit() or not 1 <= int(c) <= canon]
+            if missing:
+                entry["missing_chapters"] = missing
+                totals["errors"] += len(missing)
+            if extra:
+                entry["extra_chapters"] = extra
+                totals["warnings"] += len(extra)
+        if duplicates.get((name, None)):
+            entry["duplicate_chapters"] = duplicates[(name, None)]
+            totals["errors"] += len(entry["duplicate_chapters"])
+        if issues:
+            entry["issues"] = issues
+        books[name] = entry
+        totals["books"] += 1
+        totals["chapters"] += len(chapters)
+    missing_books = [BOOK_IDS[p] for p in range(len(versification.VERSE_COUNTS)) if p not in seen]
+    totals["errors"] += len(missing_books)
+    return {"books": books, "missing_books": missing_books, "unknown_books": unknown, "totals": totals}
+
+
+# ===============================
+# Reading the manifest
+# ===============================
+class TranslationManifest:
+    """One translation's entry: chapter labels and verse counts by book."""
+
+    def __init__(self, entry):
+        self.totals = entry.get("totals", {})
+        self._books = {name: [(c, n) for c, n in book.get("chapters", [])]
+                       for name, book in entry.get("books", {}).items()}
+
+    def __contains__(self, book):
+        return book in self._books
+
+    def chapter_index(self, book):
+        """``[(chapter, verse count), ...]`` in reading order, or None."""
+        return self._books.get(book)
+
+    def chapter_count(self, book):
+        chapters = self._books.get(book)
+        return len(chapters) if chapters is not None else None
+
+
+class CorpusManifest:
+    def __init__(self, data=None):
+        data = data if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION else {}
+        self._entries = data.get("translations", {})
+        self._checked = {}
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return cls()
+
+    def translation(self, name, source):
+        """The entry for ``name`` if it was surveyed from ``source`` as it is now, else None."""
+        if name not in self._checked:
+            entry = self._entries.get(name)
+            fresh = None
+            if entry and source is not None and entry.get("source") == source_key(source):
+                try:
+                    if entry.get("fingerprint") == fingerprint(source):
+                        fresh = TranslationManifest(entry)
+                except OSError:
+                    fresh = None
+            self._checked[name] = fresh
+        return self._checked[name]
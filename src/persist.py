@@ -0,0 +1,121 @@
+"""
+Coalescing, atomic JSON writer for settings, bookmarks and the resume snapshot.
+
+``write`` only records the latest payload for a path and returns; a single
+background thread writes it out once the path has been quiet for ``delay``
+seconds, so a burst of font-size clicks costs one write. Files are written to a
+temp name, fsynced and renamed over the old one, so a crash leaves either the
+old file or the new one, never a truncated mix. ``flush`` writes everything
+still pending (called on exit and when the window closes).
+"""
+from pathlib import Path
+import atexit
+import json
+import os
+import threading
+import time
+
+
+def write_json_atomic(path, data, indent=2):
+    """Write ``data`` as JSON via a temp file and rename; ``indent=None`` writes it compact."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    separators = (",", ":") if indent is None else None
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, path)
+
+
+def read_json(path):
+    """The JSON in ``path``, or ``{}`` if it is missing or unreadable."""
+    if not Path(path).exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+class JsonWriter:
+    def __init__(self, delay=0.5):
+        self.delay = delay
+        self._pending = {}  # path -> (due time, seq, data, indent)
+        self._inflight = {}  # path -> (seq, data) taken from the queue, not yet renamed into place
+        self._seq = 0
+        self._written = {}  # path -> seq on disk, so a late older write can't win
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        atexit.register(self.flush)
+
+    def write(self, path, data, indent=2):
+        """Queue ``data`` for ``path``; replaces anything still queued for it."""
+        with self._lock:
+            self._seq += 1
+            self._pending[str(path)] = (time.monotonic() + self.delay, self._seq, data, indent)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def pending(self, path):
+        """The queued (or still being written) payload for ``path``, or None."""
+        with self._lock:
+            entry = self._pending.get(str(path))
+            if entry:
+                return entry[2]
+            entry = self._inflight.get(str(path))
+            return entry[1] if entry else None
+
+    def flush(self):
+        with self._lock:
+            due = self._take(list(self._pending))
+        self._write_all(due)
+
+    def _take(self, paths):
+        """Move ``paths`` from the queue to in flight; caller holds ``_lock``."""
+        due = {}
+        for p in paths:
+            entry = due[p] = self._pending.pop(p)
+            current = self._inflight.get(p)
+            if current is None or current[0] < entry[1]:
+                self._inflight[p] = (entry[1], entry[2])
+        return due
+
+    def _write_all(self, entries):
+        with self._io_lock:
+            for path, (_, seq, data, indent) in entries.items():
+                if self._written.get(path, 0) > seq:
+                    continue
+                try:
+                    write_json_atomic(path, data, indent)
+                    self._written[path] = seq
+                except (OSError, TypeError, ValueError):
+                    pass
+        with self._lock:
+            # visible to pending() until renamed into place (or given up on)
+            for path, (_, seq, _, _) in entries.items():
+                current = self._inflight.get(path)
+                if current is not None and current[0] <= seq:
+                    del self._inflight[path]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wake.wait()
+                now = time.monotonic()
+                ready = [p for p, e in self._pending.items() if e[0] <= now]
+                if not ready:
+                    self._wake.wait(min(e[0] for e in self._pending.values()) - now)
+                    continue
+                due = self._take(ready)
+            self._write_all(due)
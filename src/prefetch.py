@@ -0,0 +1,148 @@
+"""
+Background warming of the chapters a reader is likely to open next.
+
+After a chapter is shown the app asks for its neighbours (next and previous
+chapter, crossing into the adjacent book at a boundary). A single worker
+thread loads them into a small LRU within a per-request budget; a new request
+cancels whatever is still queued, so jumping elsewhere never waits on stale
+work. A request may be a function returning the keys, so working out the
+neighbours (which opens the adjacent book at a boundary) happens on the worker
+too. ``get`` returns a warm entry or None, and callers fall back to loading
+inline.
+"""
+from collections import OrderedDict
+import threading
+import time
+
+
+def neighbours(data, book, chapter):
+    """``[(book, chapter), ...]`` for the next and previous chapter of ``book``.
+
+    At the last (first) chapter of a book the next (previous) entry is the
+    first (last) chapter of the adjacent book in ``data``'s order (a corpus
+    provider). Chapters are taken in reading order.
+    """
+    out = []
+    try:
+        chapters = data.chapters(book)
+        i = chapters.index(str(chapter))
+    except ValueError:
+        return out
+    if i + 1 < len(chapters):
+        out.append((book, chapters[i + 1]))
+    if i > 0:
+        out.append((book, chapters[i - 1]))
+    books = data.books()
+    try:
+        b = books.index(book)
+    except ValueError:
+        return out
+    if i + 1 >= len(chapters) and b + 1 < len(books):
+        nxt = books[b + 1]
+        first = data.chapters(nxt)
+        if first:
+            out.append((nxt, first[0]))
+    if i == 0 and b > 0:
+        prev = books[b - 1]
+        last = data.chapters(prev)
+        if last:
+            out.append((prev, last[-1]))
+    return out
+
+
+class Prefetcher:
+    """LRU of loaded entries filled by one background thread.
+
+    ``load(key)`` produces the value for a key. Each ``request`` loads at most
+    ``budget`` keys and stops after ``time_budget`` seconds; it replaces any
+    earlier request that hasn't finished.
+    """
+
+    def __init__(self, load, budget=4, time_budget=0.5, max_cached=12):
+        self._load = load
+        self.budget = budget
+        self.time_budget = time_budget
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._pending = []
+        self._gen = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def get(self, key):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _select(self, keys):
+        return [k for k in keys if k not in self._cache][:self.budget]
+
+    def _store(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def request(self, keys):
+        """Warm ``keys`` in order, cancelling the previous request.
+
+        ``keys`` may be a callable returning them; it runs on the worker.
+        """
+        with self._lock:
+            self._gen += 1
+            self._pending = keys if callable(keys) else self._select(keys)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def cancel(self):
+        with self._lock:
+            self._gen += 1
+            self._pending = []
+
+    def clear(self):
+        with self._lock:
+            self._gen += 1
+            self._pending = []
+            self._cache.clear()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                gen = self._gen
+                keys = self._pending
+            if callable(keys):
+                try:
+                    keys = keys()
+                except Exception:
+                    keys = []
+                with self._lock:
+                    if gen != self._gen:
+                        continue
+                    keys = self._select(keys)
+            deadline = time.monotonic() + self.time_budget
+            for key in keys:
+                if time.monotonic() > deadline:
+                    break
+                with self._lock:
+                    if gen != self._gen:
+                        break
+                    if key in self._cache:
+                        continue
+                try:
+                    value = self._load(key)
+                except Exception:
+                    continue
+                with self._lock:
+                    # a jump while loading still keeps the result; it's valid data
+                    self._store(key, value)
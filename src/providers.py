@@ -0,0 +1,435 @@
+"""
+Corpus providers: one interface over the JSON-family corpora and SQLite.
+
+A provider answers the questions the app asks of a translation (list books,
+list chapters, get a chapter, search, count) and is also a read-only
+``{book: {chapter: {verse: text}}}`` Mapping, so it can be handed to code
+that expects a nested mapping (the survey, the bundle writer, the importer's
+compile step).
+
+``JsonProvider`` wraps the nested mappings of the JSON family: a parsed
+dict, a compiled ``.bbin``, a ``.bbz`` bundle or a per-book folder. Its
+search is the in-memory positional index, saved next to the source.
+``SqliteProvider`` reads one translation out of a database built by
+``scripts/build_sqlite.py``: every translation in one file, verses indexed by
+position, and an FTS5 table over the folded text (see textfold) for ranked
+search. The FTS table is contentless, so the text is stored once.
+
+SQLite search is word-based: the last query word may start a longer word
+("let there be li"), but unlike the in-memory index a single word does not
+match inside another one ("light" does not find "delight").
+"""
+from abc import abstractmethod
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from pathlib import Path
+import os
+import sqlite3
+import threading
+
+from corpus import Chapter
+from search_index import build_index, load_or_build_index, text_spans, tokenize
+from store import label_key, verse_span
+from textfold import fold
+
+DB_NAME = "bible.sqlite"
+SCHEMA_VERSION = 1
+
+# doc is provider-specific and only meaningful to the provider that returned it
+Hit = namedtuple("Hit", "doc book chapter verse text score")
+
+
+class CorpusProvider(Mapping):
+    """Read access to one translation."""
+
+    @abstractmethod
+    def books(self):
+        """Book names in reading order."""
+
+    @abstractmethod
+    def chapters(self, book):
+        """Chapter labels of ``book`` in order ([] if unknown)."""
+
+    @abstractmethod
+    def chapter(self, book, chapter):
+        """``{verse: text}`` for one chapter ({} if absent)."""
+
+    @abstractmethod
+    def search(self, query, limit=None):
+        """Hits for ``query``, best first."""
+
+    @abstractmethod
+    def count(self, book=None, chapter=None):
+        """Number of verses in the translation, a book, or a chapter."""
+
+    def chapter_count(self, book):
+        """Number of chapters in ``book``, or None if it can't be known without loading it."""
+        return len(self.chapters(book))
+
+    def chapter_index(self, book):
+        """``[(chapter, verse count), ...]`` without opening ``book``, or None if unknown."""
+        return None
+
+    def search_index(self):
+        """Adapter with the ``search``/``ref``/``match_spans`` surface of SearchIndex."""
+        return ProviderIndex(self)
+
+    # Mapping view
+    def __getitem__(self, book):
+        if book not in self._book_set():
+            raise KeyError(book)
+        return _BookView(self, book)
+
+    def __iter__(self):
+        return iter(self.books())
+
+    def __len__(self):
+        return len(self.books())
+
+    def __contains__(self, book):
+        return book in self._book_set()
+
+    def _book_set(self):
+        return set(self.books())
+
+
+class _BookView(Mapping):
+    def __init__(self, provider, book):
+        self._provider = provider
+        self._book = book
+
+    def __getitem__(self, chapter):
+        chapter = str(chapter)
+        if chapter not in self._provider.chapters(self._book):
+            raise KeyError(chapter)
+        return self._provider.chapter(self._book, chapter)
+
+    def __iter__(self):
+        return iter(self._provider.chapters(self._book))
+
+    def __len__(self):
+        return len(self._provider.chapters(self._book))
+
+
+class ProviderIndex:
+    """A provider's search behind SearchIndex's ``search``/``ref``/``match_spans``.
+
+    The docs ``search`` returns are the hits themselves, so each query's
+    results carry their own text and nothing is shared between searches
+    running (or pages rendering) on different threads.
+    """
+
+    def __init__(self, provider):
+        self._provider = provider
+
+    def search(self, query, limit=None):
+        return self._provider.search(query, limit)
+
+    def ref(self, doc):
+        return doc.book, doc.chapter, doc.verse
+
+    def match_spans(self, doc, query):
+        return text_spans(doc.text, query)
+
+
+# ===============================
+# Nested mappings (JSON, .bbin, bundles, per-book folders)
+# ===============================
+class JsonProvider(CorpusProvider):
+    """A nested mapping behind the provider interface.
+
+    ``source`` is where the mapping was loaded from; the search index is
+    saved next to it (see ``search_index.load_or_build_index``). Without a
+    source it is built in memory.
+    """
+
+    def __init__(self, data, source=None):
+        self.data = data
+        self.source = source
+        self._index = None
+        self._lock = threading.Lock()
+
+    def books(self):
+        return list(self.data.keys())
+
+    def chapters(self, book):
+        if book not in self.data:
+            return []
+        return list(self.data[book].keys())
+
+    def chapter(self, book, chapter):
+        if book not in self.data:
+            return {}
+        return self.data[book].get(str(chapter), {})
+
+    def count(self, book=None, chapter=None):
+        if book is not None and chapter is not None:
+            return len(self.chapter(book, chapter))
+        books = [book] if book is not None else self.books()
+        return sum(len(verses) for b in books if b in self.data for verses in self.data[b].values())
+
+    def chapter_count(self, book):
+        # compiled stores and bundles know it from their index, a book
+        # folder once the book has been parsed
+        counter = getattr(self.data, "chapter_count", None)
+        if counter is not None:
+            return counter(book)
+        return len(self.data.get(book, {}))
+
+    def chapter_index(self, book):
+        index = getattr(self.data, "chapter_index", None)
+        return (index(book) or None) if index is not None else None
+
+    def search_index(self):
+        with self._lock:
+            if self._index is None:
+                if self.source is not None:
+                    self._index = load_or_build_index(self.source, self.data)
+                else:
+                    self._index = build_index(self.data)
+            return self._index
+
+    def search(self, query, limit=None):
+        index = self.search_index()
+        hits = []
+        for doc in index.search(query, limit):
+            book, chapter, verse = index.ref(doc)
+            hits.append(Hit(doc, book, chapter, verse, self.chapter(book, chapter).get(verse), 0.0))
+        return hits
+
+    # the wrapped mapping's own books, not views over them
+    def __getitem__(self, book):
+        return self.data[book]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, book):
+        return book in self.data
+
+    def _book_set(self):
+        return self.data
+
+
+# ===============================
+# SQLite
+# ===============================
+def _num(x):
+    span = verse_span(x)
+    return span[0] if span else 0
+
+
+SCHEMA = """
+CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE translations(id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, source TEXT);
+CREATE TABLE books(
+    id INTEGER PRIMARY KEY,
+    translation INTEGER NOT NULL REFERENCES translations(id),
+    pos INTEGER NOT NULL,
+    canon INTEGER,
+    name TEXT NOT NULL
+);
+CREATE TABLE verses(
+    id INTEGER PRIMARY KEY,
+    book INTEGER NOT NULL REFERENCES books(id),
+    chapter TEXT NOT NULL,
+    verse TEXT NOT NULL,
+    chapter_n INTEGER NOT NULL,
+    verse_n INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE verses_fts USING fts5(folded, content='', tokenize='unicode61 remove_diacritics 2');
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX books_by_translation ON books(translation, pos);
+CREATE INDEX verses_by_chapter ON verses(book, chapter_n, verse_n);
+"""
+
+
+def build_database(translations, out_path, aliases=None, progress=None):
+    """Write ``{name: (source, nested mapping)}`` translations into one SQLite file.
+
+    ``aliases.lookup(book)`` fills the canonical book column when given.
+    ``progress(name, books_done, books_total)`` is called after each book. The
+    database is built under a temp name and renamed into place.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    con = sqlite3.connect(str(tmp))
+    try:
+        con.execute("PRAGMA journal_mode=OFF")
+        con.execute("PRAGMA synchronous=OFF")
+        con.executescript(SCHEMA)
+        con.execute("INSERT INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        vid = 0
+        for name, (source, data) in translations.items():
+            tid = con.execute("INSERT INTO translations(name, source) VALUES (?, ?)", (name, str(source))).lastrowid
+            books = list(data.keys())
+            for pos, book in enumerate(books):
+                canon = aliases.lookup(book) if aliases is not None else None
+                bid = con.execute("INSERT INTO books(translation, pos, canon, name) VALUES (?, ?, ?, ?)",
+                                  (tid, pos, canon, book)).lastrowid
+                rows = []
+                chapters = data[book]
+                for chap in sorted(chapters.keys(), key=label_key):
+                    verses = chapters[chap]
+                    for vnum in sorted(verses.keys(), key=label_key):
+                        vid += 1
+                        rows.append((vid, bid, str(chap), str(vnum), _num(chap), _num(vnum), str(verses[vnum] or "")))
+                con.executemany(
+                    "INSERT INTO verses(id, book, chapter, verse, chapter_n, verse_n, text) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                con.executemany("INSERT INTO verses_fts(rowid, folded) VALUES (?, ?)", ((r[0], fold(r[6])) for r in rows))
+                if progress is not None:
+                    progress(name, pos + 1, len(books))
+            con.commit()
+        con.executescript(INDEXES)
+        con.execute("INSERT INTO verses_fts(verses_fts) VALUES ('optimize')")
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class SqliteSource(namedtuple("SqliteSource", "db name")):
+    """One translation inside a database; ``str()`` gives ``<db>#<name>``."""
+
+    __slots__ = ()
+
+    def exists(self):
+        return Path(self.db).exists()
+
+    def __str__(self):
+        return f"{self.db}#{self.name}"
+
+    @classmethod
+    def parse(cls, text):
+        """The source for a ``str()`` of one, or None if ``text`` isn't one."""
+        db, sep, name = str(text).rpartition("#")
+        if not sep or not db.endswith(".sqlite") or not name:
+            return None
+        return cls(Path(db), name)
+
+
+def _connect(db_path):
+    con = sqlite3.connect(f"file:{Path(db_path).as_posix()}?mode=ro", uri=True, check_same_thread=False)
+    return con
+
+
+def sqlite_translations(db_path):
+    """Translation names stored in a database, in insertion order ([] if unreadable)."""
+    try:
+        con = _connect(db_path)
+        try:
+            return [r[0] for r in con.execute("SELECT name FROM translations ORDER BY id")]
+        finally:
+            con.close()
+    except sqlite3.Error:
+        return []
+
+
+def fts_query(query):
+    """FTS5 MATCH expression for a query: a phrase whose last word is a prefix."""
+    terms = tokenize(query)
+    if not terms:
+        return None
+    return '"' + " ".join(terms) + '"*'
+
+
+class SqliteProvider(CorpusProvider):
+    def __init__(self, db_path, translation, max_cached=16):
+        self.db_path = Path(db_path)
+        self.translation = translation
+        self.max_cached = max_cached
+        self._con = _connect(self.db_path)
+        self._lock = threading.Lock()
+        row = self._con.execute("SELECT id FROM translations WHERE name = ?", (translation,)).fetchone()
+        if row is None:
+            self._con.close()
+            raise KeyError(translation)
+        self._tid = row[0]
+        self._books = OrderedDict(
+            (name, bid) for bid, name in
+            self._con.execute("SELECT id, name FROM books WHERE translation = ? ORDER BY pos", (self._tid,)))
+        self._chapters = {}
+        self._cache = OrderedDict()
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._con.execute(sql, args).fetchall()
+
+    def books(self):
+        return list(self._books)
+
+    def _book_set(self):
+        return self._books
+
+    def chapters(self, book):
+        bid = self._books.get(book)
+        if bid is None:
+            return []
+        labels = self._chapters.get(bid)
+        if labels is None:
+            labels = self._chapters[bid] = [r[0] for r in self._query(
+                "SELECT chapter FROM verses WHERE book = ? GROUP BY chapter_n, chapter ORDER BY chapter_n, chapter", (bid,))]
+        return labels
+
+    def chapter(self, book, chapter):
+        bid = self._books.get(book)
+        if bid is None:
+            return {}
+        key = (bid, str(chapter))
+        with self._lock:
+            verses = self._cache.get(key)
+            if verses is not None:
+                self._cache.move_to_end(key)
+                return verses
+        rows = self._query(
+            "SELECT verse, text FROM verses WHERE book = ? AND chapter_n = ? AND chapter = ? ORDER BY verse_n, verse",
+            (bid, _num(chapter), str(chapter)))
+        verses = Chapter([r[0] for r in rows], [r[1] for r in rows])
+        with self._lock:
+            self._cache[key] = verses
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return verses
+
+    def count(self, book=None, chapter=None):
+        if book is None:
+            return self._query("SELECT count(*) FROM verses v JOIN books b ON b.id = v.book WHERE b.translation = ?",
+                               (self._tid,))[0][0]
+        bid = self._books.get(book)
+        if bid is None:
+            return 0
+        if chapter is None:
+            return self._query("SELECT count(*) FROM verses WHERE book = ?", (bid,))[0][0]
+        return self._query("SELECT count(*) FROM verses WHERE book = ? AND chapter_n = ? AND chapter = ?",
+                           (bid, _num(chapter), str(chapter)))[0][0]
+
+    def search(self, query, limit=None):
+        match = fts_query(query)
+        if match is None:
+            return []
+        sql = ("SELECT v.id, b.name, v.chapter, v.verse, v.text, bm25(verses_fts) AS score "
+               "FROM verses_fts JOIN verses v ON v.id = verses_fts.rowid JOIN books b ON b.id = v.book "
+               "WHERE verses_fts MATCH ? AND b.translation = ? ORDER BY score")
+        args = [match, self._tid]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        try:
+            rows = self._query(sql, args)
+        except sqlite3.OperationalError:
+            return []
+        return [Hit(*r) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._con.close()
@@ -0,0 +1,171 @@
+"""
+Scripture reference parsing ("Jn 3:16", "Yohane 3:16", "Rom 8:28-39", "Gen 1-3").
+
+Book names resolve through an alias table mapping folded, space-free names to
+a canonical book position (0-65). The table is built once from the canonical
+English and Twi order lists plus the common abbreviations below, and every
+unambiguous prefix of at least three characters is accepted as well, so a
+lookup is one regex match and one dict probe.
+"""
+from collections import namedtuple
+import re
+
+from store import verse_span
+from textfold import fold
+
+# common abbreviations and alternate names, keyed by canonical English name
+ABBREVIATIONS = {
+    "Genesis": ["gen", "ge", "gn", "1 mose"],
+    "Exodus": ["ex", "exo", "exod", "2 mose"],
+    "Leviticus": ["lev", "le", "lv", "3 mose"],
+    "Numbers": ["num", "nu", "nm", "nb", "4 mose"],
+    "Deuteronomy": ["deut", "de", "dt", "5 mose"],
+    "Joshua": ["josh", "jos", "jsh"],
+    "Judges": ["judg", "jdg", "jg", "jdgs"],
+    "Ruth": ["rth", "ru"],
+    "1 Samuel": ["1 sam", "1 sa", "1 sm", "i samuel", "i sam"],
+    "2 Samuel": ["2 sam", "2 sa", "2 sm", "ii samuel", "ii sam"],
+    "1 Kings": ["1 kgs", "1 ki", "1 kg", "i kings", "1 ahemfo"],
+    "2 Kings": ["2 kgs", "2 ki", "2 kg", "ii kings", "2 ahemfo"],
+    "1 Chronicles": ["1 chr", "1 chron", "1 ch", "i chronicles"],
+    "2 Chronicles": ["2 chr", "2 chron", "2 ch", "ii chronicles"],
+    "Ezra": ["ezr", "ez", "ɛsra"],
+    "Nehemiah": ["neh", "ne"],
+    "Esther": ["est", "esth", "es", "ɛster"],
+    "Job": ["jb"],
+    "Psalms": ["ps", "psa", "psm", "pss", "psalm"],
+    "Proverbs": ["prov", "pro", "prv", "pr", "mmebusɛm"],
+    "Ecclesiastes": ["eccl", "eccles", "ecc", "ec", "qoh"],
+    "Song of Solomon": ["song", "sos", "so", "song of songs", "canticles", "cant"],
+    "Isaiah": ["isa", "is"],
+    "Jeremiah": ["jer", "je", "jr"],
+    "Lamentations": ["lam", "la"],
+    "Ezekiel": ["ezek", "eze", "ezk"],
+    "Daniel": ["dan", "da", "dn"],
+    "Hosea": ["hos", "ho"],
+    "Joel": ["jl", "yoɛl"],
+    "Amos": ["am"],
+    "Obadiah": ["obad", "ob"],
+    "Jonah": ["jon", "jnh"],
+    "Micah": ["mic", "mc"],
+    "Nahum": ["nah", "na"],
+    "Habakkuk": ["hab", "hb"],
+    "Zephaniah": ["zeph", "zep", "zp"],
+    "Haggai": ["hag", "hg"],
+    "Zechariah": ["zech", "zec", "zc"],
+    "Malachi": ["mal", "ml"],
+    "Matthew": ["matt", "mt", "mat"],
+    "Mark": ["mrk", "mk", "mr"],
+    "Luke": ["luk", "lk"],
+    "John": ["jn", "jhn", "joh"],
+    "Acts": ["ac", "act"],
+    "Romans": ["rom", "ro", "rm"],
+    "1 Corinthians": ["1 cor", "1 co", "i corinthians", "i cor"],
+    "2 Corinthians": ["2 cor", "2 co", "ii corinthians", "ii cor"],
+    "Galatians": ["gal", "ga"],
+    "Ephesians": ["eph", "ephes"],
+    "Philippians": ["phil", "php", "pp"],
+    "Colossians": ["col", "co"],
+    "1 Thessalonians": ["1 thess", "1 thes", "1 th", "i thessalonians"],
+    "2 Thessalonians": ["2 thess", "2 thes", "2 th", "ii thessalonians"],
+    "1 Timothy": ["1 tim", "1 ti", "i timothy"],
+    "2 Timothy": ["2 tim", "2 ti", "ii timothy"],
+    "Titus": ["tit", "ti"],
+    "Philemon": ["philem", "phm", "phlm"],
+    "Hebrews": ["heb"],
+    "James": ["jas", "jm"],
+    "1 Peter": ["1 pet", "1 pe", "1 pt", "i peter"],
+    "2 Peter": ["2 pet", "2 pe", "2 pt", "ii peter"],
+    "1 John": ["1 jn", "1 jhn", "1 jo", "i john"],
+    "2 John": ["2 jn", "2 jhn", "2 jo", "ii john"],
+    "3 John": ["3 jn", "3 jhn", "3 jo", "iii john"],
+    "Jude": ["jud", "jd"],
+    "Revelation": ["rev", "re", "rv", "revelations", "apocalypse"],
+}
+
+# a chapter, optionally :verse, optionally -[chapter:]verse or -chapter
+_REF_RE = re.compile(
+    r"^(?P<book>.*?[^\W\d_].*?)\s*"
+    r"(?P<c1>\d+)(?:\s*[:.]\s*(?P<v1>\d+))?"
+    r"(?:\s*[-–—]\s*(?:(?P<c2>\d+)\s*[:.]\s*)?(?P<v2>\d+))?\s*$"
+)
+
+# book, (chapter, verse|None), (chapter, verse|None)
+Reference = namedtuple("Reference", "book start end")
+
+
+def _key(name):
+    return "".join(fold(name).split())
+
+
+class BookAliases:
+    """Alias -> canonical book position (0-65) table."""
+
+    def __init__(self, orders, abbreviations=ABBREVIATIONS, min_prefix=3):
+        """``orders`` are lists of book names in canonical order; the first is English."""
+        self.names = list(orders[0])
+        exact = {}
+        for order in orders:
+            for pos, name in enumerate(order):
+                exact.setdefault(_key(name), pos)
+        english = {name: pos for pos, name in enumerate(self.names)}
+        for name, extras in abbreviations.items():
+            pos = english.get(name)
+            if pos is None:
+                continue
+            for alias in extras:
+                exact.setdefault(_key(alias), pos)
+        # unambiguous prefixes of the full names
+        owners = {}
+        for order in orders:
+            for pos, name in enumerate(order):
+                k = _key(name)
+                for n in range(min_prefix, len(k)):
+                    owners.setdefault(k[:n], set()).add(pos)
+        self._aliases = {p: next(iter(s)) for p, s in owners.items() if len(s) == 1}
+        self._aliases.update(exact)
+
+    def lookup(self, name):
+        """Canonical position for a book name or abbreviation, or None."""
+        return self._aliases.get(_key(name))
+
+    def parse(self, query):
+        """Parse ``query`` as a reference or range; None if it isn't one."""
+        m = _REF_RE.match(str(query).strip())
+        if not m:
+            return None
+        pos = self.lookup(m.group("book").rstrip(" .,"))
+        if pos is None:
+            return None
+        c1 = int(m.group("c1"))
+        v1 = int(m.group("v1")) if m.group("v1") else None
+        c2, v2 = m.group("c2"), m.group("v2")
+        if v2 is None:
+            end = (c1, v1)
+        elif c2 is not None:
+            end = (int(c2), int(v2))
+        elif v1 is None:
+            # "Gen 1-3" is a chapter range
+            end = (int(v2), None)
+        else:
+            end = (c1, int(v2))
+        return Reference(pos, (c1, v1), end)
+
+
+def resolve(ref, chapters):
+    """``(chapter, verse)`` keys of ``chapters`` (one book's mapping) covered by ``ref``."""
+    (c1, v1), (c2, v2) = ref.start, ref.end
+    out = []
+    for chap in sorted((k for k in chapters.keys() if str(k).isdigit()), key=int):
+        c = int(chap)
+        if c < c1 or c > c2:
+            continue
+        # a range label ("3-4") is covered if any of its verses is
+        spans = ((k, verse_span(k)) for k in chapters[chap].keys())
+        for verse, (first, last) in sorted(((k, s) for k, s in spans if s), key=lambda kv: kv[1]):
+            if c == c1 and v1 is not None and last < v1:
+                continue
+            if c == c2 and v2 is not None and first > v2:
+                continue
+            out.append((chap, verse))
+    return out
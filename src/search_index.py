@@ -0,0 +1,347 @@
+"""
+Persistent positional inverted index used by the search view.
+
+Each verse of a translation gets a document id (its position in reading
+order). For every token the index stores the documents it occurs in together
+with the token positions, packed into ``array`` bytes (16-bit when the
+translation has fewer than 65536 verses):
+
+    doc, n, pos_1 .. pos_n, doc, n, ...
+
+Queries behave like the substring test the search view used to do: a single
+word matches inside longer tokens, and in a multi-word query the first word may
+end a token and the last may start one ("t there be li" finds "let there be
+light"). Verses and queries are compared in folded form, so "onyankopon"
+finds "Onyankopɔn"; the folded copy of every verse is stored in the index and
+used to place highlights without re-lowering text per query. The index is
+pickled next to the data files and rebuilt only when the source files change;
+a small header pickled ahead of it lets ``index_is_current`` check that
+without loading the index.
+"""
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+import os
+import pickle
+import re
+
+from store import label_key
+from textfold import fold, fold_with_offsets, map_span
+
+INDEX_VERSION = 3
+INDEX_SUFFIX = ".idx"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Tokens of ``text`` after folding (see textfold)."""
+    return _TOKEN_RE.findall(fold(text))
+
+
+def index_path_for(source):
+    source = Path(source)
+    if source.is_dir():
+        return source.parent / (source.name + INDEX_SUFFIX)
+    return source.with_suffix(INDEX_SUFFIX)
+
+
+def source_fingerprint(source):
+    """Names, sizes and mtimes of the files a translation is read from."""
+    source = Path(source)
+    files = sorted(source.glob("*.json")) if source.is_dir() else [source]
+    out = []
+    for p in files:
+        try:
+            st = p.stat()
+            out.append((p.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    return out
+
+
+def _folded_spans(folded, terms):
+    """Spans of ``terms`` in folded text, with the same word rules as ``match_terms``."""
+    toks = [(m.group(), m.start(), m.end()) for m in _TOKEN_RE.finditer(folded)]
+    spans = []
+    n = len(terms)
+    for i, (tok, start, end) in enumerate(toks):
+        if n == 1:
+            pos = tok.find(terms[0])
+            while pos != -1:
+                spans.append((start + pos, start + pos + len(terms[0])))
+                pos = tok.find(terms[0], pos + 1)
+            continue
+        if i + n > len(toks) or not tok.endswith(terms[0]):
+            continue
+        run = toks[i:i + n]
+        if all(run[k][0] == terms[k] for k in range(1, n - 1)) and run[-1][0].startswith(terms[-1]):
+            spans.append((end - len(terms[0]), run[-1][1] + len(terms[-1])))
+    return spans
+
+
+def text_spans(text, query):
+    """``[start, end)`` spans of ``query`` in ``text`` (folded on the fly)."""
+    terms = tokenize(query)
+    if not terms:
+        return []
+    folded, offsets = fold_with_offsets(text)
+    return [map_span(offsets, a, b) for a, b in _folded_spans(folded, terms)]
+
+
+class SearchIndex:
+    def __init__(self, books, chapters, verses, book_ranges, postings, fingerprint=None, typecode="I",
+                 folded=None, offsets=None):
+        # refs are kept as three parallel lists; doc id is the list index
+        self.books = books
+        self.chapters = chapters
+        self.verses = verses
+        self.folded = folded or []  # folded text per doc
+        self.offsets = offsets or {}  # doc -> packed folded->original map, only where not 1:1
+        self.book_ranges = book_ranges  # book -> (first doc, end doc)
+        self.postings = postings  # token -> packed bytes
+        self.typecode = typecode
+        self.fingerprint = fingerprint
+        self._vocab = sorted(postings)
+        self._ref_lookup = None
+
+    def __len__(self):
+        return len(self.verses)
+
+    def ref(self, doc):
+        return self.books[doc], self.chapters[doc], self.verses[doc]
+
+    # ---------- postings ----------
+    def _decode(self, token):
+        """{doc: positions} for one token."""
+        raw = self.postings.get(token)
+        out = {}
+        if not raw:
+            return out
+        arr = array(self.typecode)
+        arr.frombytes(raw)
+        i = 0
+        n = len(arr)
+        while i < n:
+            doc, count = arr[i], arr[i + 1]
+            out[doc] = arr[i + 2:i + 2 + count]
+            i += 2 + count
+        return out
+
+    def _expand(self, term, mode):
+        """Vocabulary tokens matching ``term``: exact, prefix, suffix or contains."""
+        if mode == "exact":
+            return [term] if term in self.postings else []
+        if mode == "prefix":
+            i = bisect_left(self._vocab, term)
+            found = []
+            while i < len(self._vocab) and self._vocab[i].startswith(term):
+                found.append(self._vocab[i])
+                i += 1
+            return found
+        if mode == "suffix":
+            return [t for t in self._vocab if t.endswith(term)]
+        return [t for t in self._vocab if term in t]
+
+    def _term_positions(self, term, mode):
+        merged = {}
+        for tok in self._expand(term, mode):
+            for doc, positions in self._decode(tok).items():
+                merged.setdefault(doc, set()).update(positions)
+        return merged
+
+    def match_terms(self, terms):
+        """Documents whose text contains ``terms`` as a run of words.
+
+        Matches what a substring test on the verse would: the first word may
+        end a longer token, the last may start one, words in between are exact.
+        """
+        if not terms:
+            return []
+        if len(terms) == 1:
+            docs = set()
+            for tok in self._expand(terms[0], "contains"):
+                docs.update(self._decode(tok))
+            return sorted(docs)
+        modes = ["suffix"] + ["exact"] * (len(terms) - 2) + ["prefix"]
+        per_term = [self._term_positions(t, m) for t, m in zip(terms, modes)]
+        if any(not p for p in per_term):
+            return []
+        docs = set(min(per_term, key=len))
+        for p in per_term:
+            docs &= p.keys()
+        hits = []
+        for doc in docs:
+            later = [p[doc] for p in per_term[1:]]
+            for start in per_term[0][doc]:
+                if all((start + k + 1) in s for k, s in enumerate(later)):
+                    hits.append(doc)
+                    break
+        return sorted(hits)
+
+    def match_spans(self, doc, query):
+        """``[start, end)`` spans of ``query`` in the original text of ``doc``."""
+        terms = tokenize(query)
+        if not terms or doc >= len(self.folded):
+            return []
+        spans = _folded_spans(self.folded[doc], terms)
+        raw = self.offsets.get(doc)
+        offsets = None
+        if raw is not None:
+            offsets = array("I")
+            offsets.frombytes(raw)
+        return [map_span(offsets, a, b) for a, b in spans]
+
+    # ---------- references / book names ----------
+    def _refs(self):
+        if self._ref_lookup is None:
+            lookup = {}
+            names = {b: " ".join(fold(b).split()) for b in self.book_ranges}
+            for doc, (b, c, v) in enumerate(zip(self.books, self.chapters, self.verses)):
+                # keys are folded like queries, so "C:V" becomes "C V"
+                b = names[b]
+                lookup[f"{b} {c} {v}"] = (doc, doc + 1)
+                first, _ = lookup.get(f"{b} {c}", (doc, doc))
+                lookup[f"{b} {c}"] = (first, doc + 1)
+            self._ref_lookup = lookup
+        return self._ref_lookup
+
+    def search(self, query, limit=None):
+        """Doc ids matching ``query`` in reading order.
+
+        Mirrors the old scan: an exact "Book C:V" / "Book C" reference, every
+        verse of a book whose name contains the query, and verses whose text
+        contains the query.
+        """
+        qfold = " ".join(fold(query).split())
+        if not qfold:
+            return []
+        ref = self._refs().get(qfold)
+        if ref is not None:
+            docs = list(range(*ref))
+        else:
+            docs = set(self.match_terms(tokenize(qfold)))
+            for book, (first, end) in self.book_ranges.items():
+                if qfold in " ".join(fold(book).split()):
+                    docs.update(range(first, end))
+            docs = sorted(docs)
+        return docs[:limit] if limit is not None else docs
+
+    # ---------- persistence ----------
+    def save(self, path):
+        path = Path(path)
+        # per process: a search-all build worker and the app may save the same index
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        header = {"version": INDEX_VERSION, "fingerprint": self.fingerprint}
+        payload = {
+            "books": self.books,
+            "chapters": self.chapters,
+            "verses": self.verses,
+            "book_ranges": self.book_ranges,
+            "postings": self.postings,
+            "typecode": self.typecode,
+            "folded": self.folded,
+            "offsets": self.offsets,
+        }
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _header(f, path):
+        header = pickle.load(f)
+        if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path} has an unsupported index version")
+        return header
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = cls._header(f, path)
+            payload = pickle.load(f)
+        return cls(payload["books"], payload["chapters"], payload["verses"],
+                   payload["book_ranges"], payload["postings"], header.get("fingerprint"), payload.get("typecode", "I"),
+                   payload.get("folded"), payload.get("offsets"))
+
+    @classmethod
+    def saved_fingerprint(cls, path):
+        """The fingerprint a saved index was built for, read from its header only."""
+        with open(path, "rb") as f:
+            return cls._header(f, path).get("fingerprint")
+
+
+def build_index(data, fingerprint=None):
+    """Build a SearchIndex over a nested ``{book: {chapter: {verse: text}}}`` mapping."""
+    books, chapters, verses = [], [], []
+    book_ranges = {}
+    folded = []
+    offsets = {}
+    raw = {}
+    doc = 0
+    for book in list(data.keys()):
+        chaps = data[book]
+        first = doc
+        for chap in sorted(chaps.keys(), key=label_key):
+            vs = chaps[chap]
+            for vnum in sorted(vs.keys(), key=label_key):
+                text, verse_offsets = fold_with_offsets(vs[vnum] or "")
+                folded.append(text)
+                if verse_offsets is not None:
+                    offsets[doc] = array("I", verse_offsets).tobytes()
+                for pos, tok in enumerate(_TOKEN_RE.findall(text)):
+                    entry = raw.get(tok)
+                    if entry is None:
+                        entry = raw[tok] = {}
+                    entry.setdefault(doc, []).append(pos)
+                books.append(book)
+                chapters.append(str(chap))
+                verses.append(str(vnum))
+                doc += 1
+        book_ranges[book] = (first, doc)
+    # 16-bit entries are enough for a single Bible (~31k verses)
+    typecode = "H" if doc < 0x10000 else "I"
+    postings = {}
+    for tok, docs in raw.items():
+        arr = array(typecode)
+        for d, positions in docs.items():
+            arr.append(d)
+            arr.append(len(positions))
+            arr.extend(positions)
+        postings[tok] = arr.tobytes()
+    return SearchIndex(books, chapters, verses, book_ranges, postings, fingerprint, typecode, folded, offsets)
+
+
+def index_is_current(source):
+    """Whether ``source`` has a saved index matching its files (nothing to build)."""
+    path = index_path_for(source)
+    try:
+        return path.exists() and SearchIndex.saved_fingerprint(path) == source_fingerprint(source)
+    except Exception:
+        return False
+
+
+def load_or_build_index(source, data):
+    """Return the saved index for ``source`` if it is current, else rebuild and save it."""
+    path = index_path_for(source)
+    fingerprint = source_fingerprint(source)
+    if path.exists():
+        try:
+            index = SearchIndex.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except Exception:
+            pass
+    index = build_index(data, fingerprint)
+    try:
+        index.save(path)
+    except OSError:
+        pass
+    return index
@@ -0,0 +1,196 @@
+"""
+Translation sources: where the data folder is, which translations it holds
+and how each kind of source is opened.
+
+The app (``main.py``) and the scripts share these, so the scripts can list and
+load translations without importing the UI. ``list_translations`` maps a name
+to a source: a ``*_bible.json`` (memory-mapped through a compiled ``.bbin``
+built next to it), a compiled-only ``.bbin``, a packaged ``.bbz`` bundle, a
+per-book folder or a ``SqliteSource``; ``load_data`` opens any of them as a
+corpus provider.
+"""
+import json
+from pathlib import Path
+import sys
+
+from corpus import (BUNDLE_SUFFIX, COMPILED_SUFFIX, BookFolderCorpus, ensure_compiled, freeze, open_bundle,
+                    open_compiled)
+from ingest import is_list_format, iter_list_entries
+from providers import DB_NAME, JsonProvider, SqliteProvider, SqliteSource, sqlite_translations
+from references import BookAliases
+from search_index import index_is_current
+import tracing
+
+# ===============================
+# File paths - works both on desktop and in APK
+# ===============================
+@tracing.traced()
+def resolve_data_folder():
+    candidates = [
+        Path(sys.executable).parent / "data",
+        Path(__file__).resolve().parent.parent / "data",
+        Path(__file__).resolve().parent / "data",
+        Path.cwd() / "data",
+    ]
+    for c in candidates:
+        try:
+            if c.exists():
+                tracing.annotate(folder=str(c))
+                return c
+        except Exception:
+            pass
+    default = candidates[1]
+    try:
+        default.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    return default
+
+DATA_FOLDER = resolve_data_folder()
+DEFAULT_DATA_FILE = DATA_FOLDER / "sample_bible.json"
+
+# ===============================
+# Loading
+# ===============================
+def load_json_corpus(path: Path):
+    # support list-of-objects format, streamed so the array is never held whole
+    if is_list_format(path):
+        new_data = {}
+        for book, chapter, verse, text in iter_list_entries(path):
+            new_data.setdefault(book, {}).setdefault(chapter, {})[verse] = text
+        return freeze(new_data)
+    with open(path, "r", encoding="utf-8") as f:
+        return freeze(json.load(f))
+
+@tracing.traced()
+def load_data(path: Path = None):
+    """The translation at ``path`` as a corpus provider (see providers)."""
+    path = path or DEFAULT_DATA_FILE
+    tracing.annotate(source=path.name)
+    if isinstance(path, SqliteSource):
+        return SqliteProvider(path.db, path.name)
+    data = open_mapping(path)
+    # the search index is saved next to the source, so only one that exists
+    return JsonProvider(data, path if data else None)
+
+def open_mapping(path: Path):
+    """The nested mapping of a JSON-family source ({} if it is missing)."""
+    if path.is_dir():
+        # one JSON file per book, parsed on first access
+        return BookFolderCorpus(path, order=OT_ORDER + NT_ORDER)
+    if path.suffix == COMPILED_SUFFIX:
+        return open_compiled(path) if path.exists() else {}
+    if path.suffix == BUNDLE_SUFFIX:
+        return open_bundle(path) if path.exists() else {}
+    if not path.exists():
+        return {}
+    # memory-map a compiled copy next to the JSON (built on first use)
+    try:
+        return ensure_compiled(path, load_json_corpus, iter_list_entries if is_list_format(path) else None)
+    except Exception:
+        return load_json_corpus(path)
+
+def source_from_string(text):
+    """Inverse of ``str(source)`` for the values list_translations returns."""
+    return SqliteSource.parse(text) or Path(text)
+
+@tracing.traced()
+def list_translations(sqlite=False, folder=None):
+    """Translation name -> source under ``folder`` (default ``DATA_FOLDER``);
+    with ``sqlite`` those in the database win."""
+    folder = Path(folder) if folder is not None else DATA_FOLDER
+    translations = {}
+    try:
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    try:
+        for p in folder.glob("*.json"):
+            if p.stem.startswith("trace-"):
+                continue
+            if p.stem not in ("bible_bookmarks", "bible_settings", "bible_resume", "sample_bible", "assets_manifest", "corpus_manifest"):
+                name = p.stem
+                if name.endswith("_bible"):
+                    name = name[:-6]
+                translations[name] = p
+            elif p.stem == "sample_bible":
+                translations[p.stem] = p
+    except Exception:
+        pass
+    # compatibility: nested *_bible.json
+    try:
+        for sub in folder.iterdir():
+            if sub.is_dir():
+                for p in sub.glob("*_bible.json"):
+                    name = p.stem
+                    if name.endswith("_bible"):
+                        name = name[:-6]
+                    translations[name] = p
+                # compiled-only translations (no JSON shipped)
+                for p in sub.glob(f"*_bible{COMPILED_SUFFIX}"):
+                    name = p.stem[:-6]
+                    translations.setdefault(name, p)
+                # packaged builds: compressed bundles (scripts/prepare_assets.py)
+                for p in sub.glob(f"*_bible{BUNDLE_SUFFIX}"):
+                    name = p.stem[:-6]
+                    translations.setdefault(name, p)
+                # per-book folders: data/KJV/KJV_books/*.json
+                for p in sub.glob("*_books"):
+                    if p.is_dir():
+                        translations.setdefault(p.name[:-6], p)
+    except Exception:
+        pass
+    db = folder / DB_NAME
+    if sqlite and db.exists():
+        for name in sqlite_translations(db):
+            translations[name] = SqliteSource(db, name)
+    tracing.annotate(count=len(translations))
+    return translations
+
+# ===============================
+# Search indexes
+# ===============================
+def needs_index_build(source):
+    """Whether opening ``source``'s search index means building it: a JSON-family
+    source without a current saved index (SQLite has its FTS table)."""
+    if isinstance(source, SqliteSource):
+        return False
+    return Path(source).exists() and not index_is_current(source)
+
+def build_search_index(source):
+    """Process-pool worker: build and save ``source``'s search index."""
+    load_data(source).search_index()
+    return str(source)
+
+# ===============================
+# Canonical orders (exact names)
+# ===============================
+OT_ORDER = [
+    'Genesis','Exodus','Leviticus','Numbers','Deuteronomy','Joshua','Judges','Ruth',
+    '1 Samuel','2 Samuel','1 Kings','2 Kings','1 Chronicles','2 Chronicles','Ezra','Nehemiah','Esther',
+    'Job','Psalms','Proverbs','Ecclesiastes','Song of Solomon','Isaiah','Jeremiah','Lamentations',
+    'Ezekiel','Daniel','Hosea','Joel','Amos','Obadiah','Jonah','Micah','Nahum','Habakkuk','Zephaniah','Haggai','Zechariah','Malachi'
+]
+
+NT_ORDER = [
+    'Matthew','Mark','Luke','John','Acts','Romans','1 Corinthians','2 Corinthians','Galatians','Ephesians',
+    'Philippians','Colossians','1 Thessalonians','2 Thessalonians','1 Timothy','2 Timothy','Titus','Philemon','Hebrews',
+    'James','1 Peter','2 Peter','1 John','2 John','3 John','Jude','Revelation'
+]
+
+TWI_OT_ORDER = [
+    'Genesis','Exodus','Lewifo','Numeri','Deuteronomium','Yosua','Atemmufo','Rut',
+    '1 Samuel','2 Samuel','1 Ahene','2 Ahene','1 Beresosɛm','2 Beresosɛm','Esra','Nehemia','Ester',
+    'Hiob','Nnwom','Mmbeusɛm','Ɔsɛnkafo','Nnwom Mu Dwom','Yesaia','Yeremia','Kwadwom',
+    'Hesekiel','Daniel','Hosea','Yoel','Amos','Obadia','Yona','Mika','Nahum','Habakuk','Sefania','Hagai','Sakaria','Malaki'
+]
+
+TWI_NT_ORDER = [
+    'Mateo','Marko','Luka','Yohane','Asomafo','Romafo','1 Korintofo','2 Korintofo','Galatifo','Efesofo',
+    'Filipifo','Kolosefo','1 Tesalonikafo','2 Tesalonikafo','1 Timoteo','2 Timoteo','Tito','Filemon','Hebrifo',
+    'Yakobo','1 Petro','2 Petro','1 Yohane','2 Yohane','3 Yohane','Yuda','Adiyisɛm'
+]
+
+# "Jn", "Yohane", "Psalm", "1 Cor", ... -> canonical book position (see store.BOOK_IDS)
+BOOK_ALIASES = BookAliases([OT_ORDER + NT_ORDER, TWI_OT_ORDER + TWI_NT_ORDER])
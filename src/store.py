@@ -0,0 +1,183 @@
+"""
+Canonical verse IDs and the shared multi-translation store.
+
+Every translation names its books differently ("Psalm" in the KJV files,
+"Psalms" in OT_ORDER, "Nnwom" in TWI). Books are identified here by their
+canonical position 0-65 (OSIS codes in BOOK_IDS), and a verse by a packed
+integer ``book * 1_000_000 + chapter * 1000 + verse`` that sorts in reading
+order. The store opens each translation once, precomputes its native-name <->
+book-id maps, and serves text by ID, so switching translation only changes
+which column is read.
+"""
+from collections import OrderedDict
+import threading
+
+BOOK_IDS = [
+    "GEN", "EXO", "LEV", "NUM", "DEU", "JOS", "JDG", "RUT", "1SA", "2SA", "1KI", "2KI",
+    "1CH", "2CH", "EZR", "NEH", "EST", "JOB", "PSA", "PRO", "ECC", "SNG", "ISA", "JER",
+    "LAM", "EZK", "DAN", "HOS", "JOL", "AMO", "OBA", "JON", "MIC", "NAM", "HAB", "ZEP",
+    "HAG", "ZEC", "MAL",
+    "MAT", "MRK", "LUK", "JHN", "ACT", "ROM", "1CO", "2CO", "GAL", "EPH", "PHP", "COL",
+    "1TH", "2TH", "1TI", "2TI", "TIT", "PHM", "HEB", "JAS", "1PE", "2PE", "1JN", "2JN",
+    "3JN", "JUD", "REV",
+]
+
+
+def verse_span(label):
+    """Verse numbers a label covers: ``"3"`` -> (3, 3), a range ``"3-4"`` ->
+    (3, 4) (USFM ``\\v 3-4``, OSIS ``osisID`` lists), anything else None."""
+    first, sep, last = str(label).partition("-")
+    if first.isdigit() and (not sep or last.isdigit()):
+        a, b = int(first), int(last or first)
+        return (a, b) if a <= b else None
+    return None
+
+
+def label_key(label):
+    """Reading-order sort key for chapter and verse labels; a range sorts at its first verse."""
+    span = verse_span(label)
+    return (0, span[0], span[1], "") if span else (1, 0, 0, str(label))
+
+
+def _num(x):
+    # a range is addressed by its first verse
+    span = verse_span(x)
+    return span[0] if span else 0
+
+
+def verse_id(book, chapter, verse=0):
+    """Pack a canonical book position, chapter and verse into one sortable int."""
+    return book * 1_000_000 + _num(chapter) * 1000 + _num(verse)
+
+
+def split_verse_id(vid):
+    return vid // 1_000_000, (vid // 1000) % 1000, vid % 1000
+
+
+class CorpusStore:
+    """Translations opened once and addressed by canonical IDs.
+
+    ``loader(path)`` returns a translation's corpus provider (the app's
+    ``load_data``, see providers); ``aliases`` resolves a native book name
+    to its canonical position (``references.BookAliases``).
+    """
+
+    def __init__(self, translations, loader, aliases):
+        self.translations = translations
+        self._loader = loader
+        self._aliases = aliases
+        self._columns = {}
+        self._book_ids = {}  # translation -> {native name: book id}
+        self._book_names = {}  # translation -> {book id: native name}
+        self._extra = {}  # books outside the 66, numbered from 66 up by name
+        self._aligned = OrderedDict()  # (names, book id, chapter) -> (verses, columns)
+        self._loading = {}  # translation -> lock held while it is opened
+        self._generation = {}  # translation -> times dropped
+        self._lock = threading.Lock()
+
+    def column(self, name):
+        """The translation's provider (opened on first use).
+
+        Opening can mean a full parse or a compile, so it runs outside the
+        store lock, behind a per-translation one: other translations stay
+        readable meanwhile and two callers never open the same one twice.
+        """
+        with self._lock:
+            data = self._columns.get(name)
+            if data is not None:
+                return data
+            loading = self._loading.setdefault(name, threading.Lock())
+        with loading:
+            with self._lock:
+                data = self._columns.get(name)
+                if data is not None:
+                    return data
+                generation = self._generation.get(name, 0)
+            data = self._loader(self.translations[name])
+            with self._lock:
+                if self._generation.get(name, 0) != generation:
+                    # dropped while loading: serve this caller, don't publish
+                    return data
+                ids = {}
+                for book in data.books():
+                    pos = self._aliases.lookup(book)
+                    if pos is None:
+                        pos = self._extra.setdefault(book, len(BOOK_IDS) + len(self._extra))
+                    ids[book] = pos
+                self._book_ids[name] = ids
+                names = {}
+                for book, pos in ids.items():
+                    names.setdefault(pos, book)
+                self._book_names[name] = names
+                self._columns[name] = data
+            return data
+
+    def drop(self, name):
+        """Forget a translation (its source changed)."""
+        with self._lock:
+            self._generation[name] = self._generation.get(name, 0) + 1
+            self._columns.pop(name, None)
+            self._book_ids.pop(name, None)
+            self._book_names.pop(name, None)
+            self._aligned = OrderedDict((k, v) for k, v in self._aligned.items() if name not in k[0])
+
+    def book_id(self, name, book):
+        self.column(name)
+        return self._book_ids[name].get(book)
+
+    def book_name(self, name, book_id):
+        self.column(name)
+        return self._book_names[name].get(book_id)
+
+    def verse_id(self, name, book, chapter, verse=0):
+        pos = self.book_id(name, book)
+        return verse_id(pos, chapter, verse) if pos is not None else None
+
+    def locate(self, name, vid):
+        """``(book, chapter, verse)`` in ``name``'s own naming for a verse ID."""
+        pos, chapter, verse = split_verse_id(vid)
+        book = self.book_name(name, pos)
+        return (book, str(chapter), str(verse)) if book is not None else None
+
+    def chapter(self, name, book_id, chapter):
+        """Verses of a chapter in one translation, or {} if it lacks it."""
+        book = self.book_name(name, book_id)
+        if book is None:
+            return {}
+        return self.column(name).chapter(book, chapter)
+
+    def text(self, name, vid):
+        loc = self.locate(name, vid)
+        if loc is None:
+            return None
+        book, chapter, verse = loc
+        return self.column(name).chapter(book, chapter).get(verse)
+
+    def aligned_chapter(self, names, book_id, chapter):
+        """One chapter of several translations aligned verse by verse.
+
+        Returns ``(verses, columns)``: the union of verse numbers in reading
+        order and, per translation, a list of texts with None where that
+        translation has no such verse. Recent results are cached.
+        """
+        key = (tuple(names), book_id, str(chapter))
+        with self._lock:
+            cached = self._aligned.get(key)
+            if cached is not None:
+                self._aligned.move_to_end(key)
+                return cached
+        chapters = [self.chapter(name, book_id, chapter) for name in names]
+        # chapters iterate in reading order; only a translation with extra
+        # verses forces a merge
+        verses = list(max(chapters, key=len).keys()) if chapters else []
+        seen = set(verses)
+        extra = [v for ch in chapters for v in ch.keys() if v not in seen]
+        if extra:
+            verses = sorted(seen.union(extra), key=label_key)
+        columns = [[ch.get(v) for v in verses] for ch in chapters]
+        result = (verses, columns)
+        with self._lock:
+            self._aligned[key] = result
+            while len(self._aligned) > 16:
+                self._aligned.popitem(last=False)
+        return result
@@ -0,0 +1,63 @@
+"""
+Search folding for Twi and English text.
+
+``fold`` maps text to a comparison form: diacritics removed, casefolded,
+ɛ -> e, ɔ -> o, and punctuation/symbols turned into spaces. It works one
+source character at a time, so for nearly every verse the folded copy has the
+same length as the original and character ``i`` of one is character ``i`` of
+the other. Where that isn't true (a decomposed accent, a casefold expansion
+like ß -> ss), ``fold_with_offsets`` also returns the original index of each
+folded character so highlights can be mapped back.
+"""
+from functools import lru_cache
+import unicodedata
+
+_LETTERS = {
+    "ɛ": "e",
+    "ɔ": "o",
+    "ŋ": "n",
+}
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(c):
+    if c.isspace():
+        return " "
+    cat = unicodedata.category(c)
+    if cat[0] in ("P", "S"):
+        return " "
+    base = "".join(ch for ch in unicodedata.normalize("NFD", c) if not unicodedata.combining(ch))
+    base = base.casefold()
+    return "".join(_LETTERS.get(ch, ch) for ch in base)
+
+
+def fold(text):
+    """Folded comparison form of ``text``."""
+    return "".join(_fold_char(c) for c in str(text))
+
+
+def fold_with_offsets(text):
+    """Return ``(folded, offsets)``.
+
+    ``offsets[i]`` is the index in ``text`` of folded character ``i`` (with one
+    extra entry for the end), or ``offsets`` is None when the fold is 1:1.
+    """
+    text = str(text)
+    pieces = [_fold_char(c) for c in text]
+    folded = "".join(pieces)
+    if len(folded) == len(text) and all(len(p) == 1 for p in pieces):
+        return folded, None
+    offsets = []
+    for i, p in enumerate(pieces):
+        offsets.extend([i] * len(p))
+    offsets.append(len(text))
+    return folded, offsets
+
+
+def map_span(offsets, start, end):
+    """Map a ``[start, end)`` span of folded text back to the original."""
+    if offsets is None:
+        return start, end
+    if start >= end:
+        return offsets[start], offsets[start]
+    return offsets[start], offsets[end - 1] + 1
@@ -0,0 +1,232 @@
+"""
+Lightweight span tracing for start-up and navigation.
+
+Spans are named, timed sections with a few payload fields (verse counts,
+control counts, file names). They are recorded from import time on, before
+the settings are read, and the buffer is dropped once ``configure`` decides
+tracing is off, so the earliest phases can still be traced when it's on. When
+off, ``span`` returns a shared no-op and ``traced`` costs one flag test.
+
+Enable with ``BIBLE_TRACE=1`` (Chrome trace, load in chrome://tracing or
+Perfetto) or ``BIBLE_TRACE=jsonl`` (one event per line), or with
+``"trace": true`` / ``"trace": "jsonl"`` in the settings file. Files are
+written to the data folder as ``trace-<time>-<pid>.json[l]``.
+
+Both formats are appended to at every flush (the app flushes at the quiet
+moment after each navigation), so a process killed without running exit
+handlers, as Android does, still leaves its trace. A Chrome trace uses the
+JSON array format, whose closing bracket is optional and written at the
+final flush. Flushed events leave the buffer; if ``MAX_EVENTS`` pile up
+between flushes, later ones are dropped and a "trace truncated" event
+records how many.
+"""
+from functools import wraps
+from pathlib import Path
+import atexit
+import json
+import os
+import threading
+import time
+
+ENV_VAR = "BIBLE_TRACE"
+MAX_EVENTS = 100_000
+
+_state = None  # None until configured: record, but may be discarded
+_fmt = "chrome"
+_path = None
+_events = []
+_dropped = 0  # events lost to the cap since the last flush
+_opened = False  # the file has been started
+_closed = False  # final flush done
+_lock = threading.Lock()
+_io_lock = threading.Lock()  # one flush at a time
+_local = threading.local()
+_pid = os.getpid()
+
+
+def _now_us():
+    return time.perf_counter_ns() // 1000
+
+
+def _parse(value):
+    """``(enabled, fmt)`` for an env/settings value."""
+    if value is None or value is False:
+        return False, "chrome"
+    v = str(value).strip().lower()
+    if v in ("", "0", "false", "off", "no"):
+        return False, "chrome"
+    return True, "jsonl" if v == "jsonl" else "chrome"
+
+
+def env_setting():
+    return os.environ.get(ENV_VAR)
+
+
+def enabled():
+    return _state is not False
+
+
+def configure(value, folder):
+    """Turn tracing on or off for the rest of the run.
+
+    ``value`` is the env var or settings value; the environment wins when set.
+    """
+    global _state, _fmt, _path, _opened, _closed
+    on, fmt = _parse(env_setting() if env_setting() is not None else value)
+    with _lock:
+        if not on:
+            _state = False
+            _events.clear()
+            return
+        _state = True
+        _fmt = fmt
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        suffix = ".jsonl" if fmt == "jsonl" else ".json"
+        _path = Path(folder) / f"trace-{stamp}-{_pid}{suffix}"
+        _opened = _closed = False
+
+
+def _record(event):
+    global _dropped
+    with _lock:
+        if _state is False:
+            return
+        if len(_events) < MAX_EVENTS:
+            _events.append(event)
+        else:
+            _dropped += 1
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        _local.stack.pop()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record({
+            "name": self.name,
+            "ph": "X",
+            "ts": self.start,
+            "dur": end - self.start,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name, **args):
+    """Context manager timing a named section."""
+    if _state is False:
+        return _NULL
+    return _Span(name, args)
+
+
+def annotate(**args):
+    """Attach payload fields to the innermost open span on this thread."""
+    if _state is False:
+        return
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1].args.update(args)
+
+
+def traced(name=None):
+    """Decorator recording each call of a function as a span."""
+    def deco(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*a, **kw):
+            if _state is False:
+                return fn(*a, **kw)
+            with _Span(label, {}):
+                return fn(*a, **kw)
+        return wrapper
+    return deco
+
+
+def flush(final=False):
+    """Append the events recorded since the last flush to the trace file.
+
+    No-op unless enabled. ``final`` (window close, exit) also ends a Chrome
+    trace's array; nothing is written after that.
+    """
+    with _io_lock:
+        return _flush(final)
+
+
+def _take():
+    """The buffered events, plus a truncation marker if any were dropped; empties the buffer."""
+    global _dropped
+    events = list(_events)
+    _events.clear()
+    if _dropped:
+        events.append({
+            "name": "trace truncated",
+            "ph": "i",
+            "s": "g",
+            "ts": _now_us(),
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": {"dropped": _dropped, "max_events": MAX_EVENTS},
+        })
+        _dropped = 0
+    return events
+
+
+def _flush(final):
+    global _opened, _closed
+    with _lock:
+        if _state is not True or _path is None or _closed:
+            return None
+        events = _take()
+    try:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        with open(_path, "a", encoding="utf-8") as f:
+            for ev in events:
+                line = json.dumps(ev, ensure_ascii=False, default=str)
+                if _fmt == "jsonl":
+                    f.write(line + "\n")
+                else:
+                    f.write(("[\n" if not _opened else ",\n") + line)
+                    _opened = True
+            if final and _fmt != "jsonl":
+                f.write(("[" if not _opened else "") + "\n]\n")
+                _opened = True
+    except OSError:
+        return None
+    if final:
+        _closed = True
+    return _path
+
+
+atexit.register(flush, final=True)